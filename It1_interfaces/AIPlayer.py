@@ -0,0 +1,368 @@
+import queue
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from Command import Command
+from GameTracker import piece_kind
+from Moves import iter_bits
+from StateArrays import NONE, ALIVE, HAS_MOVED, CELL_R, CELL_C, TO_R, TO_C, START_MS, DURATION_MS
+
+PIECE_VALUES = {"P": 100, "N": 300, "B": 320, "R": 500, "Q": 900, "K": 20000}
+MATE = 1_000_000
+INF = 10 * MATE
+# share of the budget held back for the work after the last clock check: one node, unwinding, the result
+DEADLINE_MARGIN = 0.1
+
+
+class _Timeout(Exception):
+    pass
+
+
+class SearchResult(NamedTuple):
+    move: Optional[Tuple[str, Tuple[int, int], Tuple[int, int]]]   # (piece id, from, to) or None
+    score: int
+    depth: int                          # deepest fully searched depth
+    nodes: int
+    elapsed_ms: float
+
+
+class SearchState:
+    """
+    Compact, mutable copy of a position for search: per-piece flat lists and
+    int bitboards, changed in place with make / unmake.  Time is part of the
+    state – a move keeps its piece busy for its travel time (MovePhysics
+    speed) plus the rest that follows, and every ply advances the clock.
+    """
+    __slots__ = ("width", "now", "ids", "types", "colours", "cells", "busy", "moved", "moves", "move_physics",
+                 "rest_ms", "at", "occupied", "bits", "material", "kings", "_undo", "_durations")
+
+    def __init__(self, width: int, now: int):
+        self.width, self.now = width, now
+        self.ids: List[str] = []
+        self.types: List[str] = []
+        self.colours: List[str] = []
+        self.cells: List[int] = []              # bit index, -1 once captured
+        self.busy: List[int] = []               # game ms until which the piece cannot move
+        self.moved: List[bool] = []
+        self.moves: List = []                   # shared Moves table (or None)
+        self.move_physics: List = []            # the piece's MovePhysics (travel time), or None
+        self.rest_ms: List[int] = []            # rest after a move
+        self.at: Dict[int, int] = {}            # bit index -> piece
+        self.occupied = 0
+        self.bits: Dict[str, int] = {}
+        self.material: Dict[str, int] = {}
+        self.kings: Dict[str, int] = {}
+        self._undo: List[Tuple] = []
+        self._durations: Dict[Tuple[int, int, int], int] = {}
+
+    @classmethod
+    def from_game(cls, game, now_ms: int, static: Dict[str, Tuple]) -> "SearchState":
+        """
+        Copy the live pieces of `game` (read straight from its StateArrays);
+        `static` caches per-piece data until the piece's machine is reloaded.
+        """
+        state = cls(game.board.W_cells, now_ms)
+        data = game.state.data[:len(game.state)]
+        rows = np.flatnonzero(data[:, ALIVE] == 1)
+        view = data[rows][:, [CELL_R, CELL_C, TO_R, TO_C, START_MS, DURATION_MS, HAS_MOVED]].tolist()
+        for row, (r, c, to_r, to_c, start, duration, has_moved) in zip(rows.tolist(), view):
+            piece = game.state.pieces[row]
+            machine = piece._machine
+            cached = static.get(piece.piece_id)
+            if cached is None or cached[0] is not machine or cached[1] != machine.version:
+                cached = static[piece.piece_id] = (machine, machine.version, _static_info(piece))
+            info = cached[2]
+            busy = now_ms
+            if start != NONE and duration != NONE:
+                busy = start + duration
+                if to_r != NONE:                # in flight: search from where it lands, resting after
+                    r, c = to_r, to_c
+                    busy += info[4]
+            if r == NONE:
+                continue
+            state._add(piece.piece_id, info, r * state.width + c, max(busy, now_ms), bool(has_moved))
+        return state
+
+    def _add(self, piece_id: str, info: Tuple, cell: int, busy: int, moved: bool):
+        p_type, colour, moves, move_physics, rest_ms = info
+        i = len(self.ids)
+        self.ids.append(piece_id)
+        self.types.append(p_type)
+        self.colours.append(colour)
+        self.cells.append(cell)
+        self.busy.append(busy)
+        self.moved.append(moved)
+        self.moves.append(moves)
+        self.move_physics.append(move_physics)
+        self.rest_ms.append(rest_ms)
+        if cell in self.at:                     # two pieces on one cell – keep the later one
+            self._remove(self.at[cell])
+        self.at[cell] = i
+        self.occupied |= 1 << cell
+        self.bits[colour] = self.bits.get(colour, 0) | 1 << cell
+        self.material[colour] = self.material.get(colour, 0) + PIECE_VALUES.get(p_type, 0)
+        self.kings[colour] = self.kings.get(colour, 0) + (p_type == "K")
+
+    def _remove(self, i: int):
+        cell, colour = self.cells[i], self.colours[i]
+        del self.at[cell]
+        self.occupied &= ~(1 << cell)
+        self.bits[colour] &= ~(1 << cell)
+        self.material[colour] -= PIECE_VALUES.get(self.types[i], 0)
+        self.kings[colour] -= self.types[i] == "K"
+        self.cells[i] = -1
+
+    # ─── search interface ───────────────────────────────────────────────────
+    def king_lost(self, colour: str) -> bool:
+        return self.kings.get(colour, 0) == 0 and colour in self.kings
+
+    def evaluate(self, colour: str) -> int:
+        """Material balance from `colour`'s point of view."""
+        return sum(v if c == colour else -v for c, v in self.material.items())
+
+    def gen_moves(self, colour: str) -> List[Tuple[int, int, int]]:
+        """(ordering score, piece, target bit) for every piece of `colour` free to move, captures first."""
+        result = []
+        own = self.bits.get(colour, 0)
+        for i, cell in enumerate(self.cells):
+            if cell < 0 or self.colours[i] != colour or self.busy[i] > self.now or self.moves[i] is None:
+                continue
+            legal = self.moves[i].table.legal_mask(cell, self.occupied, own, not self.moved[i])
+            attacker = PIECE_VALUES.get(self.types[i], 0)
+            for target in iter_bits(legal):
+                victim = self.at.get(target)
+                order = 10 * PIECE_VALUES.get(self.types[victim], 0) - attacker // 100 if victim is not None else 0
+                result.append((order, i, target))
+        result.sort(key=lambda m: -m[0])
+        return result
+
+    def make(self, i: int, target: int, ply_ms: int):
+        cell = self.cells[i]
+        victim = self.at.get(target)
+        self._undo.append((i, cell, target, victim, self.busy[i], self.moved[i], self.now))
+        if victim is not None:
+            self._remove(victim)
+        colour, bit_from, bit_to = self.colours[i], 1 << cell, 1 << target
+        del self.at[cell]
+        self.at[target] = i
+        self.cells[i] = target
+        self.occupied = (self.occupied & ~bit_from) | bit_to
+        self.bits[colour] = (self.bits[colour] & ~bit_from) | bit_to
+        self.busy[i] = self.now + self._duration(i, cell, target) + self.rest_ms[i]
+        self.moved[i] = True
+        self.now += ply_ms
+
+    def unmake(self):
+        i, cell, target, victim, busy, moved, now = self._undo.pop()
+        colour, bit_from, bit_to = self.colours[i], 1 << cell, 1 << target
+        del self.at[target]
+        self.at[cell] = i
+        self.cells[i] = cell
+        self.occupied = (self.occupied & ~bit_to) | bit_from
+        self.bits[colour] = (self.bits[colour] & ~bit_to) | bit_from
+        self.busy[i], self.moved[i], self.now = busy, moved, now
+        if victim is not None:
+            v_colour = self.colours[victim]
+            self.cells[victim] = target
+            self.at[target] = victim
+            self.occupied |= bit_to
+            self.bits[v_colour] |= bit_to
+            self.material[v_colour] += PIECE_VALUES.get(self.types[victim], 0)
+            self.kings[v_colour] += self.types[victim] == "K"
+
+    def _duration(self, i: int, cell: int, target: int) -> int:
+        physics = self.move_physics[i]
+        if physics is None:
+            return 0
+        key = (id(physics), cell, target)
+        ms = self._durations.get(key)
+        if ms is None:
+            ms = self._durations[key] = physics.duration_for(divmod(cell, self.width), divmod(target, self.width))
+        return ms
+
+
+def _static_info(piece) -> Tuple:
+    """(type, colour, Moves, MovePhysics, rest ms after a move) – fixed until the piece's assets are reloaded."""
+    p_type, colour = piece_kind(piece.piece_id)
+    move_state = piece.get_state("move")
+    move_physics = move_state.get_physics() if move_state is not None else None
+    rest_ms = 0
+    if move_physics is not None:
+        rest_state = piece.get_state(move_physics.next_state)
+        if rest_state is not None:
+            rest_ms = rest_state.get_physics().duration_ms or 0
+    return p_type, colour, piece.get_moves(), move_physics, rest_ms
+
+
+class Searcher:
+    """Iterative-deepening negamax with alpha-beta over a SearchState, stopped by a deadline or node budget."""
+
+    def __init__(self, ply_ms: int = 500, max_depth: int = 32):
+        self.ply_ms = ply_ms
+        self.max_depth = max_depth
+        self.nodes = 0
+        self._deadline = 0.0
+        self._max_nodes: Optional[int] = None
+
+    def search(self, state: SearchState, colour: str, budget_ms: float = 5.0,
+               max_nodes: Optional[int] = None) -> SearchResult:
+        """Best move for `colour` found before `budget_ms` (or `max_nodes`, which is deterministic) runs out."""
+        start = time.perf_counter()
+        self._deadline = start + budget_ms * (1 - DEADLINE_MARGIN) / 1000
+        self._max_nodes = max_nodes
+        self.nodes = 0
+        other = _other(colour, state)
+
+        root = state.gen_moves(colour)
+        if not root:
+            return SearchResult(None, state.evaluate(colour), 0, 0, (time.perf_counter() - start) * 1000)
+        best_move, best_score, depth_done = root[0], -INF, 0       # capture-first ordering as a fallback
+        iter_best = None
+        try:
+            for depth in range(1, self.max_depth + 1):
+                iter_best, iter_score = None, -INF
+                alpha = -INF
+                for move in root:
+                    _, i, target = move
+                    state.make(i, target, self.ply_ms)
+                    try:
+                        score = -self._negamax(state, other, colour, depth - 1, -INF, -alpha)
+                    finally:
+                        state.unmake()
+                    if score > iter_score:
+                        iter_best, iter_score = move, score
+                        alpha = max(alpha, score)
+                best_move, best_score, depth_done = iter_best, iter_score, depth
+                iter_best = None
+                root.remove(best_move)                  # principal move first next time
+                root.insert(0, best_move)
+                if abs(best_score) >= MATE:
+                    break
+        except _Timeout:
+            # the previous best was searched first, so a partial iteration's best is at least as good
+            if iter_best is not None:
+                best_move, best_score = iter_best, iter_score
+
+        _, i, target = best_move
+        move = (state.ids[i], divmod(state.cells[i], state.width), divmod(target, state.width))
+        return SearchResult(move, best_score, depth_done, self.nodes, (time.perf_counter() - start) * 1000)
+
+    def _negamax(self, state: SearchState, colour: str, other: str, depth: int, alpha: int, beta: int) -> int:
+        self.nodes += 1
+        if self._max_nodes is not None and self.nodes >= self._max_nodes:
+            raise _Timeout()
+        if time.perf_counter() > self._deadline:
+            raise _Timeout()
+        if state.king_lost(colour):
+            return -MATE - depth                # sooner is worse
+        if state.king_lost(other):
+            return MATE + depth
+        if depth == 0:
+            return state.evaluate(colour)
+
+        moves = state.gen_moves(colour)
+        if not moves:                           # everything busy – let time pass
+            state.now += self.ply_ms
+            try:
+                return -self._negamax(state, other, colour, depth - 1, -beta, -alpha)
+            finally:
+                state.now -= self.ply_ms
+
+        best = -INF
+        for _, i, target in moves:
+            state.make(i, target, self.ply_ms)
+            try:
+                score = -self._negamax(state, other, colour, depth - 1, -beta, -alpha)
+            finally:
+                state.unmake()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+
+def _other(colour: str, state: SearchState) -> str:
+    for c in state.bits:
+        if c != colour:
+            return c
+    return "B" if colour == "W" else "W"
+
+
+class AIPlayer:
+    """
+    Computer player for one colour.  As a tick listener (`attach`) it copies
+    the position on the game thread every `think_every_ms` and searches it
+    on a background thread within `budget_ms`, then puts the chosen Move
+    into game.user_input_queue – the game loop only pays for the copy.
+    Called directly (`player(game, now)`), it is a synchronous controller
+    for HeadlessRunner / BatchSimulator.
+    """
+
+    def __init__(self, colour: str, budget_ms: float = 5.0, think_every_ms: int = 500,
+                 ply_ms: int = 500, max_nodes: Optional[int] = None):
+        self.colour = colour
+        self.budget_ms = budget_ms
+        self.think_every_ms = think_every_ms
+        self.max_nodes = max_nodes
+        self.searcher = Searcher(ply_ms)
+        self.last_result: Optional[SearchResult] = None
+        self.decisions = 0
+        self._static: Dict[str, Tuple] = {}
+        self._requests: "queue.Queue" = queue.Queue(maxsize=1)
+        self._thread: Optional[threading.Thread] = None
+        self._next_think = 0
+
+    # ─── synchronous ────────────────────────────────────────────────────────
+    def decide(self, game, now_ms: int) -> Optional[Command]:
+        state = SearchState.from_game(game, now_ms, self._static)
+        return self._search(state, now_ms)
+
+    def __call__(self, game, now_ms: int) -> List[Command]:
+        cmd = self.decide(game, now_ms)
+        return [cmd] if cmd is not None else []
+
+    def _search(self, state: SearchState, now_ms: int) -> Optional[Command]:
+        result = self.searcher.search(state, self.colour, self.budget_ms, self.max_nodes)
+        self.last_result = result
+        self.decisions += 1
+        if result.move is None:
+            return None
+        piece_id, from_cell, to_cell = result.move
+        return Command(now_ms, piece_id, "Move", [from_cell, to_cell])
+
+    # ─── background ─────────────────────────────────────────────────────────
+    def attach(self, game):
+        """Play in `game` from a background thread (see class docstring)."""
+        self._thread = threading.Thread(target=self._work, args=(game,), name=f"ai-{self.colour}", daemon=True)
+        self._thread.start()
+        game.tick_listeners.append(self._on_tick)
+
+    def stop(self):
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _on_tick(self, game, now_ms: int):
+        if now_ms < self._next_think:
+            return
+        self._next_think = now_ms + self.think_every_ms
+        try:
+            self._requests.put_nowait((SearchState.from_game(game, now_ms, self._static), now_ms))
+        except queue.Full:
+            pass                                # still thinking about the previous position
+
+    def _work(self, game):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            cmd = self._search(*request)
+            if cmd is not None:
+                game.user_input_queue.put(cmd)
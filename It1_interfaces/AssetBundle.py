@@ -0,0 +1,197 @@
+import json
+import mmap
+import os
+import pathlib
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from Graphics import sprite_files
+from Moves import Moves
+from SpriteCache import SpriteCache
+from img import Img
+
+# magic, format version, JSON header length; the frames start at the next FRAME_ALIGN boundary
+PREAMBLE = struct.Struct("<8sIQ")
+MAGIC = b"CTDASSET"
+BUNDLE_VERSION = 1
+FRAME_ALIGN = 64
+
+
+def source_files(pieces_root: pathlib.Path) -> Dict[str, int]:
+    """Every file the bundle is built from (moves.txt, config.json, sprites) -> st_mtime_ns, keyed by path under pieces_root."""
+    files = list(pieces_root.glob("*/moves.txt")) + list(pieces_root.glob("*/states/*/config.json"))
+    for sprites_dir in pieces_root.glob("*/states/*/sprites"):
+        files.extend(sprite_files(sprites_dir))
+    return {path.relative_to(pieces_root).as_posix(): path.stat().st_mtime_ns for path in files}
+
+
+class AssetBundle:
+    """
+    The whole pieces/ tree compiled into one file for a given cell size:
+    parsed moves.txt rules and config.json dicts in a JSON header, and every
+    sprite frame pre-resized and converted to the board's channel layout in
+    one contiguous (frames, H, W, channels) uint8 block.
+
+    `load` memory-maps the file read-only, so the frames are zero-copy
+    numpy views whose pages are shared by every game process using the same
+    bundle, and rebuilds it first if it is missing, from another format
+    version or cell size, or older than its sources (file mtimes).  A bundle
+    that cannot be swapped in (Windows refuses to replace a file some other
+    process has mapped) is skipped and the pieces are read from the tree.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_len = PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{self.path} is not an asset bundle")
+        self.version = version
+        header = json.loads(self._map[PREAMBLE.size:PREAMBLE.size + header_len])
+        self.cell_size: Tuple[int, int] = tuple(header["cell_size"])
+        self.channels: int = header["channels"]
+        self.sources: Dict[str, int] = header["sources"]
+        self.pieces: Dict[str, Dict] = header["pieces"]
+        w, h = self.cell_size
+        n = header["frame_count"]
+        self.frames = np.frombuffer(self._map, dtype=np.uint8, count=n * h * w * self.channels,
+                                    offset=header["frames_offset"]).reshape(n, h, w, self.channels)
+
+    # ─── building ──────────────────────────────────────────────────────────
+    @classmethod
+    def compile(cls, pieces_root: str | pathlib.Path, path: str | pathlib.Path,
+                cell_size: Tuple[int, int], channels: int = 4, workers: Optional[int] = None) -> "AssetBundle":
+        """Pack `pieces_root` into the bundle at `path` (written to a temp file, then swapped in) and open it."""
+        pieces_root, path = pathlib.Path(pieces_root), pathlib.Path(path)
+        sources = source_files(pieces_root)
+        pieces: Dict[str, Dict] = {}
+        sprite_paths: List[pathlib.Path] = []
+        for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+            moves_path = piece_dir / "moves.txt"
+            states = {}
+            for state_dir in sorted(p for p in (piece_dir / "states").glob("*") if p.is_dir()):
+                config_path = state_dir / "config.json"
+                if not config_path.exists():
+                    continue
+                with open(config_path, "r") as f:
+                    config = json.load(f)
+                frames = [[sprite.name, len(sprite_paths) + i]
+                          for i, sprite in enumerate(sprite_files(state_dir / "sprites"))]
+                sprite_paths.extend(state_dir / "sprites" / name for name, _ in frames)
+                states[state_dir.name] = {"config": config, "frames": frames}
+            pieces[piece_dir.name] = {"moves": Moves._parse(moves_path) if moves_path.exists() else None,
+                                      "states": states}
+
+        def decode(sprite: pathlib.Path) -> Optional[np.ndarray]:
+            try:
+                return Img().read(sprite, size=cell_size, keep_aspect=False).to_channels(channels).img
+            except Exception:
+                return None             # left out – Graphics reports the file when it asks for it
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bundle-decode") as pool:
+            decoded = list(pool.map(decode, sprite_paths))
+        index = {}                      # global sprite index -> frame in the block
+        for i, pixels in enumerate(decoded):
+            if pixels is not None:
+                index[i] = len(index)
+        for piece in pieces.values():
+            for state in piece["states"].values():
+                state["frames"] = [[name, index[i]] for name, i in state["frames"] if i in index]
+
+        header = {"cell_size": list(cell_size), "channels": channels, "frame_count": len(index),
+                  "sources": sources, "pieces": pieces, "frames_offset": 0}
+        # the offset is part of the header: grow it until the header fits in front of the frames
+        while True:
+            blob = json.dumps(header).encode()
+            end = PREAMBLE.size + len(blob)
+            offset = -(-end // FRAME_ALIGN) * FRAME_ALIGN
+            if header["frames_offset"] == offset:
+                break
+            header["frames_offset"] = offset
+
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(PREAMBLE.pack(MAGIC, BUNDLE_VERSION, len(blob)))
+            f.write(blob)
+            f.write(b"\0" * (offset - end))
+            for pixels in decoded:
+                if pixels is not None:
+                    f.write(np.ascontiguousarray(pixels).tobytes())
+        try:
+            os.replace(tmp, path)       # readers that already mapped the old file keep their pages (POSIX)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            raise
+        return cls(path)
+
+    @classmethod
+    def load(cls, pieces_root: str | pathlib.Path, path: str | pathlib.Path,
+             cell_size: Tuple[int, int], channels: int = 4, workers: Optional[int] = None) -> Optional["AssetBundle"]:
+        """
+        Open the bundle at `path`, compiling it first if it is missing or out of date.
+        None if the rebuilt bundle could not be written – the caller reads the tree instead.
+        """
+        pieces_root = pathlib.Path(pieces_root)
+        bundle = None
+        try:
+            bundle = cls(path)
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+        if bundle is not None:
+            if bundle.matches(cell_size, channels) and not bundle.is_stale(pieces_root):
+                return bundle
+            bundle.close()              # unmap before replacing the file
+        try:
+            return cls.compile(pieces_root, path, cell_size, channels, workers)
+        except OSError as e:
+            print(f"Warning: could not rebuild {path}: {e}")
+            return None
+
+    def close(self):
+        """
+        Release this bundle's mapping of the file.  Frames already installed in the
+        SpriteCache keep the pages alive until the last of them is dropped.
+        """
+        self.frames = np.empty((0,) + self.frames.shape[1:], dtype=np.uint8)
+        try:
+            self._map.close()
+        except BufferError:
+            pass                        # views are still exported – unmapped when they go
+
+    def matches(self, cell_size: Tuple[int, int], channels: int) -> bool:
+        return self.version == BUNDLE_VERSION and self.cell_size == tuple(cell_size) and self.channels == channels
+
+    def is_stale(self, pieces_root: str | pathlib.Path) -> bool:
+        """True when a source file was added, removed or modified since the bundle was built."""
+        return source_files(pathlib.Path(pieces_root)) != self.sources
+
+    # ─── reading ───────────────────────────────────────────────────────────
+    def config(self, piece: str, state: str) -> Optional[Dict]:
+        entry = self.pieces.get(piece, {}).get("states", {}).get(state)
+        return None if entry is None else entry["config"]
+
+    def rules(self, piece: str) -> Optional[List[Tuple[int, int, str]]]:
+        rules = self.pieces.get(piece, {}).get("moves")
+        return None if rules is None else [tuple(rule) for rule in rules]
+
+    def install(self, pieces_root: str | pathlib.Path, interpolation: int = cv2.INTER_AREA):
+        """
+        Put every frame into the SpriteCache under its source file, so Graphics never decodes a PNG.
+        The frames are keyed by the channel count stored in the bundle – a Graphics asking for
+        another layout (or for none, when the board image is unknown) decodes from the tree.
+        Nothing is copied: the blend masks are built when a frame is first drawn.
+        """
+        pieces_root = pathlib.Path(pieces_root)
+        for piece, entry in self.pieces.items():
+            for state, info in entry["states"].items():
+                sprites_dir = pieces_root / piece / "states" / state / "sprites"
+                for name, index in info["frames"]:
+                    sprite = Img()
+                    sprite.img = self.frames[index]
+                    SpriteCache.put(sprites_dir / name, self.cell_size, sprite, interpolation, self.channels)
@@ -0,0 +1,174 @@
+import json
+import pathlib
+import queue
+import threading
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from AssetBundle import source_files
+from Graphics import Graphics
+from Moves import Moves
+from Physics import Physics
+from PieceFactory import PieceFactory
+from SpriteCache import SpriteCache
+from State import State
+from StateMachine import StateMachine
+
+
+class AssetPatch(NamedTuple):
+    """New components for one State, built off the game thread; None = keep the current one."""
+    state: State
+    graphics: Optional[Graphics]
+    physics: Optional[Physics]
+    moves: Optional[Moves]
+
+
+class AssetWatcher:
+    """
+    Hot-reload of the pieces/ tree while a game runs.
+
+    A background thread polls the mtimes of the same files an AssetBundle is
+    built from (plain `stat`, no inotify) every `interval_s`.  A changed
+    sprite is re-decoded alone – the other frames of the state come from
+    the SpriteCache – and a changed config.json or moves.txt is re-parsed
+    alone; the matching Graphics / Physics / Moves are built on that thread
+    and queued.  The game thread swaps them into the shared States between
+    two ticks (`attach` registers a tick listener), so a frame never sees a
+    half-reloaded piece type and never waits for a decode.  Pieces keep
+    their records: a move in flight finishes at its old speed.
+    """
+
+    def __init__(self, factory: PieceFactory, interval_s: float = 0.5):
+        self.factory = factory
+        self.pieces_root = factory.pieces_root
+        self.interval_s = interval_s
+        self.reloaded_files = 0                      # changes picked up so far
+        self.swapped_states = 0                      # State components swapped so far
+        self._seen: Dict[str, int] = source_files(self.pieces_root)
+        self._machines: Dict[int, StateMachine] = {}
+        self._lock = threading.Lock()
+        self._pending: "queue.Queue[List[AssetPatch]]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        for template in factory.piece_templates.values():
+            self.watch(template._machine)
+
+    def watch(self, machine: StateMachine):
+        """Keep the States of `machine` up to date as well."""
+        with self._lock:
+            self._machines.setdefault(id(machine), machine)
+
+    def attach(self, game):
+        """Watch every machine of `game` and apply reloads between its ticks."""
+        for piece in game.pieces.values():
+            self.watch(piece._machine)
+        game.tick_listeners.append(self._on_tick)
+
+    # ─── background ─────────────────────────────────────────────────────────
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._work, name="asset-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _work(self):
+        while not self._stop.wait(self.interval_s):
+            self.check()
+
+    def check(self) -> int:
+        """Poll once and queue the rebuilt components; return the number of changed files."""
+        changed = self.poll()
+        if changed:
+            patches = self._prepare(changed)
+            if patches:
+                self._pending.put(patches)
+        return len(changed)
+
+    def poll(self) -> List[str]:
+        """Source files (relative to pieces_root) added, removed or modified since the last poll."""
+        current = source_files(self.pieces_root)
+        changed = sorted(name for name in current.keys() | self._seen.keys()
+                         if current.get(name) != self._seen.get(name))
+        self._seen = current
+        self.reloaded_files += len(changed)
+        return changed
+
+    # ─── game thread ────────────────────────────────────────────────────────
+    def apply_pending(self) -> int:
+        """Swap every queued patch into its State; return how many States changed."""
+        swapped = 0
+        machines = set()
+        while True:
+            try:
+                patches = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            for patch in patches:
+                patch.state.reload(patch.graphics, patch.physics, patch.moves)
+                swapped += 1
+            machines.update(self._owners(patches))
+        for machine in machines:
+            machine.reloaded()                 # BatchPhysics / AIPlayer rebuild what they cached from it
+        self.swapped_states += swapped
+        return swapped
+
+    def _on_tick(self, game, now_ms: int):
+        self.apply_pending()
+
+    # ─── helpers ────────────────────────────────────────────────────────────
+    def _states(self) -> List[Tuple[State, str, str]]:
+        """(state, piece type, state name) of every watched State, from its sprites folder pieces/<type>/states/<name>/sprites."""
+        with self._lock:
+            machines = list(self._machines.values())
+        found = []
+        for machine in machines:
+            for state in machine.states:
+                folder = pathlib.Path(state.get_graphics().sprites_folder)
+                found.append((state, folder.parent.parent.parent.name, folder.parent.name))
+        return found
+
+    def _owners(self, patches: List[AssetPatch]) -> List[StateMachine]:
+        patched = {id(patch.state) for patch in patches}
+        with self._lock:
+            return [m for m in self._machines.values() if any(id(s) in patched for s in m.states)]
+
+    def _prepare(self, changed: List[str]) -> List[AssetPatch]:
+        """Drop the stale cache entries and build the new components of every State a change touches."""
+        moves_types: Set[str] = set()
+        changed_states: Set[Tuple[str, str]] = set()
+        for name in changed:
+            parts = name.split("/")
+            if parts[1:] == ["moves.txt"]:
+                moves_types.add(parts[0])
+                Moves.invalidate(self.pieces_root / name)
+            elif len(parts) >= 4 and parts[1] == "states":
+                changed_states.add((parts[0], parts[2]))
+                if parts[3] == "sprites":
+                    SpriteCache.invalidate(self.pieces_root / name)
+
+        dims = (self.factory.board.H_cells, self.factory.board.W_cells)
+        patches = []
+        for state, p_type, state_name in self._states():
+            graphics = physics = moves = None
+            if (p_type, state_name) in changed_states:
+                state_dir = self.pieces_root / p_type / "states" / state_name
+                try:
+                    with open(state_dir / "config.json", "r") as f:
+                        cfg = json.load(f)
+                    graphics = self.factory._load_graphics(state_dir / "sprites", cfg)
+                    physics = self.factory._load_physics(state_name, cfg, graphics)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Warning: could not reload {p_type}/{state_name}: {e}")
+                    graphics = physics = None
+            if p_type in moves_types:
+                try:
+                    moves = Moves(self.pieces_root / p_type / "moves.txt", dims)
+                except (OSError, ValueError) as e:
+                    print(f"Warning: could not reload {p_type}/moves.txt: {e}")
+            if graphics is not None or moves is not None:
+                patches.append(AssetPatch(state, graphics, physics, moves))
+        return patches
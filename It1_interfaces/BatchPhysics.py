@@ -0,0 +1,136 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from Board import Board
+from Physics import Physics, RestPhysics, MovePhysics
+from StateArrays import StateArrays, NONE, ALIVE, STATE, CUR_R, CUR_C, FROM_R, FROM_C, TO_R, TO_C, START_MS, DURATION_MS
+
+# how a state's physics places and times the piece
+STILL, REST, MOVE, OTHER = range(4)     # at its cell / at its cell with a cooldown / interpolated / ask the object
+
+
+def physics_kind(physics: Physics) -> int:
+    """Classify by the methods actually in use, so subclasses that override them fall back to OTHER."""
+    cls = type(physics)
+    draw, cooldown = cls.get_draw_position, cls.get_cooldown_ratio
+    if draw is Physics.get_draw_position:
+        if cooldown is Physics.get_cooldown_ratio:
+            return STILL
+        if cooldown is RestPhysics.get_cooldown_ratio:
+            return REST
+    elif draw is MovePhysics.get_draw_position and cooldown is MovePhysics.get_cooldown_ratio:
+        return MOVE
+    return OTHER
+
+
+class FrameKinematics(NamedTuple):
+    rows: np.ndarray            # live state-array rows
+    x: np.ndarray               # draw position in pixels (MovePhysics.position_at truncation)
+    y: np.ndarray
+    cooldown: np.ndarray        # get_cooldown_ratio, 0.0 – 1.0
+
+    def positions(self, state: StateArrays) -> Dict[str, Tuple[int, int]]:
+        """piece id -> (x, y), for Renderer.render."""
+        pieces = state.pieces
+        return {pieces[row].piece_id: (x, y) for row, x, y in zip(self.rows.tolist(), self.x.tolist(), self.y.tolist())}
+
+
+class BatchPhysics:
+    """
+    Draw positions and cooldown ratios of every piece in one vectorized pass.
+
+    Start / target cells, start times and durations already live in the
+    StateArrays rows, so a frame is a handful of numpy operations over all
+    live rows instead of a Python `get_draw_position` call per piece.  Each
+    row's physics kind is looked up from a table of (state machine, state
+    id) built once per machine and rebuilt when the machine's version
+    changes (asset hot-reload); pieces whose physics overrides the stock
+    methods are evaluated per piece.  Results equal the per-piece methods.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._machines: Dict[int, int] = {}          # id(StateMachine) -> table row
+        self._known: List = []                      # keeps those machines (and so their ids) alive
+        self._kind_rows: List[np.ndarray] = []
+        self._versions: List[int] = []              # StateMachine.version each kind row was built at
+        self._kinds = np.zeros((0, 0), dtype=np.int8)
+        self._row_machine = np.zeros(0, dtype=np.int64)
+        self._pieces: List = []                     # StateArrays.pieces the rows above were read from
+
+    def compute(self, state: StateArrays, now_ms: int) -> FrameKinematics:
+        """Every live piece's draw position and cooldown ratio at `now_ms`."""
+        n = len(state)
+        self._sync(state)
+        self._refresh_kinds()
+        data = state.data[:n]
+        rows = np.flatnonzero(data[:, ALIVE] == 1)
+        live = data[rows]
+        kind = self._kinds[self._row_machine[rows], live[:, STATE]]
+        cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+
+        x = live[:, CUR_C] * cw
+        y = live[:, CUR_R] * ch
+        cooldown = np.ones(len(rows))
+
+        start, duration = live[:, START_MS], live[:, DURATION_MS]
+        timed = (start != NONE) & (duration != NONE) & (duration != 0)
+        elapsed = np.where(timed, now_ms - np.where(timed, start, 0), 0)
+        span = np.where(timed, duration, 1)
+
+        moving = (kind == MOVE) & timed & (live[:, TO_R] != NONE)
+        if moving.any():
+            ratio = np.minimum(elapsed[moving] / span[moving], 1.0)
+            m = live[moving]
+            sx, sy = m[:, FROM_C] * cw, m[:, FROM_R] * ch
+            x[moving] = np.trunc(sx + (m[:, TO_C] * cw - sx) * ratio)
+            y[moving] = np.trunc(sy + (m[:, TO_R] * ch - sy) * ratio)
+
+        cooling = ((kind == MOVE) | (kind == REST)) & timed
+        cooldown[cooling] = np.clip(elapsed[cooling] / span[cooling], 0.0, 1.0)
+
+        for i in np.flatnonzero(kind == OTHER).tolist():
+            physics = state.pieces[rows[i]]._state.get_physics()
+            x[i], y[i] = physics.get_draw_position(now_ms)
+            cooldown[i] = physics.get_cooldown_ratio(now_ms)
+        return FrameKinematics(rows, x, y, cooldown)
+
+    def _sync(self, state: StateArrays):
+        """Extend the per-row machine index for rows added since the last call."""
+        if self._pieces is not state.pieces:
+            self._pieces, self._row_machine = state.pieces, np.zeros(0, dtype=np.int64)
+        seen = len(self._row_machine)
+        if seen == len(state.pieces):
+            return
+        added = [self._machine_index(piece._machine) for piece in state.pieces[seen:]]
+        self._row_machine = np.concatenate([self._row_machine, np.array(added, dtype=np.int64)])
+
+    def _machine_index(self, machine) -> int:
+        index = self._machines.get(id(machine))
+        if index is None:
+            index = self._machines[id(machine)] = len(self._kind_rows)
+            self._known.append(machine)
+            self._kind_rows.append(self._kinds_of(machine))
+            self._versions.append(machine.version)
+            self._build_table()
+        return index
+
+    def _refresh_kinds(self):
+        """Re-classify the states of machines whose physics were swapped since their row was built."""
+        stale = [i for i, machine in enumerate(self._known) if machine.version != self._versions[i]]
+        for i in stale:
+            self._kind_rows[i] = self._kinds_of(self._known[i])
+            self._versions[i] = self._known[i].version
+        if stale:
+            self._build_table()
+
+    @staticmethod
+    def _kinds_of(machine) -> np.ndarray:
+        return np.array([physics_kind(s.get_physics()) for s in machine.states], dtype=np.int8)
+
+    def _build_table(self):
+        width = max(len(k) for k in self._kind_rows)
+        self._kinds = np.full((len(self._kind_rows), width), OTHER, dtype=np.int8)
+        for i, kinds in enumerate(self._kind_rows):
+            self._kinds[i, :len(kinds)] = kinds
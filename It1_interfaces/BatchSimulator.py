@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import os
+import pathlib
+import random
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from Board import Board
+from Command import Command
+from Game import Game
+from GameTracker import piece_kind
+from HeadlessRunner import headless_game, load_pieces, run_headless
+from Moves import iter_bits
+from PieceFactory import PieceFactory
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+class GameSummary(NamedTuple):
+    """What a worker sends back per game – a few ints, cheap to pickle."""
+    seed: int
+    winner: Optional[str]
+    duration_ms: int
+    captures: int
+    commands: int
+
+
+class RandomPlayer:
+    """Controller that moves one random idle piece per colour with a legal move, reproducibly per seed."""
+    def __init__(self, seed: int, colours=("W", "B")):
+        self.rng = random.Random(seed)
+        self.colours = colours
+
+    def __call__(self, game: Game, now_ms: int) -> List[Command]:
+        commands = []
+        for colour in self.colours:
+            options = []
+            for piece_id, piece in sorted(game.pieces.items()):
+                if piece_kind(piece_id)[1] != colour or piece.next_deadline() is not None:
+                    continue                      # other side, or still moving / resting
+                legal = game.legal_mask(piece)
+                if legal:
+                    options.append((piece, legal))
+            if not options:
+                continue
+            piece, legal = self.rng.choice(options)
+            target = divmod(self.rng.choice(list(iter_bits(legal))), game.board.W_cells)
+            commands.append(Command(now_ms, piece.piece_id, "Move", [piece.get_current_cell(), target]))
+        return commands
+
+
+# ─── worker side ─────────────────────────────────────────────────────────────
+_worker: Dict = {}
+
+
+def _init_worker(root: str, tick_ms: int, max_ms: int, think_every_ms: int):
+    """Load the board, piece templates and sprites once per worker process."""
+    root = pathlib.Path(root)
+    board, _ = Board.read_board_and_pieces(str(root / "pieces" / "board.csv"),
+                                           Img().read(root / "board.png"), (1.0, 1.0))
+    _worker.update(factory=PieceFactory(board, root / "pieces"), board_csv=root / "pieces" / "board.csv",
+                   tick_ms=tick_ms, max_ms=max_ms, think_every_ms=think_every_ms)
+
+
+def play_game(seed: int) -> GameSummary:
+    """Play one random game in this worker (after _init_worker)."""
+    factory = _worker["factory"]
+    game = headless_game(load_pieces(factory, _worker["board_csv"]), factory.board)
+    result = run_headless(game, [], tick_ms=_worker["tick_ms"], max_ms=_worker["max_ms"],
+                          controller=RandomPlayer(seed), think_every_ms=_worker["think_every_ms"])
+    return GameSummary(seed, result.winner, result.end_ms, len(result.captures), result.commands)
+
+
+# ─── parent side ─────────────────────────────────────────────────────────────
+def run_batch(n_games: int, workers: Optional[int] = None, root: str | pathlib.Path = ROOT,
+              first_seed: int = 0, tick_ms: int = 10, max_ms: int = 300_000,
+              think_every_ms: int = 500) -> Iterator[GameSummary]:
+    """
+    Play `n_games` headless games (seeds first_seed, first_seed + 1, ...)
+    sharded over `workers` processes, yielding summaries as they finish
+    (in completion order).  workers=1 plays in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = range(first_seed, first_seed + n_games)
+    init_args = (str(root), tick_ms, max_ms, think_every_ms)
+
+    if workers == 1:
+        _init_worker(*init_args)
+        for seed in seeds:
+            yield play_game(seed)
+        return
+
+    # big enough chunks to amortize IPC, small enough to keep every core busy to the end
+    chunksize = max(1, n_games // (workers * 8))
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args) as pool:
+        yield from pool.imap_unordered(play_game, seeds, chunksize=chunksize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play many random headless games in parallel.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--root", default=str(ROOT), help="folder holding board.png and pieces/")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--tick-ms", type=int, default=10)
+    parser.add_argument("--max-ms", type=int, default=300_000, help="game time limit (draw after)")
+    parser.add_argument("--think-ms", type=int, default=500, help="how often each side issues a move")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summaries = list(run_batch(args.games, args.workers, args.root, args.seed,
+                               args.tick_ms, args.max_ms, args.think_ms))
+    elapsed = time.perf_counter() - start
+
+    wins = Counter(s.winner or "draw" for s in summaries)
+    n = len(summaries) or 1
+    print(f"{len(summaries)} games on {args.workers} workers in {elapsed:.2f}s → {len(summaries) / elapsed:.1f} games/sec")
+    print("results: " + ", ".join(f"{k}={v}" for k, v in sorted(wins.items())))
+    print(f"avg duration {sum(s.duration_ms for s in summaries) / n / 1000:.1f}s, "
+          f"avg captures {sum(s.captures for s in summaries) / n:.1f}, "
+          f"avg commands {sum(s.commands for s in summaries) / n:.1f}")
+    return summaries
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Run from It1_interfaces:  python -m Benchmarks.AIBenchmarks
+import pathlib
+import statistics
+import timeit
+
+from AIPlayer import AIPlayer, SearchState
+from BatchSimulator import RandomPlayer
+from Board import Board
+from HeadlessRunner import headless_game, load_pieces, run_headless
+from PieceFactory import PieceFactory
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+DECISIONS = 50
+
+
+def position(factory, until_ms: int):
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    run_headless(game, [], max_ms=until_ms, controller=RandomPlayer(5))
+    return game
+
+
+def main():
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    factory = PieceFactory(board, ROOT / "pieces")
+
+    for label, until_ms in [("opening", 0), ("middle game", 8000)]:
+        game = position(factory, until_ms)
+        now = game.now_ms or 0
+        static = {}
+        copy_us = min(timeit.repeat(lambda: SearchState.from_game(game, now, static), number=200, repeat=5)) / 200 * 1e6
+        print(f"{label}: {len(game.pieces)} pieces, position copy on the game thread {copy_us:.1f} us")
+
+        for budget_ms in (5, 50):
+            player = AIPlayer("W", budget_ms=budget_ms)
+            results = []
+            for _ in range(DECISIONS if budget_ms == 5 else 5):
+                player.decide(game, now)
+                results.append(player.last_result)
+            nodes = sum(r.nodes for r in results)
+            elapsed = sum(r.elapsed_ms for r in results)
+            print(f"  budget {budget_ms:3d} ms: {nodes / elapsed * 1000:9.0f} nodes/sec, "
+                  f"depth {statistics.mean(r.depth for r in results):.1f}, "
+                  f"decision time mean {statistics.mean(r.elapsed_ms for r in results):.2f} ms "
+                  f"max {max(r.elapsed_ms for r in results):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Run from It1_interfaces:  python -m Benchmarks.AssetBundleBenchmarks
+import multiprocessing
+import pathlib
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+PIECES = ROOT / "pieces"
+BOARD_PNG = ROOT / "board.png"
+REPEAT = 3
+
+
+def cold_start(bundle_path):
+    """Board + PieceFactory in a fresh interpreter, from the pieces/ tree or from a bundle."""
+    from Board import Board
+    from PieceFactory import PieceFactory
+    from SpriteCache import SpriteCache
+    from img import Img
+
+    board, _ = Board.read_board_and_pieces(str(PIECES / "board.csv"), Img().read(BOARD_PNG), (1.0, 1.0))
+    start = time.perf_counter()
+    PieceFactory(board, PIECES, bundle_path=bundle_path)
+    return (time.perf_counter() - start) * 1000, SpriteCache.stats()["misses"]
+
+
+def best(pool_ctx, bundle_path):
+    runs = []
+    for _ in range(REPEAT):
+        with pool_ctx.Pool(1) as pool:
+            runs.append(pool.apply(cold_start, (bundle_path,)))
+    return min(runs)
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")    # fresh interpreter per run
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle_path = pathlib.Path(tmp) / "assets.ctdbundle"
+        with ctx.Pool(1) as pool:
+            compile_ms, _ = pool.apply(cold_start, (bundle_path,))       # first run compiles
+        size_mb = bundle_path.stat().st_size / 2**20
+
+        print(f"cold start of the stock pieces (best of {REPEAT}):")
+        for label, path in (("pieces/ tree", None), ("mapped bundle", bundle_path)):
+            ms, decoded = best(ctx, path)
+            print(f"  {label:<14} {ms:7.1f} ms  decoded {decoded:4d} sprites")
+        print(f"  first run, compiling the {size_mb:.1f} MB bundle: {compile_ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
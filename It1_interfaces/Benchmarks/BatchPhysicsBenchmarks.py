@@ -0,0 +1,69 @@
+# Run from It1_interfaces:  python -m Benchmarks.BatchPhysicsBenchmarks
+import pathlib
+import random
+import time
+
+from BatchPhysics import BatchPhysics
+from Board import Board
+from Command import Command
+from PieceFactory import PieceFactory
+from StateArrays import StateArrays
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+SIZES = [32, 128, 512, 2048]
+REPEAT = 200
+
+
+def mass_battle(factory, n: int, seed: int = 7):
+    """`n` rooks bound to one StateArrays, half of them in the middle of a move along their row."""
+    rng = random.Random(seed)
+    state = StateArrays()
+    pieces = []
+    for i in range(n):
+        p_type = "RW" if i % 2 else "RB"
+        piece = factory.create_piece(p_type)
+        piece.piece_id = f"{p_type}_{i}"
+        cell = (rng.randrange(8), rng.randrange(8))
+        piece.set_current_cell(cell, 0)
+        state.add(piece)
+        if i % 4 < 2:
+            target = (cell[0], (cell[1] + rng.randrange(1, 8)) % 8)
+            piece.on_command(Command(0, piece.piece_id, "Move", [cell, target]), 0)
+        pieces.append(piece)
+    return state, pieces
+
+
+def per_piece_us(pieces, now_ms: int) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for piece in pieces:
+            physics = piece._state.get_physics()
+            physics.get_draw_position(now_ms)
+            physics.get_cooldown_ratio(now_ms)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def batched_us(batch: BatchPhysics, state: StateArrays, now_ms: int) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        batch.compute(state, now_ms)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+def main():
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    factory = PieceFactory(board, ROOT / "pieces")
+
+    print("draw positions + cooldown ratios of one frame:")
+    for n in SIZES:
+        state, pieces = mass_battle(factory, n)
+        batch = BatchPhysics(board)
+        batch.compute(state, 300)                    # builds the kind table
+        scalar, vector = per_piece_us(pieces, 300), batched_us(batch, state, 300)
+        print(f"  {n:5d} pieces: per piece {scalar:8.1f} us   batched {vector:7.1f} us   ({scalar / vector:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
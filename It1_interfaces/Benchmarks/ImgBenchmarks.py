@@ -0,0 +1,69 @@
+# Run from It1_interfaces:  python -m Benchmarks.ImgBenchmarks
+import pathlib
+import timeit
+
+import cv2
+import numpy as np
+
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+BOARD_PNG = ROOT / "board.png"
+SPRITE_PNG = ROOT / "pieces" / "NW" / "states" / "idle" / "sprites" / "1.png"
+BOARD_CELLS = 8
+REPEAT = 2000
+
+
+def legacy_draw_on(sprite: np.ndarray, background: np.ndarray, x: int, y: int):
+    """The float64 per-channel blend Img.draw_on used before the cached mask."""
+    if sprite.shape[2] != background.shape[2]:
+        if sprite.shape[2] == 3 and background.shape[2] == 4:
+            sprite = cv2.cvtColor(sprite, cv2.COLOR_BGR2BGRA)
+        elif sprite.shape[2] == 4 and background.shape[2] == 3:
+            sprite = cv2.cvtColor(sprite, cv2.COLOR_BGRA2BGR)
+
+    h, w = sprite.shape[:2]
+    roi = background[y:y + h, x:x + w]
+    if sprite.shape[2] == 4:
+        b, g, r, a = cv2.split(sprite)
+        mask = a / 255.0
+        for c in range(3):
+            roi[..., c] = (1 - mask) * roi[..., c] + mask * sprite[..., c]
+    else:
+        background[y:y + h, x:x + w] = sprite
+
+
+def time_us(fn) -> float:
+    """Best-of-5 mean time of ``fn`` in microseconds."""
+    return min(timeit.repeat(fn, number=REPEAT, repeat=5)) / REPEAT * 1e6
+
+
+def bench(label: str, sprite: Img, board: Img):
+    legacy_sprite = sprite.img.copy()
+    before = time_us(lambda: legacy_draw_on(legacy_sprite, board.img, 0, 0))
+    after = time_us(lambda: sprite.draw_on(board, 0, 0))
+    print(f"{label:<28} before {before:8.1f} us   after {after:8.1f} us   x{before / after:5.1f}")
+
+
+def main():
+    board = Img().read(BOARD_PNG)
+    cell_w = board.img.shape[1] // BOARD_CELLS
+    cell_h = board.img.shape[0] // BOARD_CELLS
+    print(f"board {board.img.shape[1]}x{board.img.shape[0]}, cell {cell_w}x{cell_h}, {REPEAT} draws per sample")
+
+    # stock sprites ship without an alpha channel
+    opaque = Img().read(SPRITE_PNG, size=(cell_w, cell_h))
+    opaque.img = cv2.cvtColor(opaque.img, cv2.COLOR_BGR2BGRA)
+    bench("opaque sprite (stock)", opaque, board)
+
+    # same sprite with a soft alpha edge, the case the float path was written for
+    translucent = Img()
+    translucent.img = opaque.img.copy()
+    yy, xx = np.mgrid[0:cell_h, 0:cell_w]
+    dist = np.hypot(yy - cell_h / 2, xx - cell_w / 2)
+    translucent.img[..., 3] = np.clip(255 - dist * 4, 0, 255).astype(np.uint8)
+    bench("translucent sprite", translucent, board)
+
+
+if __name__ == "__main__":
+    main()
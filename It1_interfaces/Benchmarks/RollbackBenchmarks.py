@@ -0,0 +1,66 @@
+# Run from It1_interfaces:  python -m Benchmarks.RollbackBenchmarks
+import pathlib
+import time
+
+from BatchSimulator import RandomPlayer
+from Board import Board
+from HeadlessRunner import headless_game, load_pieces
+from PieceFactory import PieceFactory
+from Rollback import RollbackSession
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+FRAME_MS = 16.0
+MAX_TICKS = 512
+DEPTHS = [8, 16, 32, 48, 64, 96, 128, 192, 256, 384, 512]
+
+
+def busy_session(factory, until_ms: int, think_every_ms: int = 100) -> RollbackSession:
+    """Both sides move a random piece every `think_every_ms` – many pieces in flight, the worst case."""
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    session = RollbackSession(game, max_rollback_ticks=MAX_TICKS)
+    player = RandomPlayer(7)
+    while game.now_ms < until_ms and not game._is_win():
+        if game.now_ms % think_every_ms == 0:
+            for cmd in player(game, game.now_ms):
+                session.add_local(cmd)
+        session.confirm(game.now_ms)
+        session.advance()
+    return session
+
+
+def rollback_ms(session: RollbackSession, depth: int, repeat: int = 5) -> float:
+    """Worst of `repeat` rollbacks re-simulating `depth` ticks."""
+    tick = session.game.now_ms - (depth - 1) * session.tick_ms
+    worst = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session._rollback(tick)
+        worst = max(worst, (time.perf_counter() - start) * 1000)
+    return worst
+
+
+def main():
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    factory = PieceFactory(board, ROOT / "pieces")
+
+    session = busy_session(factory, 10_000)
+    game = session.game
+    session.confirmed_ms = game.now_ms - MAX_TICKS * session.tick_ms     # open the whole ring for the test
+    moving = sum(p.next_deadline() is not None for p in game.pieces.values())
+    print(f"position at {game.now_ms} ms: {len(game.pieces)} pieces, {moving} moving / resting")
+
+    fits = 0                    # deepest depth before the first one over budget
+    for depth in DEPTHS:
+        ms = rollback_ms(session, depth)
+        print(f"  depth {depth:4d} ticks ({depth * session.tick_ms:5d} ms of game): "
+              f"{ms:7.2f} ms  ({ms / depth * 1000:5.1f} us/tick)")
+        if ms <= FRAME_MS and fits == ([0] + DEPTHS)[DEPTHS.index(depth)]:
+            fits = depth
+    print(f"worst-case re-simulation depth within {FRAME_MS:.0f} ms: {fits} ticks "
+          f"({fits * session.tick_ms} ms of game time)")
+
+
+if __name__ == "__main__":
+    main()
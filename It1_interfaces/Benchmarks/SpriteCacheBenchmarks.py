@@ -0,0 +1,63 @@
+# Run from It1_interfaces:  python -m Benchmarks.SpriteCacheBenchmarks
+import multiprocessing
+import pathlib
+import resource
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+PIECES = ROOT / "pieces"
+BOARD_PNG = ROOT / "board.png"
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MB (Linux), peak RSS elsewhere."""
+    statm = pathlib.Path("/proc/self/statm")
+    if statm.exists():
+        pages = int(statm.read_text().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_stock_board(use_cache: bool):
+    """Mirror draft.create_game: factory templates, one piece per type, one clone per square."""
+    from Board import Board
+    from PieceFactory import PieceFactory
+    from SpriteCache import SpriteCache
+    from img import Img
+
+    SpriteCache.enabled = use_cache
+    before = rss_mb()
+    start = time.perf_counter()
+
+    board, placements = Board.read_board_and_pieces(str(PIECES / "board.csv"), Img().read(BOARD_PNG), (1.0, 1.0))
+    factory = PieceFactory(board, PIECES)
+    templates = {}
+    pieces = []
+    for piece_id, cell in placements:
+        if piece_id not in templates:
+            templates[piece_id] = factory.create_piece(piece_id)
+        pieces.append(templates[piece_id].clone())
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return len(pieces), elapsed_ms, rss_mb() - before, SpriteCache.stats()
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")    # fresh interpreter per run
+    results = {}
+    for use_cache in (False, True):
+        with ctx.Pool(1) as pool:
+            results[use_cache] = pool.apply(load_stock_board, (use_cache,))
+
+    for use_cache, (n, ms, mb, stats) in results.items():
+        label = "shared cache" if use_cache else "no cache"
+        print(f"{label:<13} {n} pieces  startup {ms:7.1f} ms  +RSS {mb:6.1f} MB  "
+              f"hits {stats['hits']:4d}  misses {stats['misses']:4d}")
+
+    _, ms_off, mb_off, _ = results[False]
+    _, ms_on, mb_on, _ = results[True]
+    print(f"saved         {ms_off - ms_on:7.1f} ms startup, {mb_off - mb_on:6.1f} MB resident")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# Run from It1_interfaces:  python -m Benchmarks.SpriteDecodeBenchmarks
+import multiprocessing
+import os
+import pathlib
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+PIECES = ROOT / "pieces"
+BOARD_PNG = ROOT / "board.png"
+WORKERS = [1, 2, 4, 8, 16]
+REPEAT = 3
+
+
+def cold_start(workers: int):
+    """Board + PieceFactory in a fresh interpreter: every sprite decoded from disk."""
+    from Board import Board
+    from PieceFactory import PieceFactory
+    from SpriteCache import SpriteCache
+    from img import Img
+
+    start = time.perf_counter()
+    board, _ = Board.read_board_and_pieces(str(PIECES / "board.csv"), Img().read(BOARD_PNG), (1.0, 1.0))
+    PieceFactory(board, PIECES, workers=workers)
+    return (time.perf_counter() - start) * 1000, SpriteCache.stats()
+
+
+def main():
+    ctx = multiprocessing.get_context("spawn")    # fresh interpreter per run
+    print(f"cold start of the stock pieces ({os.cpu_count()} CPUs, best of {REPEAT}):")
+    serial = None
+    for workers in WORKERS:
+        runs = []
+        for _ in range(REPEAT):
+            with ctx.Pool(1) as pool:
+                runs.append(pool.apply(cold_start, (workers,)))
+        ms, stats = min(runs, key=lambda run: run[0])
+        serial = serial or ms
+        print(f"  {workers:2d} workers: {ms:7.1f} ms  ({serial / ms:4.2f}x)  "
+              f"decoded {stats['misses']:4d}  cache hits {stats['hits']:4d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Run from It1_interfaces:  python -m Benchmarks.StateArraysBenchmarks
+import pathlib
+import timeit
+
+from BatchSimulator import RandomPlayer
+from Board import Board
+from HeadlessRunner import headless_game, load_pieces, run_headless
+from PieceFactory import PieceFactory
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+REPEAT = 2000
+
+
+def time_us(fn, repeat: int = REPEAT) -> float:
+    """Best-of-5 mean time of ``fn`` in microseconds."""
+    return min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat * 1e6
+
+
+def main():
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    factory = PieceFactory(board, ROOT / "pieces")
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), board)
+    run_headless(game, [], max_ms=5000, controller=RandomPlayer(1))     # mid-game position
+    print(f"{len(game.pieces)} live pieces, {game.state.data.nbytes} bytes of state")
+
+    snap = game.save_state()
+    rows = [(label, time_us(fn, n)) for label, fn, n in [
+        ("save_state (array copy)", game.save_state, REPEAT),
+        ("load_state (copy + rebuild)", lambda: game.load_state(snap), REPEAT),
+        ("Game.snapshot() (JSON-able)", game.snapshot, 200),
+        ("clone every piece", lambda: [p.clone() for p in game.pieces.values()], 20),
+    ]]
+    for label, us in rows:
+        print(f"{label:<30} {us:10.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Run from It1_interfaces:  python -m Benchmarks.ViewportBenchmarks
+import pathlib
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from Board import Board
+from HeadlessRunner import load_pieces
+from PieceFactory import PieceFactory
+from Renderer import Renderer
+from StateArrays import StateArrays
+from Viewport import ViewportRenderer
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+VIEW = (816, 816)
+CELL_PX = 24                  # of the big board: 200 x 24 = 4800 px a side
+TILES = 25                    # stock 8 x 8 layout repeated 25 x 25 times -> 200 x 200 cells
+REPEAT = 20
+
+
+def game_state(board_csv: pathlib.Path, background: Img):
+    board, _ = Board.read_board_and_pieces(str(board_csv), background, (1.0, 1.0))
+    factory = PieceFactory(board, ROOT / "pieces")
+    pieces = load_pieces(factory, board_csv)
+    state = StateArrays(len(pieces))
+    for piece in pieces:
+        state.add(piece)
+    return board, {p.piece_id: p for p in pieces}, state
+
+
+def frame_ms(renderer, pieces, state, repeat: int = REPEAT) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        renderer.render(pieces, i * 16, state)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    stock_csv = ROOT / "pieces" / "board.csv"
+    board, pieces, state = game_state(stock_csv, Img().read(ROOT / "board.png"))
+    renderer = Renderer(board)
+    first = frame_ms(renderer, pieces, state, repeat=1)
+    print(f"8 x 8 board, {len(pieces)} pieces:")
+    print(f"  Renderer         first frame {first:8.2f} ms   steady {frame_ms(renderer, pieces, state):6.2f} ms")
+    print(f"  ViewportRenderer {frame_ms(ViewportRenderer(board, VIEW), pieces, state):8.2f} ms per frame")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = stock_csv.read_text().split()
+        big_csv = pathlib.Path(tmp) / "board.csv"
+        big_csv.write_text("\n".join(",".join([row] * TILES) for row in rows * TILES) + "\n")
+        side = 8 * TILES * CELL_PX
+        background = Img()
+        background.img = cv2.resize(cv2.imread(str(ROOT / "board.png"), cv2.IMREAD_UNCHANGED), (side // TILES,) * 2)
+        background.img = np.tile(background.img, (TILES, TILES, 1))
+        board, pieces, state = game_state(big_csv, background)
+
+        print(f"{board.H_cells} x {board.W_cells} board ({side} px a side), {len(pieces)} pieces, "
+              f"{VIEW[0]} x {VIEW[1]} window:")
+        start = time.perf_counter()
+        board.clone()
+        print(f"  full-size frame buffer copy alone {(time.perf_counter() - start) * 1000:8.2f} ms "
+              f"(Renderer's first frame also composites every piece)")
+        view = ViewportRenderer(board, VIEW)
+        view.look_at((100, 100))
+        for zoom in (2.0, 1.0, 0.5, 0.25, 0.17):
+            view.set_zoom(zoom)
+            frame_ms(view, pieces, state, repeat=1)                # builds the level / resized sprites
+            ms = frame_ms(view, pieces, state)
+            print(f"  ViewportRenderer zoom {zoom:4.2f}: {ms:6.2f} ms per frame, "
+                  f"{view.visible_pieces:5d} pieces drawn (level {view.level_for(zoom)})")
+
+
+if __name__ == "__main__":
+    main()
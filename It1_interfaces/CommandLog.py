@@ -0,0 +1,279 @@
+import bisect
+import json
+import pathlib
+import queue
+import struct
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from Command import Command
+from Game import Game
+from GameTracker import VictoryRule, piece_kind
+from PieceFactory import PieceFactory
+
+# One record per command / completion:
+#   tick ms (int32), command timestamp (int32), piece index (uint16), type code (uint8),
+#   flags (uint8), two packed cells (uint16: row * width + col, NO_CELL if absent)
+RECORD = struct.Struct("<iiHBBHH")
+NO_CELL = 0xFFFF
+LOG_VERSION = 2                         # 1: uint8 cells
+FLAG_INTERNAL = 0x01                    # completion produced by Physics.update, not an input
+
+# The index file (<log>.idx) holds variable-size entries: kind (1 byte) + length (uint32) + payload;
+# a snapshot payload starts with its tick ms and record count, followed by the JSON state
+ENTRY = struct.Struct("<cI")
+SNAPSHOT_HEAD = struct.Struct("<iI")
+HEADER, PIECE_NAME, TYPE_NAME, SNAPSHOT = b"H", b"P", b"T", b"S"
+
+
+class LogRecord(NamedTuple):
+    tick_ms: int                        # game time of the tick that processed it
+    command: Command
+    internal: bool
+
+
+class CommandLogWriter:
+    """
+    Append-only binary log of everything that goes through a Game.
+
+    Commands and physics completions become fixed-width records in `path`;
+    piece-id / type-name tables and periodic full-state snapshots go to
+    `path`.idx.  The game thread only packs bytes and enqueues them – a
+    background thread does the file I/O.
+    """
+
+    def __init__(self, path: str | pathlib.Path, width: int, height: int,
+                 tick_ms: int = 10, snapshot_every_ms: int = 1000):
+        if width * height > NO_CELL:
+            raise ValueError(f"Board {width}x{height} too large for 2-byte cells")
+        self.path = pathlib.Path(path)
+        self.width = width
+        self.height = height
+        self.snapshot_every_ms = snapshot_every_ms
+        self.records = 0
+        self._pieces: Dict[str, int] = {}
+        self._types: Dict[str, int] = {}
+        self._next_snapshot_ms: Optional[int] = None
+        self._error: Optional[BaseException] = None
+
+        self._queue: "queue.Queue[Optional[Tuple[bool, bytes]]]" = queue.Queue()
+        self._log_file = open(self.path, "wb")
+        self._idx_file = open(_index_path(self.path), "wb")
+        self._thread = threading.Thread(target=self._write_loop, name="command-log", daemon=True)
+        self._thread.start()
+        self._entry(HEADER, json.dumps({"version": LOG_VERSION, "width": width, "height": height,
+                                            "tick_ms": tick_ms}).encode())
+
+    # ─── game thread ─────────────────────────────────────────────────────────
+    def record(self, tick_ms: int, cmd: Command, internal: bool = False):
+        """Append one command (or, with internal=True, a physics completion)."""
+        piece = self._code(self._pieces, cmd.piece_id, PIECE_NAME)
+        cmd_type = self._code(self._types, cmd.type, TYPE_NAME)
+        cells = [self._pack_cell(p) for p in cmd.params[:2]]
+        cells += [NO_CELL] * (2 - len(cells))
+        flags = FLAG_INTERNAL if internal else 0
+        self._queue.put((False, RECORD.pack(tick_ms, cmd.timestamp, piece, cmd_type, flags, *cells)))
+        self.records += 1
+
+    def snapshot_due(self, now_ms: int) -> bool:
+        return self._next_snapshot_ms is not None and now_ms >= self._next_snapshot_ms
+
+    def snapshot(self, now_ms: int, state: dict):
+        """Store a full-state snapshot taken at the end of the tick `now_ms`."""
+        payload = json.dumps(state, separators=(",", ":")).encode()
+        self._entry(SNAPSHOT, SNAPSHOT_HEAD.pack(now_ms, self.records) + payload)
+        self._next_snapshot_ms = now_ms + self.snapshot_every_ms
+
+    def close(self):
+        """Flush everything to disk and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _code(self, table: Dict[str, int], name: str, kind: bytes) -> int:
+        code = table.get(name)
+        if code is None:
+            code = table[name] = len(table)
+            self._entry(kind, name.encode())
+        return code
+
+    def _pack_cell(self, param) -> int:
+        """row * width + col of an on-board cell; NO_CELL for anything else (off-board, malformed)."""
+        if (isinstance(param, (tuple, list)) and len(param) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) for v in param)
+                and 0 <= param[0] < self.height and 0 <= param[1] < self.width):
+            return param[0] * self.width + param[1]
+        return NO_CELL
+
+    def _entry(self, kind: bytes, payload: bytes):
+        self._queue.put((True, ENTRY.pack(kind, len(payload)) + payload))
+
+    # ─── writer thread ───────────────────────────────────────────────────────
+    def _write_loop(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                to_index, data = item
+                (self._idx_file if to_index else self._log_file).write(data)
+        except BaseException as e:          # surfaced on close()
+            self._error = e
+        finally:
+            self._log_file.close()
+            self._idx_file.close()
+
+
+class CommandLogReader:
+    """
+    Random access to a closed command log.  Records are in tick order, so
+    finding the first record at a time is a binary search over the fixed-width
+    file; seeking restores the nearest earlier snapshot and re-simulates only
+    the records after it.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.header: dict = {}
+        self.piece_ids: List[str] = []
+        self.types: List[str] = []
+        self._snapshot_times: List[int] = []
+        self._snapshot_at: List[Tuple[int, int]] = []       # (offset, length) in the index file
+
+        with open(_index_path(self.path), "rb") as f:
+            while True:
+                head = f.read(ENTRY.size)
+                if len(head) < ENTRY.size:
+                    break
+                kind, length = ENTRY.unpack(head)
+                offset = f.tell()
+                if kind == SNAPSHOT:
+                    # only the time is needed now; the state is parsed on demand
+                    t_ms, _ = SNAPSHOT_HEAD.unpack(f.read(SNAPSHOT_HEAD.size))
+                    self._snapshot_times.append(t_ms)
+                    self._snapshot_at.append((offset, length))
+                    f.seek(offset + length)
+                    continue
+                payload = f.read(length)
+                if kind == HEADER:
+                    self.header = json.loads(payload)
+                elif kind == PIECE_NAME:
+                    self.piece_ids.append(payload.decode())
+                elif kind == TYPE_NAME:
+                    self.types.append(payload.decode())
+
+        if self.header.get("version", 1) != LOG_VERSION:
+            raise ValueError(f"{self.path}: log version {self.header.get('version', 1)}, expected {LOG_VERSION}")
+        self.width = self.header["width"]
+        self.tick_ms = self.header["tick_ms"]
+        self._file = open(self.path, "rb")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.path.stat().st_size // RECORD.size
+
+    def record(self, i: int) -> LogRecord:
+        self._file.seek(i * RECORD.size)
+        return self._decode(self._file.read(RECORD.size))
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[LogRecord]:
+        stop = len(self) if stop is None else stop
+        self._file.seek(start * RECORD.size)
+        for _ in range(start, stop):
+            yield self._decode(self._file.read(RECORD.size))
+
+    def first_record_after(self, tick_ms: int) -> int:
+        """Index of the first record with a tick later than `tick_ms` (O(log n) reads)."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid).tick_ms <= tick_ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def snapshot_before(self, t_ms: int) -> Optional[dict]:
+        """The latest snapshot taken at or before `t_ms` ({"t", "record", "state"}), or None."""
+        i = bisect.bisect_right(self._snapshot_times, t_ms) - 1
+        if i < 0:
+            return None
+        offset, length = self._snapshot_at[i]
+        with open(_index_path(self.path), "rb") as f:
+            f.seek(offset)
+            t_ms, record = SNAPSHOT_HEAD.unpack(f.read(SNAPSHOT_HEAD.size))
+            return {"t": t_ms, "record": record, "state": json.loads(f.read(length - SNAPSHOT_HEAD.size))}
+
+    def seek(self, factory: PieceFactory, t_ms: int,
+             victory_rules: Optional[List[VictoryRule]] = None, **game_kwargs) -> Game:
+        """Rebuild the game as it was at the end of tick `t_ms`."""
+        snap = self.snapshot_before(t_ms)
+        if snap is None:
+            raise ValueError(f"No snapshot at or before {t_ms} ms")
+        game = restore_game(snap["state"], factory, victory_rules, **game_kwargs)
+        stop = self.first_record_after(t_ms)
+        inputs = [r for r in self.records(snap["record"], stop) if not r.internal]
+        _resimulate(game, inputs, t_ms, self.tick_ms)
+        return game
+
+    def _decode(self, raw: bytes) -> LogRecord:
+        tick_ms, timestamp, piece, cmd_type, flags, *cells = RECORD.unpack(raw)
+        params = [divmod(cell, self.width) for cell in cells if cell != NO_CELL]
+        cmd = Command(timestamp, self.piece_ids[piece], self.types[cmd_type], params)
+        return LogRecord(tick_ms, cmd, bool(flags & FLAG_INTERNAL))
+
+
+def restore_game(state: dict, factory: PieceFactory,
+                 victory_rules: Optional[List[VictoryRule]] = None, **game_kwargs) -> Game:
+    """Build a Game from Game.snapshot() data, with pieces cloned from the factory templates."""
+    pieces = []
+    for data in state["pieces"]:
+        piece = factory.clone_piece("".join(piece_kind(data["id"])))
+        piece.restore(data)
+        pieces.append(piece)
+    game = Game(pieces, factory.board, victory_rules, **game_kwargs)
+    game.tracker.set_initial_kinds(state["initial_kinds"])
+    game.capture_log = [tuple(c) for c in state["captures"]]
+    game.now_ms = state["now_ms"]
+    for piece in pieces:
+        game._reschedule(piece)
+    return game
+
+
+def _resimulate(game: Game, inputs: List[LogRecord], until_ms: int, tick_ms: int):
+    """Replay logged inputs on the tick grid, ticking only where something can happen."""
+    i, now = 0, game.now_ms
+    while not game._is_win():
+        pending = [t for t in (game.next_event_ms(), inputs[i].tick_ms if i < len(inputs) else None)
+                   if t is not None]
+        if not pending:
+            break
+        step = max(now + tick_ms, -(-min(pending) // tick_ms) * tick_ms)
+        if step > until_ms:
+            break
+        now = step
+        while i < len(inputs) and inputs[i].tick_ms <= now:
+            game.user_input_queue.put(inputs[i].command)
+            i += 1
+        game._tick(now)
+    game.now_ms = until_ms
+
+
+def _index_path(path: pathlib.Path) -> pathlib.Path:
+    return path.with_name(path.name + ".idx")
@@ -0,0 +1,57 @@
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class EventScheduler:
+    """
+    Priority queue of timed wake-ups (move / jump arrivals, rest cooldowns).
+
+    Each key has at most one live deadline; rescheduling or cancelling just
+    records the new deadline and stale heap entries are skipped when popped,
+    so every operation is O(log n) in the number of pending events.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._deadline: Dict[Hashable, int] = {}
+        self._seq = 0                       # FIFO order for equal deadlines → deterministic
+
+    def __len__(self) -> int:
+        return len(self._deadline)
+
+    def schedule(self, key: Hashable, deadline_ms: int) -> int:
+        """Wake `key` at `deadline_ms`, replacing any earlier registration; returns its FIFO sequence number."""
+        self._deadline[key] = deadline_ms
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline_ms, self._seq, key))
+        return self._seq
+
+    def load(self, entries: List[Tuple[int, Hashable]]):
+        """Replace everything with `entries` (deadline, key), already in wake order; keys get seq 1, 2, …"""
+        self._heap = [(deadline, seq, key) for seq, (deadline, key) in enumerate(entries, 1)]  # sorted → a heap
+        self._deadline = {key: deadline for deadline, key in entries}
+        self._seq = len(entries)
+
+    def cancel(self, key: Hashable):
+        self._deadline.pop(key, None)
+
+    def next_deadline(self) -> Optional[int]:
+        """Earliest pending deadline, or None if nothing is scheduled."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_ms: int) -> List[Hashable]:
+        """Remove and return every key whose deadline is <= now_ms, earliest first."""
+        due = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now_ms:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadline[key]
+            due.append(key)
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._deadline.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
@@ -1,30 +1,78 @@
 import inspect
 import pathlib
-import queue, threading, time, cv2, math
-from typing import List, Dict, Tuple, Optional
+import threading, time, cv2, math
+from typing import Callable, List, Dict, Tuple, Optional
 from Board   import Board
 from Command import Command
 from Piece   import Piece
 from img     import Img
+from Renderer import Renderer
+from GameLoop import GameLoop
+from OccupancyIndex import OccupancyIndex
+from GameTracker import GameTracker, VictoryRule, piece_kind
+from EventScheduler import EventScheduler
+from InputQueue import InputQueue
+from Physics import MovePhysics
+from SweptCollisions import Mover, SweptCollisionDetector
+import numpy as np
+from StateArrays import (StateArrays, StateSnapshot, NONE, ALIVE, STATE, ARRIVAL, SEQ, CELL_R, CELL_C,
+                         FROM_R, FROM_C, TO_R, TO_C, START_MS, DURATION_MS)
 
 
 class InvalidBoard(Exception): ...
 # ────────────────────────────────────────────────────────────────────
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
-        """Initialize the game with pieces, board, and optional event bus."""
+    def __init__(self, pieces: List[Piece], board: Board,
+                 victory_rules: Optional[List[VictoryRule]] = None,
+                 renderer=None, clock: Callable[[], float] = time.perf_counter,
+                 command_log=None):
+        """
+        Initialize the game with pieces, board, and optional victory rules (default: king capture, then elimination).
+        `renderer` and `clock` (seconds, like time.perf_counter) can be swapped for headless runs;
+        `command_log` (a CommandLogWriter) records every command, completion and periodic snapshots.
+        """
         self.pieces = { p.piece_id : p for p in pieces}
+        if len(self.pieces) != len(pieces):
+            raise InvalidBoard("Piece ids must be unique")
         self.board = board
         self.start_time = None
-        self.user_input_queue = queue.Queue()
+        self.user_input_queue = InputQueue()      # bounded; drained once per tick in timestamp order
         self.mouse_callback_active = False
+        self.clock = clock
+        self.renderer = renderer if renderer is not None else Renderer(board)
+        self.loop: Optional[GameLoop] = None
+        self.now_ms: Optional[int] = None  # game time of the last simulated tick
+
+        # all dynamic piece data in one array → save_state / load_state are buffer copies
+        self.state = StateArrays(len(pieces))
+        for p in pieces:
+            self.state.add(p)
+
+        # cell → pieces, updated by the pieces themselves when their physics changes cell
+        self.occupancy = OccupancyIndex(board.W_cells)
+        for p in pieces:
+            self.occupancy.add(p.piece_id, p.get_current_cell())
+            self.state.mark_arrival(self.state.rows[p.piece_id])
+            p.add_cell_listener(self._on_piece_cell_changed)
+
+        # per-colour / per-type counts → O(1) end-of-game check
+        self.tracker = GameTracker(victory_rules)
+        self.tracker.start(self.pieces)
+
+        # wake-ups for move / jump arrivals and rest cooldowns – idle pieces are never updated
+        self.scheduler = EventScheduler()
+        # pieces crossing each other mid-flight (the occupancy index only sees arrivals)
+        self.collisions = SweptCollisionDetector(board)
+        self.capture_log: List[Tuple[int, str]] = []   # (game ms, captured piece id)
+        self.command_log = command_log
+        self.tick_listeners: List[Callable[["Game", int], None]] = []   # called after every tick (AI players, …)
 
     # ─── helpers ─────────────────────────────────────────────────────────────
     def game_time_ms(self) -> int:
         """Return the current game time in milliseconds."""
         if self.start_time is None:
-            self.start_time = time.perf_counter()
-        return int((time.perf_counter() - self.start_time) * 1000)
+            self.start_time = self.clock()
+        return int((self.clock() - self.start_time) * 1000)
 
     def clone_board(self) -> Board:
         """
@@ -40,83 +88,140 @@ class Game:
                 return
                 
             if event == cv2.EVENT_LBUTTONDOWN:
-                # Convert pixel coordinates to cell coordinates
+                # Convert pixel coordinates to cell coordinates (through the camera, if the renderer has one)
+                if hasattr(self.renderer, "screen_to_world"):
+                    x, y = self.renderer.screen_to_world(x, y)
                 cell_c = x // self.board.cell_W_pix
                 cell_r = y // self.board.cell_H_pix
                 
                 # Find piece at this location
-                for piece_id, piece in self.pieces.items():
-                    piece_pos = piece.get_current_cell()
-                    if piece_pos and piece_pos == (cell_r, cell_c):
-                        # Create a move command (simplified - just move one cell right as example)
-                        target_cell = (cell_r, cell_c + 1)
-                        if target_cell[1] < self.board.W_cells:  # Valid move
-                            cmd = Command(
-                                timestamp=self.game_time_ms(),
-                                piece_id=piece_id,
-                                type="Move",
-                                params=[piece_pos, target_cell]
-                            )
-                            self.user_input_queue.put(cmd)
-                        break
+                occupants = self.occupancy.pieces_at((cell_r, cell_c))
+                if occupants:
+                    piece_id = occupants[-1]
+                    piece_pos = (cell_r, cell_c)
+                    # Create a move command (simplified - just move one cell right as example)
+                    target_cell = (cell_r, cell_c + 1)
+                    if target_cell[1] < self.board.W_cells:  # Valid move
+                        cmd = Command(
+                            timestamp=self.now_ms if self.now_ms is not None else self.game_time_ms(),
+                            piece_id=piece_id,
+                            type="Move",
+                            params=[piece_pos, target_cell]
+                        )
+                        self.user_input_queue.put(cmd)
         
         cv2.namedWindow("Game Window")
         cv2.setMouseCallback("Game Window", mouse_callback)
         self.mouse_callback_active = True
 
     # ─── main public entrypoint ──────────────────────────────────────────────
-    def run(self):
-        """Main game loop."""
+    def run(self, tick_ms: int = 10, target_fps: float = 60.0):
+        """Main game loop: fixed `tick_ms` simulation steps, rendering decoupled at up to `target_fps`."""
         self.start_user_input_thread() # QWe2e5
 
         start_ms = self.game_time_ms()
+        self.start(start_ms)
+
+        # ─────── main loop ──────────────────────────────────────────────────
+        self.loop = GameLoop(tick_ms=tick_ms, target_fps=target_fps)
+        self.loop.run(
+            simulate=lambda sim_ms: self._tick(start_ms + sim_ms),
+            render=lambda render_ms: self._render_frame(start_ms + render_ms),
+            done=self._is_win,
+        )
+
+        self._announce_win()
+        cv2.destroyAllWindows()
+
+    def start(self, start_ms: int = 0):
+        """Put every piece in its initial state at game time `start_ms`."""
+        self.now_ms = start_ms
         for piece_id, p in self.pieces.items():
             p.reset(start_ms)
+            self._reschedule(p)
+        if self.command_log is not None:
+            self.command_log.snapshot(start_ms, self.snapshot())
 
-        # ─────── main loop ──────────────────────────────────────────────────
-        while not self._is_win():
-            now = self.game_time_ms() # monotonic time ! not computer time.
+    def _tick(self, now: int):
+        """Advance the simulation by one fixed step ending at game time `now`."""
+        prev, self.now_ms = self.now_ms, now
 
-            # (1) update physics & animations
-            for piece_id, p in self.pieces.items():
-                p.update(now)
+        # (0) contacts between pieces in flight since the previous tick – before anyone lands
+        if prev is not None:
+            self._resolve_swept_collisions(prev, now)
 
-            # (2) handle queued Commands from mouse thread
-            while not self.user_input_queue.empty(): # QWe2e5
-                cmd: Command = self.user_input_queue.get()
-                self._process_input(cmd)
+        # (1) wake only the pieces whose arrival / cooldown deadline has passed
+        for piece_id in self.scheduler.pop_due(now):
+            p = self.pieces.get(piece_id)
+            if p is not None:
+                done = p.update(now)
+                if done is not None and self.command_log is not None:
+                    self.command_log.record(now, done, internal=True)
+                self._reschedule(p)
 
-            # (3) draw current position
-            self._draw()
-            if not self._show():           # returns False if user closed window
-                break
+        # (2) handle queued Commands (mouse thread, AI, network) – one batch, in timestamp order
+        for cmd in self.user_input_queue.drain():
+            self._process_input(cmd)
 
-            # (4) detect captures
-            self._resolve_collisions()
+        # (3) detect captures
+        self._resolve_collisions()
 
-            # Small sleep to prevent excessive CPU usage
-            time.sleep(0.016)  # ~60 FPS
+        if self.command_log is not None and self.command_log.snapshot_due(now):
+            self.command_log.snapshot(now, self.snapshot())
 
-        self._announce_win()
-        cv2.destroyAllWindows()
+        for listener in self.tick_listeners:
+            listener(self, now)
+
+    def _render_frame(self, now: int) -> bool:
+        """Draw and show one frame at game time `now`; False if the user closed the window."""
+        self._draw(now)
+        return self._show()
 
     # ─── drawing helpers ────────────────────────────────────────────────────
     def _process_input(self, cmd : Command):
         if cmd.piece_id in self.pieces:
-            self.pieces[cmd.piece_id].on_command(cmd, cmd.timestamp)
+            piece = self.pieces[cmd.piece_id]
+            if cmd.type.lower() == "move" and not self._is_legal_move(piece, cmd):
+                return
+            # only commands that got past validation are logged – rejected ones have no effect to replay
+            if self.command_log is not None:
+                self.command_log.record(self.now_ms, cmd)
+            piece.on_command(cmd, cmd.timestamp)
+            self._reschedule(piece)
 
-    def _draw(self):
-        """Draw the current game state."""
-        # Start with a fresh board copy
-        current_board = self.clone_board()
-        
-        # Draw all pieces on the board
-        now = self.game_time_ms()
-        for piece_id, piece in self.pieces.items():
-            piece.draw_on_board(current_board, now)
-        
-        # Store the drawn board for showing
-        self.current_frame = current_board
+    def _reschedule(self, piece: Piece):
+        """Register (or drop) the piece's next timed event after its state changed."""
+        deadline = piece.next_deadline()
+        if deadline is None:
+            self.scheduler.cancel(piece.piece_id)
+        else:
+            self.state.data[self.state.rows[piece.piece_id], SEQ] = self.scheduler.schedule(piece.piece_id, deadline)
+
+    def _is_legal_move(self, piece: Piece, cmd: Command) -> bool:
+        """Check a Move against the live board: sliders are blocked, pawns capture only diagonally, etc."""
+        if not piece.get_moves() or len(cmd.params) < 2:
+            return True        # no rule file – Piece.is_command_possible decides
+        target = tuple(cmd.params[1])
+        if not (0 <= target[0] < self.board.H_cells and 0 <= target[1] < self.board.W_cells):
+            return False
+        legal = self.legal_mask(piece, cmd.params[0])
+        return bool(legal >> (target[0] * self.board.W_cells + target[1]) & 1)
+
+    def legal_mask(self, piece: Piece, from_cell: Optional[Tuple[int, int]] = None) -> int:
+        """Bitmask (bit = row * W_cells + col) of the cells `piece` may move to on the live board."""
+        moves = piece.get_moves()
+        if not moves:
+            return 0
+        r, c = piece.get_current_cell() or from_cell
+        colour = piece_kind(piece.piece_id)[1]
+        return moves.get_legal_mask(r, c, self.occupancy.bitboard(), self.occupancy.bitboard(colour),
+                                    first_move=not piece.has_moved)
+
+    def _draw(self, now: Optional[int] = None):
+        """Draw the current game state (only the cells that changed since the last frame)."""
+        if now is None:
+            now = self.game_time_ms()
+        self.current_frame = self.renderer.render(self.pieces, now, self.state)
 
     def _show(self) -> bool:
         """Show the current frame and handle window events."""
@@ -130,50 +235,152 @@ class Game:
         return True
 
     # ─── capture resolution ────────────────────────────────────────────────
+    def _on_piece_cell_changed(self, piece: Piece, old_cell, new_cell):
+        """Cell listener registered on every piece – keeps the occupancy index current."""
+        if piece.piece_id in self.pieces:
+            self.occupancy.move(piece.piece_id, new_cell)
+            self.state.mark_arrival(self.state.rows[piece.piece_id])
+
     def _resolve_collisions(self):
-        """Resolve piece collisions and captures."""
-        pieces_list = list(self.pieces.values())
-        
-        for i in range(len(pieces_list)):
-            for j in range(i + 1, len(pieces_list)):
-                piece1, piece2 = pieces_list[i], pieces_list[j]
-                
-                # Get current positions
-                pos1 = piece1.get_current_cell()
-                pos2 = piece2.get_current_cell()
-                
-                # Check if pieces are in the same cell
-                if pos1 and pos2 and pos1 == pos2:
-                    # Determine capture based on piece capabilities
-                    if piece1.can_capture() and piece2.can_be_captured():
-                        self._capture_piece(piece2)
-                    elif piece2.can_capture() and piece1.can_be_captured():
-                        self._capture_piece(piece1)
+        """Resolve captures in cells holding more than one piece (O(1) per contested cell)."""
+        for cell in list(self.occupancy.crowded):
+            occupants = self.occupancy.pieces_at(cell)
+            # the last piece to arrive attacks the ones already there
+            attacker = self.pieces[occupants[-1]]
+            for piece_id in occupants[:-1]:
+                defender = self.pieces[piece_id]
+                if self._same_side(attacker, defender):
+                    continue
+                if defender.can_be_captured():
+                    self._capture_piece(defender)
+                elif attacker.can_be_captured():
+                    self._capture_piece(attacker)   # landed on a piece in the air
+                    break
+
+    def _movers(self) -> List[Mover]:
+        """The live pieces currently in a MovePhysics flight, read from the state array in one pass."""
+        data = self.state.data[:len(self.state)]
+        rows = np.flatnonzero((data[:, ALIVE] == 1) & (data[:, TO_R] != NONE) & (data[:, START_MS] != NONE)
+                              & (data[:, DURATION_MS] > 0))
+        movers = []
+        cell_w, cell_h = self.board.cell_W_pix, self.board.cell_H_pix
+        for row, (state, fr, fc, tr, tc, start, duration) in zip(
+                rows.tolist(), data[rows][:, [STATE, FROM_R, FROM_C, TO_R, TO_C, START_MS, DURATION_MS]].tolist()):
+            piece = self.state.pieces[row]
+            physics = piece._machine.states[state].get_physics()
+            if isinstance(physics, MovePhysics):            # jumps are in the air, not on the board
+                movers.append(Mover(piece.piece_id, (fc * cell_w, fr * cell_h), (tc * cell_w, tr * cell_h),
+                                    start, duration))
+        return movers
+
+    def _resolve_swept_collisions(self, t0: int, t1: int):
+        """Resolve mid-flight contacts in (t0, t1], earliest first; the later mover attacks."""
+        contacts = self.collisions.contacts(self._movers(), t0, t1)
+        for contact in contacts:
+            if contact.first not in self.pieces or contact.second not in self.pieces:
+                continue                                # one of them was already captured
+            a, b = self.pieces[contact.first], self.pieces[contact.second]
+            attacker, defender = sorted((a, b), key=self._move_order)[::-1]
+            if defender.can_be_captured():
+                self._capture_piece(defender)
+            elif attacker.can_be_captured():
+                self._capture_piece(attacker)
+
+    def _move_order(self, piece: Piece) -> Tuple[int, int, str]:
+        """Sort key: when the piece's current move started, then command order (SEQ)."""
+        data = self.state.data[self.state.rows[piece.piece_id]]
+        return (int(data[START_MS]), int(data[SEQ]), piece.piece_id)
+
+    def next_event_ms(self) -> Optional[int]:
+        """Game time of the next thing that can happen without input: an arrival / cooldown or a mid-flight contact."""
+        deadline = self.scheduler.next_deadline()
+        if deadline is None or self.now_ms is None:
+            return deadline
+        contacts = self.collisions.contacts(self._movers(), self.now_ms, deadline)
+        return contacts[0].t_ms if contacts else deadline
+
+    @staticmethod
+    def _same_side(a: Piece, b: Piece) -> bool:
+        """Piece ids look like "PW…"/"QB…": the second character is the colour."""
+        return piece_kind(a.piece_id)[1] == piece_kind(b.piece_id)[1]
 
     def _capture_piece(self, piece: Piece):
         """Remove a captured piece from the game."""
         if piece.piece_id in self.pieces:
             del self.pieces[piece.piece_id]
+            self.state.kill(self.state.rows[piece.piece_id])
+            self.occupancy.remove(piece.piece_id)
+            self.scheduler.cancel(piece.piece_id)
+            self.capture_log.append((self.now_ms, piece.piece_id))
+            self.tracker.on_capture(piece.piece_id)
+
+    def add_piece(self, piece: Piece):
+        """Spawn a piece during the game (e.g. promotion)."""
+        if piece.piece_id in self.pieces:
+            raise InvalidBoard(f"Duplicate piece id: {piece.piece_id}")
+        self.pieces[piece.piece_id] = piece
+        self.state.mark_arrival(self.state.add(piece))
+        self.occupancy.add(piece.piece_id, piece.get_current_cell())
+        piece.add_cell_listener(self._on_piece_cell_changed)
+        self._reschedule(piece)
+        self.tracker.on_spawn(piece.piece_id)
+
+    # ─── snapshots ──────────────────────────────────────────────────────────
+    def snapshot(self) -> dict:
+        """Full game state as plain (JSON-able) data – see CommandLog.restore_game."""
+        return {
+            "now_ms": self.now_ms,
+            "pieces": [self.pieces[piece_id].snapshot() for piece_id in self.occupancy.arrival_order()]
+                      + [p.snapshot() for pid, p in self.pieces.items() if self.occupancy.cell_of(pid) is None],
+            "initial_kinds": self.tracker.initial_kinds(),
+            "captures": list(self.capture_log),
+        }
+
+    def save_state(self) -> StateSnapshot:
+        """Cheap snapshot for search / rollback: one copy of the state array (see load_state)."""
+        return self.state.snapshot(self.now_ms, len(self.capture_log))
+
+    def load_state(self, snap: StateSnapshot):
+        """
+        Return to a save_state() snapshot of this game.  The array is copied
+        back in place; the indexes derived from it (live pieces, occupancy,
+        scheduler, counts) are rebuilt in the original arrival / FIFO order.
+        """
+        self.state.restore(snap)
+        self.now_ms = snap.now_ms
+        del self.capture_log[snap.captures:]
+        data, rows = self.state.data, self.state.alive_rows()
+        ids = [self.state.pieces[row].piece_id for row in rows]
+        self.pieces = {piece_id: self.state.pieces[row] for piece_id, row in zip(ids, rows)}
+
+        # occupancy: live pieces with a cell, in arrival order
+        placed = np.flatnonzero(data[rows, CELL_R] != NONE)
+        placed = placed[np.argsort(data[rows[placed], ARRIVAL], kind="stable")]
+        cells = data[rows[placed]][:, [CELL_R, CELL_C]].tolist()
+        self.occupancy.load([(ids[i], tuple(cell)) for i, cell in zip(placed.tolist(), cells)])
+
+        # scheduler: deadline = start + duration (Physics.deadline_ms), FIFO order from the SEQ column
+        start, duration = data[rows, START_MS], data[rows, DURATION_MS]
+        timed = np.flatnonzero((start != NONE) & (duration != NONE))
+        deadlines = start[timed] + duration[timed]
+        order = np.lexsort((data[rows[timed], SEQ], deadlines))
+        timed, deadlines = timed[order], deadlines[order]
+        self.scheduler.load([(deadline, ids[i]) for deadline, i in zip(deadlines.tolist(), timed.tolist())])
+        data[rows[timed], SEQ] = np.arange(1, len(timed) + 1)
+
+        self.tracker.recount(ids)
 
     # ─── board validation & win detection ───────────────────────────────────
     def _is_win(self) -> bool:
-        """Check if the game has ended."""
-        # Simple win condition: only one piece type remaining
-        piece_types = set()
-        for piece in self.pieces.values():
-            piece_type = piece.piece_id[0]  # First character as type
-            piece_types.add(piece_type)
-        
-        return len(piece_types) <= 1
+        """Check if the game has ended (O(1): the tracker re-evaluates only on capture / spawn)."""
+        return self.tracker.game_over
 
     def _announce_win(self):
         """Announce the winner."""
-        if self.pieces:
-            remaining_piece = next(iter(self.pieces.values()))
-            winner_type = remaining_piece.piece_id[0]
-            print(f"Game Over! Winner: {winner_type}")
+        if self.tracker.winner:
+            print(f"Game Over! Winner: {self.tracker.winner}")
         else:
-            print("Game Over! No winner (all pieces captured)")
+            print("Game Over! No winner")
         
         # Show final message on screen
         if hasattr(self, 'current_frame'):
@@ -0,0 +1,117 @@
+import time
+from typing import Callable
+
+
+class GameLoop:
+    """
+    Fixed-timestep scheduler that decouples simulation from rendering.
+
+    The simulation always advances in whole `tick_ms` steps, so its outcome
+    does not depend on how long a frame takes to draw.  Rendering runs at up
+    to `target_fps`; the loop sleeps until the next frame deadline instead of
+    a constant, and when it falls behind it drops frames (skips rendering)
+    to let the simulation catch up.  If the backlog exceeds `max_lag_ms` the
+    excess wall time is discarded – the game slows down but every tick is
+    still simulated, so runs stay deterministic.
+    """
+
+    def __init__(self,
+                 tick_ms: int = 10,
+                 target_fps: float = 60.0,
+                 max_ticks_per_frame: int = 5,
+                 max_frame_skip: int = 5,
+                 max_lag_ms: int = 250,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.tick_ms = tick_ms
+        self.frame_ms = 1000.0 / target_fps
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.max_frame_skip = max_frame_skip
+        self.max_lag_ms = max_lag_ms
+        self._clock = clock
+        self._sleep = sleep
+
+        self.sim_ms = 0                 # simulated time, always a multiple of tick_ms
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.tick_rate = 0.0            # measured, per second
+        self.frame_rate = 0.0
+        self._origin = None
+        self._rate_window = (0.0, 0, 0)  # (window start ms, ticks, frames)
+
+    # ─── clock ──────────────────────────────────────────────────────────────
+    def elapsed_ms(self) -> float:
+        """Wall time since run() started, minus any time discarded on overload."""
+        return (self._clock() - self._origin) * 1000
+
+    def render_time_ms(self) -> int:
+        """
+        Time to draw at: the wall time, clamped between the last simulated tick
+        and the next one, so animations interpolate smoothly between ticks but
+        never run ahead of the simulation.
+        """
+        return self.sim_ms + int(min(max(self.elapsed_ms() - self.sim_ms, 0), self.tick_ms - 1))
+
+    # ─── main loop ──────────────────────────────────────────────────────────
+    def run(self,
+            simulate: Callable[[int], None],
+            render: Callable[[int], bool],
+            done: Callable[[], bool]):
+        """
+        Drive the game until `done()` is true or `render` returns False.
+
+        simulate(sim_ms) is called once per tick with the simulated time;
+        render(render_ms) once per drawn frame.
+        """
+        self._origin = self._clock()
+        self._rate_window = (0.0, 0, 0)
+        next_frame_ms = 0.0
+        skipped = 0
+
+        while not done():
+            now = self.elapsed_ms()
+
+            # (1) simulate every tick that is due, but only a bounded number per frame
+            steps = 0
+            while self.sim_ms + self.tick_ms <= now and steps < self.max_ticks_per_frame:
+                self.sim_ms += self.tick_ms
+                self.ticks += 1
+                steps += 1
+                simulate(self.sim_ms)
+                if done():
+                    return
+
+            # (2) overloaded: drop this frame, and discard wall time beyond max_lag_ms
+            excess = now - self.sim_ms - self.max_lag_ms
+            if excess > 0:
+                self._origin += excess / 1000
+                next_frame_ms -= excess
+                now -= excess
+            if self.sim_ms + self.tick_ms <= now and skipped < self.max_frame_skip:
+                skipped += 1
+                self.dropped_frames += 1
+                continue
+
+            # (3) render
+            skipped = 0
+            if not render(self.render_time_ms()):
+                return
+            self.frames += 1
+            self._measure_rates()
+
+            # (4) sleep until the next frame deadline (not a constant)
+            next_frame_ms = max(next_frame_ms + self.frame_ms, now)
+            delay_ms = next_frame_ms - self.elapsed_ms()
+            if delay_ms > 0:
+                self._sleep(delay_ms / 1000)
+
+    def _measure_rates(self):
+        """Refresh tick_rate / frame_rate once per second of wall time."""
+        start_ms, ticks, frames = self._rate_window
+        now = self.elapsed_ms()
+        if now - start_ms >= 1000:
+            seconds = (now - start_ms) / 1000
+            self.tick_rate = (self.ticks - ticks) / seconds
+            self.frame_rate = (self.frames - frames) / seconds
+            self._rate_window = (now, self.ticks, self.frames)
@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import json
+import pathlib
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple
+
+import numpy as np
+
+from Board import Board
+from Command import Command
+from Game import Game
+from GameTracker import piece_kind
+from HeadlessRunner import headless_game, load_pieces
+from PieceFactory import PieceFactory
+from StateArrays import ALIVE, STATE, CELL_R, CELL_C, TO_R, TO_C, START_MS, DURATION_MS, NONE
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+MAX_LINE = 4096                      # longest client message accepted (bytes)
+RESYNC = None                        # outbox marker: send the match's full state when it comes up
+
+# the columns a client can see – a change in any of them puts the piece in the next delta
+VISIBLE = [ALIVE, STATE, CELL_R, CELL_C, TO_R, TO_C, START_MS, DURATION_MS]
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class Match:
+    """One authoritative headless Game plus the clients watching it."""
+
+    def __init__(self, name: str, game: Game, start_tick: int, tick_ms: int):
+        self.name = name
+        self.game = game
+        self.start_tick = start_tick
+        self.tick_ms = tick_ms
+        self.clients: Set["ClientConnection"] = set()
+        self.over = False
+        self._seen = np.zeros((0, len(VISIBLE)), dtype=np.int64)     # last broadcast visible state
+        game.start(0)
+        self._seen = self._visible()
+
+    def _visible(self) -> np.ndarray:
+        return self.game.state.data[:len(self.game.state)][:, VISIBLE].copy()
+
+    def piece_entry(self, row: int) -> list:
+        """[state, row, col, target row, target col, start ms, duration ms] – None for absent values."""
+        piece = self.game.state.pieces[row]
+        values = self.game.state.data[row, VISIBLE[2:]].tolist()
+        return [piece.get_state_name()] + [None if v == NONE else v for v in values]
+
+    def full_state(self) -> bytes:
+        rows = self.game.state.alive_rows().tolist()
+        return _encode({"type": "state", "match": self.name, "t": self.game.now_ms,
+                        "pieces": {self.game.state.pieces[r].piece_id: self.piece_entry(r) for r in rows}})
+
+    def step(self, server_tick: int) -> Optional[bytes]:
+        """Advance one tick; return the delta message if anything visible changed."""
+        now = (server_tick - self.start_tick) * self.tick_ms
+        self.game._tick(now)
+
+        current = self._visible()
+        seen = self._seen
+        if len(seen) < len(current):                        # spawned pieces: everything is new
+            seen = np.vstack([seen, np.full((len(current) - len(seen), len(VISIBLE)), NONE, dtype=np.int64)])
+        changed = np.flatnonzero((current != seen).any(axis=1)).tolist()
+        self._seen = current
+        if not changed:
+            return None
+
+        pieces = self.game.state.pieces
+        alive = [r for r in changed if current[r, 0] == 1]
+        message = {"type": "delta", "match": self.name, "t": now,
+                   "changed": {pieces[r].piece_id: self.piece_entry(r) for r in alive},
+                   "removed": [pieces[r].piece_id for r in changed if current[r, 0] != 1]}
+        if self.game.tracker.game_over:
+            self.over = True
+            message["winner"] = self.game.tracker.winner
+        return _encode(message)
+
+
+class ClientConnection:
+    """
+    One socket.  Outgoing messages go through an outbox drained by a writer
+    task that awaits `drain()`, so a slow client never holds more than
+    `outbox_limit` broadcast deltas: when they overflow they are dropped and
+    the client gets one full state message instead, in their place.  Replies
+    to the client's own requests are never dropped – while `outbox_limit` of
+    them are unsent the server stops reading its requests (`wait_for_room`).
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, outbox_limit: int = 64):
+        self.reader = reader
+        self.writer = writer
+        self.outbox: Deque[Tuple[Optional[bytes], bool]] = deque()    # (message or RESYNC, is a delta)
+        self.outbox_limit = outbox_limit
+        self.deltas = 0                            # deltas among the queued messages
+        self.match: Optional[Match] = None
+        self.colour: Optional[str] = None          # None = spectator
+        self.needs_resync = False
+        self.resyncs = 0
+        self.closed = False
+        self._queued = asyncio.Event()             # set whenever the outbox gets something to write
+        self._room = asyncio.Event()               # set whenever a queued message leaves the outbox
+        self._writer_task = asyncio.create_task(self._write_loop())
+
+    def send(self, data: bytes):
+        """Queue a broadcast delta without waiting; on overflow switch the client to a resync."""
+        if self.closed or self.needs_resync:
+            return                                  # the pending full state will include it
+        if self.deltas < self.outbox_limit:
+            self.outbox.append((data, True))
+            self.deltas += 1
+        else:
+            # stale deltas are useless once one is lost – replies stay, in order
+            self.outbox = deque(entry for entry in self.outbox if not entry[1])
+            self.outbox.append((RESYNC, False))
+            self.deltas = 0
+            self.needs_resync = True
+            self.resyncs += 1
+        self._queued.set()
+
+    def reply(self, data: bytes):
+        """Queue an answer to the client's own request (or a final notice); never dropped."""
+        if self.closed:
+            return
+        self.outbox.append((data, False))
+        self._queued.set()
+
+    async def wait_for_room(self):
+        """Wait until fewer than `outbox_limit` replies are unsent – back-pressure on a client that does not read."""
+        while len(self.outbox) - self.deltas >= self.outbox_limit and not self.closed:
+            self._room.clear()
+            await self._room.wait()
+
+    async def _write_loop(self):
+        try:
+            while True:
+                if not self.outbox:
+                    self._queued.clear()
+                    await self._queued.wait()
+                    continue
+                data, is_delta = self.outbox.popleft()
+                if is_delta:
+                    self.deltas -= 1
+                self._room.set()
+                if data is RESYNC:
+                    self.needs_resync = False
+                    if self.match is None:
+                        continue                    # left the match meanwhile – nothing to resync
+                    data = self.match.full_state()
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    async def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._room.set()
+        self._writer_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class GameServer:
+    """
+    Asyncio server hosting authoritative headless Games.  Clients speak
+    newline-delimited JSON:
+
+        {"op": "join", "match": "m1", "colour": "W"}     colour optional (spectator)
+        {"op": "move", "piece": "PW_6_4", "to": [4, 4]}
+
+    One ticker task advances every match on a fixed `tick_ms` grid and
+    broadcasts only the pieces whose visible state changed.  A finished
+    match gets a last "game_over" message and its clients are detached.  Asset loading
+    (OpenCV) runs in a worker thread; matches use a null renderer, so the
+    event loop never waits on OpenCV.
+    """
+
+    def __init__(self, factory: Optional[PieceFactory] = None, root: str | pathlib.Path = ROOT,
+                 tick_ms: int = 10, outbox_limit: int = 64):
+        self.factory = factory
+        self.root = pathlib.Path(root)
+        self.tick_ms = tick_ms
+        self.outbox_limit = outbox_limit
+        self.matches: Dict[str, Match] = {}
+        self.clients: Set[ClientConnection] = set()
+        self.tick = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Load assets (off the event loop), start listening and ticking; returns the bound port."""
+        if self.factory is None:
+            self.factory = await asyncio.get_running_loop().run_in_executor(None, self._load_factory)
+        self._server = await asyncio.start_server(self._on_connect, host, port, limit=MAX_LINE)
+        self._ticker = asyncio.create_task(self._tick_loop())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for client in list(self.clients):
+            await client.close()
+
+    def _load_factory(self) -> PieceFactory:
+        board, _ = Board.read_board_and_pieces(str(self.root / "pieces" / "board.csv"),
+                                               Img().read(self.root / "board.png"), (1.0, 1.0))
+        return PieceFactory(board, self.root / "pieces")
+
+    def get_match(self, name: str) -> Match:
+        match = self.matches.get(name)
+        if match is None:
+            pieces = load_pieces(self.factory, self.root / "pieces" / "board.csv")
+            match = self.matches[name] = Match(name, headless_game(pieces, self.factory.board),
+                                               self.tick, self.tick_ms)
+        return match
+
+    # ─── ticking ────────────────────────────────────────────────────────────
+    async def _tick_loop(self, max_catch_up: int = 5):
+        loop = asyncio.get_running_loop()
+        origin = loop.time()
+        while True:
+            delay = origin + (self.tick + 1) * self.tick_ms / 1000 - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > max_catch_up * self.tick_ms / 1000:
+                origin -= delay                      # too far behind: skip ahead instead of spiralling
+            self.tick += 1
+            self.step_matches()
+
+    def step_matches(self):
+        """Advance every match one tick and broadcast the deltas."""
+        for name, match in list(self.matches.items()):
+            delta = match.step(self.tick)
+            if delta is not None:
+                for client in match.clients:
+                    client.send(delta)
+            if match.over:
+                # the clients are told once and detached – a later move gets "join a match first"
+                over = _encode({"type": "game_over", "match": name, "winner": match.game.tracker.winner})
+                for client in match.clients:
+                    client.reply(over)
+                    client.match = None
+                match.clients.clear()
+                del self.matches[name]
+
+    # ─── connections ────────────────────────────────────────────────────────
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientConnection(reader, writer, self.outbox_limit)
+        self.clients.add(client)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    client.reply(_encode({"type": "error", "error": "message too long"}))
+                    break
+                if not line:
+                    break
+                self._handle(client, line)
+                await client.wait_for_room()
+        except ConnectionError:
+            pass
+        finally:
+            if client.match is not None:
+                client.match.clients.discard(client)
+            self.clients.discard(client)
+            await client.close()
+
+    def _handle(self, client: ClientConnection, line: bytes):
+        try:
+            msg = json.loads(line)
+            op = msg["op"]
+        except (ValueError, KeyError, TypeError):
+            client.reply(_encode({"type": "error", "error": "bad message"}))
+            return
+
+        if op == "join":
+            if client.match is not None:
+                client.match.clients.discard(client)
+            match = self.get_match(str(msg.get("match", "default")))
+            client.match, client.colour = match, msg.get("colour")
+            match.clients.add(client)
+            client.reply(match.full_state())
+        elif op == "move":
+            error = self._submit_move(client, msg)
+            if error:
+                client.reply(_encode({"type": "error", "error": error}))
+        else:
+            client.reply(_encode({"type": "error", "error": f"unknown op {op!r}"}))
+
+    def _submit_move(self, client: ClientConnection, msg: dict) -> Optional[str]:
+        match = client.match
+        if match is None:
+            return "join a match first"
+        piece_id = msg.get("piece")
+        piece = match.game.pieces.get(piece_id) if isinstance(piece_id, str) else None
+        if piece is None:
+            return "no such piece"
+        if piece_kind(piece.piece_id)[1] != client.colour:
+            return "not your piece"
+        try:
+            target = (int(msg["to"][0]), int(msg["to"][1]))
+        except (KeyError, IndexError, TypeError, ValueError):
+            return "bad target"
+        # legality is checked by the game itself when the command is processed
+        match.game.user_input_queue.put(Command(match.game.now_ms or 0, piece.piece_id, "Move",
+                                                [piece.get_current_cell(), target]))
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kung-Fu chess match server (newline-delimited JSON over TCP).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--root", default=str(ROOT), help="folder holding board.png and pieces/")
+    parser.add_argument("--tick-ms", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = GameServer(root=args.root, tick_ms=args.tick_ms)
+        port = await server.start(args.host, args.port)
+        print(f"serving on {args.host}:{port}")
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
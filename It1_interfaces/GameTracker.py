@@ -0,0 +1,123 @@
+from collections import Counter
+from typing import Iterable, List, Optional, Set, Tuple
+
+
+def piece_kind(piece_id: str) -> Tuple[str, str]:
+    """Split an id like "KW" / "PB_1_3" into (type, colour) = ("K", "W") / ("P", "B")."""
+    return piece_id[0:1], piece_id[1:2]
+
+
+class VictoryRule:
+    """Decides, from the tracker's counters alone, whether the game is over."""
+    def evaluate(self, tracker: "GameTracker") -> Tuple[bool, Optional[str]]:
+        """Return (game over, winning colour or None for a draw)."""
+        raise NotImplementedError()
+
+
+class KingCaptureRule(VictoryRule):
+    """The game ends when a side that started with a king has lost it."""
+    def __init__(self, king_type: str = "K"):
+        self.king_type = king_type
+
+    def evaluate(self, tracker: "GameTracker") -> Tuple[bool, Optional[str]]:
+        royal = tracker.colours_with(self.king_type, at_start=True)
+        alive = [c for c in royal if tracker.count(c, self.king_type) > 0]
+        if len(alive) == len(royal):
+            return False, None
+        return True, alive[0] if len(alive) == 1 else None
+
+
+class EliminationRule(VictoryRule):
+    """The game ends when at most one side has pieces left."""
+    def evaluate(self, tracker: "GameTracker") -> Tuple[bool, Optional[str]]:
+        alive = tracker.colours_alive()
+        if len(alive) > 1:
+            return False, None
+        return True, next(iter(alive), None)
+
+
+class GameTracker:
+    """
+    Per-colour and per-type piece counts, kept up to date on spawn and
+    capture, so checking for the end of the game is O(1) per frame.
+    Victory rules are only re-evaluated when the counts change.
+    """
+
+    def __init__(self, rules: Optional[List[VictoryRule]] = None):
+        self.rules = rules if rules is not None else [KingCaptureRule(), EliminationRule()]
+        self._by_colour: Counter = Counter()
+        self._by_type: Counter = Counter()       # (colour, type) -> count
+        self._at_start: Set[Tuple[str, str]] = set()
+        self._started = False
+        self.game_over = False
+        self.winner: Optional[str] = None
+
+    def start(self, piece_ids: Iterable[str]):
+        """Register the initial pieces and evaluate the rules once."""
+        for piece_id in piece_ids:
+            self._add(piece_id)
+        self._at_start = {key for key, n in self._by_type.items() if n > 0}
+        self._started = True
+        self._evaluate()
+
+    def initial_kinds(self) -> List[Tuple[str, str]]:
+        """(colour, type) pairs present at the start – what KingCaptureRule compares against."""
+        return sorted(self._at_start)
+
+    def set_initial_kinds(self, kinds: Iterable[Tuple[str, str]]):
+        """Restore initial_kinds() after start() (e.g. a game restored mid-way from a snapshot)."""
+        self._at_start = {tuple(kind) for kind in kinds}
+        self._evaluate()
+
+    def recount(self, piece_ids: Iterable[str]):
+        """Reset the counts to exactly `piece_ids` (initial kinds are kept) and re-evaluate."""
+        self._by_colour.clear()
+        self._by_type.clear()
+        for piece_id in piece_ids:
+            self._add(piece_id)
+        self._evaluate()
+
+    # ─── updates ────────────────────────────────────────────────────────────
+    def on_spawn(self, piece_id: str):
+        self._add(piece_id)
+        if self._started:
+            self._at_start.add(piece_kind(piece_id)[::-1])
+        self._evaluate()
+
+    def on_capture(self, piece_id: str):
+        p_type, colour = piece_kind(piece_id)
+        self._by_type[(colour, p_type)] -= 1
+        self._by_colour[colour] -= 1
+        self._evaluate()
+
+    def _add(self, piece_id: str):
+        p_type, colour = piece_kind(piece_id)
+        self._by_type[(colour, p_type)] += 1
+        self._by_colour[colour] += 1
+
+    def _evaluate(self):
+        for rule in self.rules:
+            over, winner = rule.evaluate(self)
+            if over:
+                self.game_over, self.winner = True, winner
+                return
+        self.game_over, self.winner = False, None
+
+    # ─── queries ────────────────────────────────────────────────────────────
+    def count(self, colour: str, p_type: Optional[str] = None) -> int:
+        """Pieces of `colour` (optionally only of `p_type`) still on the board."""
+        if p_type is None:
+            return self._by_colour[colour]
+        return self._by_type[(colour, p_type)]
+
+    def colours_alive(self) -> Set[str]:
+        return {c for c, n in self._by_colour.items() if n > 0}
+
+    def colours_with(self, p_type: str, at_start: bool = False) -> List[str]:
+        """Colours that have (or, with at_start, ever had) a piece of `p_type`."""
+        if at_start:
+            return sorted(c for c, t in self._at_start if t == p_type)
+        return sorted(c for (c, t), n in self._by_type.items() if t == p_type and n > 0)
+
+    def king_alive(self, colour: str, king_type: str = "K") -> bool:
+        return self._by_type[(colour, king_type)] > 0
@@ -3,11 +3,35 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 import copy
 from img import Img
+from SpriteCache import SpriteCache
 from Command import Command
 from Board import Board
+from StateArrays import ArraySlot, FlagSlot, ANIM_FRAME, ANIM_START_MS, ANIM_LAST_MS, ANIM_PLAYING, unbind_slots
+
+SPRITE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.bmp', '*.gif']
+
+
+def sprite_files(sprites_folder: pathlib.Path) -> List[pathlib.Path]:
+    """The animation frames in `sprites_folder`, in playback order."""
+    files = []
+    for ext in SPRITE_PATTERNS:
+        files.extend(sorted(sprites_folder.glob(ext)))
+    return files
+
+
+def board_channels(board: Board) -> Optional[int]:
+    """Channel count of the board image (sprites are normalized to it), None if unknown."""
+    shape = getattr(getattr(board.img, "img", None), "shape", None)
+    return shape[2] if shape is not None and len(shape) == 3 else None
 
 
 class Graphics:
+    # animation position – kept in the piece's StateArrays row once the piece joins a Game
+    current_frame = ArraySlot(ANIM_FRAME)
+    start_time_ms = ArraySlot(ANIM_START_MS)
+    last_frame_time = ArraySlot(ANIM_LAST_MS)
+    is_playing = FlagSlot(ANIM_PLAYING)
+
     def __init__(self,
                  sprites_folder: pathlib.Path,
                  board: Board,
@@ -30,6 +54,16 @@ class Graphics:
         self.is_playing = False
         self.start_time_ms = None
 
+    def _board_channels(self) -> Optional[int]:
+        return board_channels(self.board)
+
+    def _normalize(self, sprite: Img) -> Img:
+        """Convert a sprite to the board's channel layout once and freeze it."""
+        channels = self._board_channels()
+        if channels is not None:
+            sprite = sprite.to_channels(channels)
+        return sprite.freeze()
+
     def _load_sprites(self):
         """Load all sprite images from the folder."""
         self.sprites = []
@@ -44,26 +78,24 @@ class Graphics:
                 dtype=np.uint8
             )
             default_img.img = default_pixels
-            self.sprites.append(default_img)
+            self.sprites.append(self._normalize(default_img))
             return
             
         # Look for common image extensions
-        extensions = ['*.png', '*.jpg', '*.jpeg', '*.bmp', '*.gif']
-        sprite_files = []
-        
-        for ext in extensions:
-            sprite_files.extend(sorted(self.sprites_folder.glob(ext)))
+        files = sprite_files(self.sprites_folder)
         
-        if not sprite_files:
+        if not files:
             # No sprites found, create default
             self._create_default_sprite()
             return
             
-        # Load each sprite file
+        # Load each sprite file (decoded once per process in the board's
+        # channel layout, shared read-only)
         cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
-        for sprite_file in sprite_files:
+        channels = self._board_channels()
+        for sprite_file in files:
             try:
-                sprite = Img().read(sprite_file, size=cell_size, keep_aspect=False)
+                sprite = SpriteCache.get(sprite_file, cell_size, channels=channels)
                 self.sprites.append(sprite)
             except Exception as e:
                 print(f"Warning: Could not load sprite {sprite_file}: {e}")
@@ -82,23 +114,29 @@ class Graphics:
             dtype=np.uint8
         )
         default_img.img = default_pixels
-        self.sprites.append(default_img)
+        self.sprites.append(self._normalize(default_img))
 
     def copy(self):
-        """Create a shallow copy of the graphics object."""
-        new_graphics = Graphics(
-            self.sprites_folder,
-            self.board,
-            self.loop,
-            self.fps
-        )
-        new_graphics.sprites = [sprite.copy() for sprite in self.sprites]
-        new_graphics.current_frame = self.current_frame
-        new_graphics.last_frame_time = self.last_frame_time
-        new_graphics.is_playing = self.is_playing
-        new_graphics.start_time_ms = self.start_time_ms
+        """Create a shallow copy of the graphics object (sprites are shared, not reloaded)."""
+        new_graphics = copy.copy(self)
+        unbind_slots(new_graphics)      # the copy gets its own animation position
+        new_graphics.sprites = list(self.sprites)
         return new_graphics
 
+    def clone(self):
+        """Used by State.clone – share the cached sprites instead of deep-copying them."""
+        return self.copy()
+
+    def snapshot(self) -> dict:
+        """Animation position as plain data (for command-log snapshots)."""
+        return {"current_frame": self.current_frame, "start_time_ms": self.start_time_ms,
+                "last_frame_time": self.last_frame_time, "is_playing": self.is_playing}
+
+    def restore(self, data: dict):
+        """Inverse of snapshot()."""
+        for name, value in data.items():
+            setattr(self, name, value)
+
     def reset(self, cmd: Command):
         """Reset the animation with a new command."""
         self.current_frame = 0
@@ -131,15 +169,22 @@ class Graphics:
             else:
                 self.current_frame = target_frame
 
-    def get_img(self) -> Img:
-        """Get the current frame image."""
+    def get_frame(self) -> Img:
+        """
+        Return the current frame itself – shared and read-only, no copy.
+        Use this for drawing; call get_img() if you need pixels you can paint on.
+        """
         if not self.sprites:
             self._create_default_sprite()
             
         if self.current_frame >= len(self.sprites):
             self.current_frame = len(self.sprites) - 1
             
-        return self.sprites[self.current_frame].copy()
+        return self.sprites[self.current_frame]
+
+    def get_img(self) -> Img:
+        """Get a writable copy of the current frame image."""
+        return self.get_frame().copy()
 
     def is_animation_complete(self) -> bool:
         """Check if the animation has completed (for non-looping animations)."""
@@ -161,5 +206,4 @@ class Graphics:
         # x_pix = x_cell * self.board.cell_W_pix
         # y_pix = y_cell * self.board.cell_H_pix
 
-        sprite_img = self.get_img()
-        sprite_img.draw_on(target_img,   x_cell, y_cell)
+        self.get_frame().draw_on(target_img, x_cell, y_cell)
@@ -17,12 +17,12 @@ class GraphicsFactory:
         Load graphics based on configuration.
 
         cfg = {
-            "fps": 6.0,
-            "loop": True
+            "frames_per_sec": 6.0,   # or "fps"
+            "is_loop": True          # or "loop"
         }
         """
-        fps: float = cfg.get("fps", 6.0)
-        loop: bool = cfg.get("loop", True)
+        fps: float = cfg.get("frames_per_sec", cfg.get("fps", 6.0))
+        loop: bool = cfg.get("is_loop", cfg.get("loop", True))
 
         return Graphics(
             sprites_folder=sprites_dir,
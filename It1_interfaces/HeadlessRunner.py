@@ -0,0 +1,204 @@
+import argparse
+import json
+import pathlib
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from Board import Board
+from Command import Command
+from Game import Game
+from GameTracker import VictoryRule
+from Piece import Piece
+from PieceFactory import PieceFactory
+from img import Img
+from mock_img import MockImg
+
+
+class VirtualClock:
+    """Clock in seconds (like time.perf_counter) that only moves when told to."""
+    def __init__(self, start_s: float = 0.0):
+        self.t = start_s
+
+    def __call__(self) -> float:
+        return self.t
+
+    def advance_ms(self, ms: int):
+        self.t += ms / 1000
+
+    def sleep(self, seconds: float):
+        self.t += seconds
+
+
+class NullRenderer:
+    """Renderer stand-in for headless runs: a MockImg frame that is never painted."""
+    def __init__(self, board: Board):
+        self.frame = Board(W_cells=board.W_cells, H_cells=board.H_cells,
+                           cell_W_pix=board.cell_W_pix, cell_H_pix=board.cell_H_pix,
+                           cell_W_m=board.cell_W_m, cell_H_m=board.cell_H_m,
+                           img=MockImg())
+        self.frames = 0
+        self.dirty_rects = 0
+        self.redrawn_pieces = 0
+
+    def invalidate(self):
+        pass
+
+    def render(self, pieces: Dict[str, Piece], now_ms: int, state=None) -> Board:
+        self.frames += 1
+        return self.frame
+
+
+@dataclass
+class HeadlessResult:
+    winner: Optional[str]
+    game_over: bool
+    end_ms: int                                  # simulated game time when the run stopped
+    ticks: int                                   # simulation steps actually executed
+    wall_ms: float
+    commands: int = 0                            # scripted + controller commands fed to the game
+    captures: List[Tuple[int, str]] = field(default_factory=list)
+    pieces: Dict[str, Tuple[Tuple[int, int], str]] = field(default_factory=dict)   # id -> (cell, physics)
+
+    @property
+    def sim_per_wall(self) -> float:
+        """Simulated ms per wall-clock ms (1.0 = real time)."""
+        return self.end_ms / self.wall_ms if self.wall_ms > 0 else float("inf")
+
+    def outcome(self) -> dict:
+        """The outcome (everything except timing) as plain JSON-able data."""
+        return {
+            "winner": self.winner,
+            "game_over": self.game_over,
+            "end_ms": self.end_ms,
+            "commands": self.commands,
+            "captures": [list(c) for c in self.captures],
+            "pieces": {pid: [list(cell) if cell else None, phys] for pid, (cell, phys) in self.pieces.items()},
+        }
+
+    def outcome_bytes(self) -> bytes:
+        """Canonical encoding of outcome() – identical for identical runs."""
+        return json.dumps(self.outcome(), sort_keys=True, separators=(",", ":")).encode()
+
+
+def headless_game(pieces: List[Piece], board: Board,
+                  victory_rules: Optional[List[VictoryRule]] = None) -> Game:
+    """A Game with a null renderer and a virtual clock – no window, no wall-clock reads."""
+    return Game(pieces, board, victory_rules, renderer=NullRenderer(board), clock=VirtualClock())
+
+
+Controller = Callable[[Game, int], Iterable[Command]]
+
+
+def run_headless(game: Game, commands: Iterable[Command], tick_ms: int = 10,
+                 max_ms: int = 3_600_000, skip_idle: bool = True,
+                 controller: Optional[Controller] = None, think_every_ms: int = 500) -> HeadlessResult:
+    """
+    Run `game` to completion on the tick grid (0, tick_ms, 2*tick_ms, ...)
+    with scripted `commands`, each queued on the first tick at or after its
+    timestamp.  An optional `controller(game, now_ms)` is asked for more
+    commands every `think_every_ms` (e.g. an AI player).  With `skip_idle`,
+    ticks where nothing can happen (no piece deadline, no due command) are
+    jumped over – the outcome is the same, only faster.  Stops on game over,
+    when nothing is left to happen, or at `max_ms`.
+    """
+    script = sorted(commands, key=lambda cmd: cmd.timestamp)   # stable: equal timestamps keep script order
+    clock = game.clock if isinstance(game.clock, VirtualClock) else None
+    next_cmd, now, ticks, issued = 0, 0, 0, 0
+    next_think = 0 if controller is not None else None
+
+    wall_start = time.perf_counter()
+    game.start_time = game.clock()                  # game_time_ms() == simulated ms from here on
+    game.start(0)
+    while not game._is_win() and now < max_ms:
+        step = now + tick_ms
+        if skip_idle:
+            pending = [t for t in (game.next_event_ms(), next_think,
+                                   script[next_cmd].timestamp if next_cmd < len(script) else None)
+                       if t is not None]
+            if not pending:
+                break                                   # quiescent: nothing will ever change again
+            step = max(step, -(-min(pending) // tick_ms) * tick_ms)
+        step = min(step, max_ms)
+        if clock is not None:
+            clock.advance_ms(step - now)
+        now = step
+
+        while next_cmd < len(script) and script[next_cmd].timestamp <= now:
+            game.user_input_queue.put(script[next_cmd])
+            next_cmd += 1
+            issued += 1
+        if next_think is not None and now >= next_think:
+            for cmd in controller(game, now):
+                game.user_input_queue.put(cmd)
+                issued += 1
+            next_think = now + think_every_ms
+        game._tick(now)
+        ticks += 1
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+
+    return HeadlessResult(
+        winner=game.tracker.winner,
+        game_over=game.tracker.game_over,
+        end_ms=now,
+        ticks=ticks,
+        wall_ms=wall_ms,
+        commands=issued,
+        captures=list(game.capture_log),
+        pieces={pid: (p.get_current_cell(), type(p._state.get_physics()).__name__)
+                for pid, p in sorted(game.pieces.items())},
+    )
+
+
+def load_pieces(factory: PieceFactory, board_csv: str | pathlib.Path) -> List[Piece]:
+    """Create the pieces listed in board.csv with ids like "PW_6_0" ([0] = type, [1] = colour)."""
+    _, layout = Board.read_board_and_pieces(str(board_csv), factory.board.img,
+                                            (factory.board.cell_H_m, factory.board.cell_W_m))
+    pieces = []
+    for p_type, (row, col) in layout:
+        piece = factory.clone_piece(p_type)
+        piece.piece_id = f"{p_type}_{row}_{col}"
+        piece.set_current_cell((row, col), 0)
+        pieces.append(piece)
+    return pieces
+
+
+def load_script(path: str | pathlib.Path) -> List[Command]:
+    """Read commands from a JSON-lines file: {"timestamp", "piece_id", "type", "params"} per line."""
+    commands = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            rec = json.loads(line)
+            params = [tuple(p) if isinstance(p, list) else p for p in rec.get("params", [])]
+            commands.append(Command(int(rec["timestamp"]), rec["piece_id"], rec["type"], params))
+    return commands
+
+
+def main(argv=None):
+    root = pathlib.Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Run a scripted game without a window, as fast as possible.")
+    parser.add_argument("script", nargs="?", help="JSON-lines command script")
+    parser.add_argument("--root", default=str(root), help="folder holding board.png and pieces/")
+    parser.add_argument("--tick-ms", type=int, default=10)
+    parser.add_argument("--max-ms", type=int, default=3_600_000)
+    args = parser.parse_args(argv)
+
+    root = pathlib.Path(args.root)
+    board, _ = Board.read_board_and_pieces(str(root / "pieces" / "board.csv"),
+                                           Img().read(root / "board.png"), (1.0, 1.0))
+    factory = PieceFactory(board, root / "pieces")
+    game = headless_game(load_pieces(factory, root / "pieces" / "board.csv"), board)
+    commands = load_script(args.script) if args.script else []
+
+    result = run_headless(game, commands, tick_ms=args.tick_ms, max_ms=args.max_ms)
+    print(f"winner={result.winner} game_over={result.game_over} end_ms={result.end_ms} "
+          f"captures={len(result.captures)} ticks={result.ticks}")
+    print(f"{result.end_ms} sim ms in {result.wall_ms:.1f} wall ms → {result.sim_per_wall:.0f}x real time")
+    return result
+
+
+if __name__ == "__main__":
+    main()
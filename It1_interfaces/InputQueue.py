@@ -0,0 +1,85 @@
+import queue
+import threading
+from collections import deque
+from typing import Deque, List
+
+from Command import Command
+
+DROP_OLDEST = "drop_oldest"         # a flood pushes out stale input – the freshest commands survive
+DROP_NEWEST = "drop_newest"         # a flood is refused – what is already queued survives
+
+
+class InputQueue:
+    """
+    Bounded, thread-safe inbox for Commands (mouse thread, AI players,
+    network feeds → game loop).
+
+    Producers never block: once `maxsize` commands are waiting, the drop
+    policy decides which one is lost (and `dropped` counts it), so an input
+    flood cannot stall a frame.  The game loop takes everything with one
+    `drain()` – one lock round-trip per tick instead of one per command –
+    ordered by timestamp, with repeated identical commands coalesced.
+    """
+
+    def __init__(self, maxsize: int = 256, policy: str = DROP_OLDEST):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if policy not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._items: Deque[Command] = deque()
+        self._lock = threading.Lock()
+
+    def put(self, cmd: Command) -> bool:
+        """Queue `cmd`; False if it (or, with DROP_OLDEST, an older one) was dropped."""
+        with self._lock:
+            if len(self._items) < self.maxsize:
+                self._items.append(cmd)
+                return True
+            self.dropped += 1
+            if self.policy == DROP_OLDEST:
+                self._items.popleft()
+                self._items.append(cmd)
+            return False
+
+    put_nowait = put
+
+    def get_nowait(self) -> Command:
+        """Oldest queued command (queue.Queue compatible); raises queue.Empty."""
+        with self._lock:
+            if not self._items:
+                raise queue.Empty
+            return self._items.popleft()
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def drain(self) -> List[Command]:
+        """
+        Everything queued, in one batch: sorted by (timestamp, piece id) –
+        the same order whichever thread or peer delivered the commands first,
+        arrival order within one piece – and with exact repeats (same piece,
+        type and params, e.g. double clicks) kept only once, at the earliest.
+        """
+        with self._lock:
+            if not self._items:
+                return []
+            items, self._items = self._items, deque()
+        batch = sorted(items, key=lambda c: (c.timestamp, c.piece_id))
+
+        seen = set()
+        unique = []
+        for cmd in batch:
+            key = (cmd.piece_id, cmd.type, tuple(tuple(p) if isinstance(p, list) else p for p in cmd.params))
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(cmd)
+        self.coalesced += len(batch) - len(unique)
+        return unique
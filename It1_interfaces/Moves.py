@@ -1,15 +1,247 @@
 # Moves.py  – drop-in replacement
+import math
 import pathlib
-from typing import List, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple
+
+
+def iter_bits(mask: int):
+    """Yield the indices of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class MoveTable:
+    """
+    Reachable targets of every cell for one rule set on one board size.
+
+    Built once and shared (read-only) by every piece whose Moves uses the same
+    moves.txt and dimensions.  Slide directions (":slide" vectors) are kept
+    as line masks: each cell lies on one line per direction (its rank, file,
+    diagonal, …), and its ray is that line's mask cut above or below the
+    cell's bit (r * W + c), so they cost O(lines × cells) bits at any board
+    size.  `legal_mask` intersects those rays with a live occupancy bitboard
+    and cuts each at its nearest blocker in a few integer operations; a
+    ":1st" move also needs the cells between start and target empty.
+
+    Up to DENSE_CELLS cells the target tuple and bitmask of every cell and
+    tag (blocking ignored) are precomputed as well; on bigger boards they
+    would grow with the square of the cell count and are derived from the
+    step bits and line masks on demand.
+    """
+    KINDS = ("all", "capture", "non_capture", "first")
+    DENSE_CELLS = 32 * 32
+
+    def __init__(self, rules: List[Tuple[int, int, str]], dims: Tuple[int, int]):
+        self.height, self.width = dims
+        n_cells = self.height * self.width
+        self.dense = n_cells <= self.DENSE_CELLS
+        # kind -> per cell: target bits of the non-slide vectors (kinds with equal vectors share one list)
+        self.steps: Dict[str, List[Tuple[int, ...]]] = {}
+        # per slide direction: (dr, dc, line masks, per cell: index of its line); d and -d share the lines
+        self.slides: List[Tuple[int, int, List[int], List[int]]] = []
+        # per cell: (target bit, bits of the cells passed on the way) of every ":1st" vector
+        self.first_paths: List[Tuple[Tuple[int, Tuple[int, ...]], ...]] = []
+        # dense boards only – kind -> per cell: targets (steps first, then rays) and their bitmask
+        self.targets_of: Dict[str, List[Tuple[Tuple[int, int], ...]]] = {}
+        self.masks: Dict[str, List[int]] = {}
+        self.step_masks: Dict[str, List[int]] = {}
+
+        by_vectors: Dict[Tuple[Tuple[int, int], ...], List[Tuple[int, ...]]] = {}
+        for kind in self.KINDS:
+            vectors = tuple(dict.fromkeys((dr, dc) for dr, dc, tag in rules
+                                          if tag != "slide" and self._tag_matches(tag, kind)))
+            steps = by_vectors.get(vectors)
+            if steps is None:
+                steps = by_vectors[vectors] = []
+                for idx in range(n_cells):
+                    r, c = divmod(idx, self.width)
+                    steps.append(tuple(self.index(r + dr, c + dc) for dr, dc in vectors if self.on_board(r + dr, c + dc)))
+            self.steps[kind] = steps
+
+        lines: Dict[Tuple[int, int], Tuple[List[int], List[int]]] = {}
+        for dr, dc in dict.fromkeys((dr, dc) for dr, dc, tag in rules if tag == "slide" and (dr, dc) != (0, 0)):
+            up = (dr, dc) if dr * self.width + dc > 0 else (-dr, -dc)
+            if up not in lines:
+                lines[up] = self._lines(*up)
+            self.slides.append((dr, dc) + lines[up])
+
+        first = [(dr, dc) for dr, dc, tag in rules if tag == "1st"]
+        for idx in range(n_cells):
+            r, c = divmod(idx, self.width)
+            self.first_paths.append(tuple(self._path(r, c, dr, dc) for dr, dc in first
+                                          if self.on_board(r + dr, c + dc)))
+
+        if self.dense:
+            built: Dict[Tuple[int, bool], Tuple[list, list, list]] = {}     # kinds with equal tables share
+            for kind in self.KINDS:
+                key = (id(self.steps[kind]), kind != "first")
+                if key not in built:
+                    targets = [self._targets(idx, kind) for idx in range(n_cells)]
+                    built[key] = (targets, [self._mask(cells) for cells in targets],
+                                  [sum(1 << t for t in steps) for steps in self.steps[kind]])
+                self.targets_of[kind], self.masks[kind], self.step_masks[kind] = built[key]
+
+    @staticmethod
+    def _tag_matches(tag: str, kind: str) -> bool:
+        """Untagged moves work both as capture and non-capture; ":1st" only as a first move."""
+        if kind == "all":
+            return True
+        if kind == "first":
+            return tag == "1st"
+        return tag == kind or tag == ""
+
+    def _lines(self, dr: int, dc: int) -> Tuple[List[int], List[int]]:
+        """Masks of the lines of cells linked by (dr, dc) – a step towards higher bits – and the line of every cell."""
+        masks: List[int] = []
+        line_of: List[int] = []
+        for idx in range(self.height * self.width):
+            r, c = divmod(idx, self.width)
+            if self.on_board(r - dr, c - dc):
+                line = line_of[self.index(r - dr, c - dc)]
+            else:
+                line = len(masks)
+                masks.append(0)
+            masks[line] |= 1 << idx
+            line_of.append(line)
+        return masks, line_of
+
+    def _ray_length(self, r: int, c: int, dr: int, dc: int) -> int:
+        """Number of cells from (r, c) in direction (dr, dc) before leaving the board."""
+        limits = []
+        for pos, d, size in ((r, dr, self.height), (c, dc, self.width)):
+            if d > 0:
+                limits.append((size - 1 - pos) // d)
+            elif d < 0:
+                limits.append(pos // -d)
+        return min(limits)
+
+    def _path(self, r: int, c: int, dr: int, dc: int) -> Tuple[int, Tuple[int, ...]]:
+        """Target bit of (dr, dc) from (r, c) and the bits of the cells in between (none for a single step or a jump)."""
+        n = math.gcd(dr, dc)
+        between = tuple(self.index(r + dr * k // n, c + dc * k // n) for k in range(1, n))
+        return self.index(r + dr, c + dc), between
+
+    def _targets(self, idx: int, kind: str) -> Tuple[Tuple[int, int], ...]:
+        cells = [divmod(t, self.width) for t in self.steps[kind][idx]]
+        if kind != "first":
+            r, c = divmod(idx, self.width)
+            for dr, dc, _, _ in self.slides:
+                cells.extend((r + dr * k, c + dc * k) for k in range(1, self._ray_length(r, c, dr, dc) + 1))
+        return tuple(dict.fromkeys(cells))
+
+    def _mask(self, cells) -> int:
+        mask = 0
+        for r, c in cells:
+            mask |= 1 << (r * self.width + c)
+        return mask
+
+    def ray(self, idx: int, slide: Tuple[int, int, List[int], List[int]]) -> int:
+        """Bitmask of the cells from cell `idx` along `slide` (one of self.slides) up to the board edge."""
+        dr, dc, masks, line_of = slide
+        line = masks[line_of[idx]]
+        if dr * self.width + dc > 0:
+            return line >> (idx + 1) << (idx + 1)
+        return line & ((1 << idx) - 1)
+
+    def on_board(self, r: int, c: int) -> bool:
+        return 0 <= r < self.height and 0 <= c < self.width
+
+    def index(self, r: int, c: int) -> int:
+        return r * self.width + c
+
+    def targets(self, idx: int, kind: str = "all") -> Tuple[Tuple[int, int], ...]:
+        """Cells reachable from cell `idx` with a move of `kind`, ignoring blocking (steps first, then rays)."""
+        return self.targets_of[kind][idx] if self.dense else self._targets(idx, kind)
+
+    def mask(self, idx: int, kind: str = "all") -> int:
+        """Bitmask of targets(idx, kind)."""
+        if self.dense:
+            return self.masks[kind][idx]
+        mask = 0
+        for target in self.steps[kind][idx]:
+            mask |= 1 << target
+        if kind != "first":
+            for slide in self.slides:
+                mask |= self.ray(idx, slide)
+        return mask
+
+    def is_target(self, idx: int, target: Tuple[int, int], kind: str = "all") -> bool:
+        """Can a move of `kind` from cell `idx` end on `target` (ignoring blocking)?"""
+        tr, tc = target
+        return self.on_board(tr, tc) and bool(self.mask(idx, kind) >> self.index(tr, tc) & 1)
+
+    def legal_mask(self, idx: int, occupied: int, own: int, first_move: bool = False) -> int:
+        """
+        Targets from cell `idx` given the occupancy bitboards: sliders stop at
+        the first piece on each ray (capturing it if it is not `own`), capture
+        moves need an enemy on the target, non-capture moves an empty one,
+        first moves an empty target and an empty path to it.
+        """
+        if self.dense:
+            legal = (self.step_masks["capture"][idx] & occupied & ~own) | (self.step_masks["non_capture"][idx] & ~occupied)
+        else:
+            legal = 0
+            for target in self.steps["capture"][idx]:
+                if occupied >> target & 1 and not own >> target & 1:
+                    legal |= 1 << target
+            for target in self.steps["non_capture"][idx]:
+                if not occupied >> target & 1:
+                    legal |= 1 << target
+        if first_move:
+            for target, between in self.first_paths[idx]:
+                if not occupied >> target & 1 and not any(occupied >> cell & 1 for cell in between):
+                    legal |= 1 << target
+
+        for slide in self.slides:
+            attacks = self.ray(idx, slide)
+            blockers = attacks & occupied
+            if blockers:
+                # nearest blocker: lowest bit on rays running up, highest on rays running down
+                if slide[0] * self.width + slide[1] > 0:
+                    attacks &= (blockers & -blockers) * 2 - 1
+                else:
+                    attacks &= -(1 << (blockers.bit_length() - 1))
+            legal |= attacks & ~own
+        return legal
 
 
 class Moves:
+    # (resolved path, dims) -> (rules, MoveTable), shared by every Moves instance
+    _tables: Dict[Tuple[str, Tuple[int, int]], Tuple[List[Tuple[int, int, str]], MoveTable]] = {}
+    _lock = threading.Lock()
 
-    def __init__(self, txt_path: str, dims: Tuple[int, int]):
-        """Initialize moves with rules from text file and board dimensions."""
+    def __init__(self, txt_path: str, dims: Tuple[int, int], rules: Optional[List[Tuple[int, int, str]]] = None):
+        """Initialize moves with rules from text file and board dimensions (`rules` – already parsed, e.g. from an AssetBundle)."""
         self.board_height, self.board_width = dims
-        self.moves: List[Tuple[int, int]] = []
+        key = (str(pathlib.Path(txt_path).resolve()), (self.board_height, self.board_width))
+
+        with Moves._lock:
+            cached = Moves._tables.get(key)
+        if cached is None:
+            rules = self._parse(txt_path) if rules is None else list(rules)
+            cached = (rules, MoveTable(rules, (self.board_height, self.board_width)))
+            with Moves._lock:
+                cached = Moves._tables.setdefault(key, cached)
+
+        self.rules, self.table = cached
+        self.moves: List[Tuple[int, int]] = [(dx, dy) for dx, dy, _ in self.rules]
+        self._vectors = frozenset(self.moves)
+
+    @classmethod
+    def invalidate(cls, txt_path: str):
+        """Forget the cached tables of `txt_path` (the file changed on disk); existing Moves keep theirs."""
+        resolved = str(pathlib.Path(txt_path).resolve())
+        with cls._lock:
+            for key in [key for key in cls._tables if key[0] == resolved]:
+                del cls._tables[key]
 
+    @staticmethod
+    def _parse(txt_path: str) -> List[Tuple[int, int, str]]:
+        """Read `dx,dy[:tag]` lines; tag is "", "capture", "non_capture", "1st" or "slide" (repeat until blocked)."""
+        rules: List[Tuple[int, int, str]] = []
         with open(txt_path, 'r') as f:
             for line in f:
                 line = line.strip()
@@ -22,33 +254,53 @@ class Moves:
 
                 # ננקה חלקים לא מספריים לאחר הנקודהיים, אם יש
                 dx_str = parts[0].split(':')[0].strip()
-                dy_str = parts[1].split(':')[0].strip()
+                dy_str, _, tag = parts[1].partition(':')
 
                 try:
-                    dx, dy = int(dx_str), int(dy_str)
+                    dx, dy = int(dx_str), int(dy_str.strip())
                 except ValueError:
                     raise ValueError(f"Invalid integer in line: {line}")
 
-                self.moves.append((dx, dy))
-    
+                rules.append((dx, dy, tag.strip()))
+        return rules
+
+    def __deepcopy__(self, memo):
+        # the rules and tables are immutable and shared – State.clone must not copy them
+        return self
+
     def is_move_valid(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int]) -> bool:
         dx = end_pos[0] - start_pos[0]
         dy = end_pos[1] - start_pos[1]
-        
+
         # תנועה חוקית היא תנועה אחת מתוך רשימת הווקטורים
-        return (dx, dy) in self.moves
-
-
-    def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
-        """Get all possible moves from a given position."""
-        possible_positions = []
-        
-        for dx, dy in self.moves:
-            new_r = r + dx
-            new_c = c + dy
-            
-            # בדיקה שהמיקום החדש בתוך גבולות הלוח
-            if 0 <= new_r < self.board_height and 0 <= new_c < self.board_width:
-                possible_positions.append((new_r, new_c))
-        
-        return possible_positions
+        return (dx, dy) in self._vectors
+
+
+    def get_moves(self, r: int, c: int, kind: str = "all") -> Tuple[Tuple[int, int], ...]:
+        """Get all possible moves from a given position (ignoring blocking)."""
+        if not (0 <= r < self.board_height and 0 <= c < self.board_width):
+            return ()
+        return self.table.targets(self.table.index(r, c), kind)
+
+    def is_target(self, r: int, c: int, target: Tuple[int, int], kind: str = "all") -> bool:
+        """Can a piece at (r, c) reach `target` with a move of `kind`? (O(vectors), no list is built)"""
+        if not (0 <= r < self.board_height and 0 <= c < self.board_width):
+            return False
+        return self.table.is_target(self.table.index(r, c), tuple(target), kind)
+
+    def get_mask(self, r: int, c: int, kind: str = "all") -> int:
+        """Bitmask of the targets from (r, c); bit index = row * board_width + col."""
+        if not (0 <= r < self.board_height and 0 <= c < self.board_width):
+            return 0
+        return self.table.mask(self.table.index(r, c), kind)
+
+    def get_legal_mask(self, r: int, c: int, occupied: int, own: int, first_move: bool = False) -> int:
+        """Bitmask of the legal targets from (r, c) given occupancy bitboards (see MoveTable.legal_mask)."""
+        if not (0 <= r < self.board_height and 0 <= c < self.board_width):
+            return 0
+        return self.table.legal_mask(self.table.index(r, c), occupied, own, first_move)
+
+    def get_legal_moves(self, r: int, c: int, occupied: int, own: int, first_move: bool = False) -> List[Tuple[int, int]]:
+        """Legal target cells from (r, c) given occupancy bitboards."""
+        mask = self.get_legal_mask(r, c, occupied, own, first_move)
+        return [divmod(bit, self.board_width) for bit in iter_bits(mask)]
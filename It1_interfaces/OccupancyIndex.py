@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from GameTracker import piece_kind
+
+Cell = Tuple[int, int]
+
+
+class OccupancyIndex:
+    """
+    Cell → pieces index, kept up to date incrementally.
+
+    Pieces are listed per cell in arrival order, so the last one is the piece
+    that just moved in.  Cells holding more than one piece are tracked in
+    `crowded`, which makes collision checks proportional to the number of
+    contested cells instead of the number of piece pairs.
+
+    It also keeps int bitboards (bit = row * width + col) of occupied cells,
+    overall and per colour, for the slider move generation in Moves.
+    """
+
+    def __init__(self, width: int = 8):
+        self.width = width
+        self._cells: Dict[Cell, List[str]] = {}
+        self._where: Dict[str, Cell] = {}
+        self.crowded: Set[Cell] = set()
+        self.occupied = 0
+        self._colour_bits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def add(self, piece_id: str, cell: Optional[Cell]):
+        """Register a piece at `cell` (ignored if the piece has no cell yet)."""
+        if cell is None:
+            return
+        cell = tuple(cell)
+        self._where[piece_id] = cell
+        occupants = self._cells.setdefault(cell, [])
+        occupants.append(piece_id)
+        if len(occupants) > 1:
+            self.crowded.add(cell)
+        self._refresh_bits(cell, occupants)
+
+    def remove(self, piece_id: str):
+        """Forget a piece (captured / removed from the game)."""
+        cell = self._where.pop(piece_id, None)
+        if cell is None:
+            return
+        occupants = self._cells[cell]
+        occupants.remove(piece_id)
+        if not occupants:
+            del self._cells[cell]
+        if len(occupants) <= 1:
+            self.crowded.discard(cell)
+        self._refresh_bits(cell, occupants)
+
+    def load(self, placements: List[Tuple[str, Cell]]):
+        """Replace everything with (piece id, cell) pairs given in arrival order – one pass, bitboards built once."""
+        self._cells, self._where, self.crowded = {}, {}, set()
+        for piece_id, cell in placements:
+            self._where[piece_id] = cell
+            self._cells.setdefault(cell, []).append(piece_id)
+        self.occupied, self._colour_bits = 0, {}
+        for cell, occupants in self._cells.items():
+            if len(occupants) > 1:
+                self.crowded.add(cell)
+            bit = 1 << (cell[0] * self.width + cell[1])
+            self.occupied |= bit
+            for colour in {piece_kind(piece_id)[1] for piece_id in occupants}:
+                self._colour_bits[colour] = self._colour_bits.get(colour, 0) | bit
+
+    def move(self, piece_id: str, cell: Optional[Cell]):
+        """Move a piece to `cell`."""
+        self.remove(piece_id)
+        self.add(piece_id, cell)
+
+    def pieces_at(self, cell: Cell) -> List[str]:
+        """Ids of the pieces in `cell`, oldest arrival first (empty if none)."""
+        return list(self._cells.get(tuple(cell), ()))
+
+    def arrival_order(self) -> List[str]:
+        """All registered ids, cell by cell in row-major order, oldest arrival first within a cell."""
+        return [piece_id for _, occupants in sorted(self._cells.items()) for piece_id in occupants]
+
+    def cell_of(self, piece_id: str) -> Optional[Cell]:
+        """The cell a piece is registered at, or None."""
+        return self._where.get(piece_id)
+
+    def is_occupied(self, cell: Cell) -> bool:
+        return tuple(cell) in self._cells
+
+    def bitboard(self, colour: Optional[str] = None) -> int:
+        """Occupied cells as a bitmask – all of them, or only those holding `colour` pieces."""
+        if colour is None:
+            return self.occupied
+        return self._colour_bits.get(colour, 0)
+
+    def _refresh_bits(self, cell: Cell, occupants: List[str]):
+        bit = 1 << (cell[0] * self.width + cell[1])
+        if occupants:
+            self.occupied |= bit
+        else:
+            self.occupied &= ~bit
+        colours = {piece_kind(piece_id)[1] for piece_id in occupants}
+        for colour in colours | set(self._colour_bits):
+            bits = self._colour_bits.get(colour, 0)
+            self._colour_bits[colour] = bits | bit if colour in colours else bits & ~bit
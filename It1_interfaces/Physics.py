@@ -1,19 +1,53 @@
+import copy
+import math
+from fractions import Fraction
 from typing import Tuple, Optional
 from Command import Command
 from Board import Board
+from StateArrays import ArraySlot, CellSlot, CUR_R, CUR_C, FROM_R, FROM_C, TO_R, TO_C, START_MS, DURATION_MS, unbind_slots
 
 class Physics:
+    # שדות התנועה נשמרים בשורת ה־StateArrays של הכלי (משותפת לכל המצבים שלו)
+    start_cell = CellSlot(FROM_R, FROM_C)
+    current_cell = CellSlot(CUR_R, CUR_C)
+    target_cell = CellSlot(TO_R, TO_C)
+    start_time_ms = ArraySlot(START_MS)
+    move_duration_ms = ArraySlot(DURATION_MS)
+
     def __init__(self, start_cell: Tuple[int, int],
-    board: Board, speed_m_s: float = 1.0):
-        self.start_cell = start_cell
-        self.current_cell = start_cell
+    board: Board, speed_m_s: float = 1.0,
+    next_state: str = "idle", duration_ms: Optional[int] = None):
+        self.start_cell = tuple(start_cell)
+        self.current_cell = tuple(start_cell)
         self.board = board
         self.speed_m_s = speed_m_s
+        self.next_state = next_state            # next_state_when_finished מתוך config.json
+        self.duration_ms = duration_ms          # משך קבוע (מנוחה / קפיצה), אם יש
+        self.piece_id: Optional[str] = None
         self.target_cell: Optional[Tuple[int, int]] = None
         self.start_time_ms: Optional[int] = None
         self.move_duration_ms: Optional[int] = None
 
 
+    def clone(self) -> "Physics":
+        """Used by State.clone – copy the motion fields but share the board."""
+        cloned = copy.copy(self)
+        unbind_slots(cloned)            # the clone must not write into this piece's row
+        return cloned
+
+    # שדות התנועה המשתנים – כל השאר (לוח, מהירות, משך) קבוע מתוך config.json
+    _MOTION_FIELDS = ("start_cell", "current_cell", "target_cell", "start_time_ms", "move_duration_ms")
+
+    def snapshot(self) -> dict:
+        """The mutable motion fields as plain data (for command-log snapshots)."""
+        return {name: getattr(self, name) for name in self._MOTION_FIELDS}
+
+    def restore(self, data: dict):
+        """Inverse of snapshot()."""
+        for name in self._MOTION_FIELDS:
+            value = data[name]
+            setattr(self, name, tuple(value) if isinstance(value, list) else value)
+
     def reset(self, cmd: Command):
         """לא ממומש – יש לממש במחלקת משנה"""
         raise NotImplementedError()
@@ -22,6 +56,22 @@ class Physics:
         """לא ממומש – יש לממש במחלקת משנה"""
         raise NotImplementedError()
 
+    def deadline_ms(self) -> Optional[int]:
+        """זמן המשחק שבו הפעולה הנוכחית מסתיימת (None – אין פעולה מתוזמנת)"""
+        if self.start_time_ms is None or self.move_duration_ms is None:
+            return None
+        return self.start_time_ms + self.move_duration_ms
+
+    def _finished(self, now_ms: int) -> Command:
+        """פקודת סיום: מעבר למצב next_state בתא הנוכחי"""
+        self.start_time_ms = None
+        return Command(
+            timestamp=now_ms,
+            piece_id=self.piece_id,
+            type=self.next_state,
+            params=[self.current_cell],
+        )
+
     def get_pos(self) -> Tuple[int, int]:
         """מחזיר את מיקום הפיקסלים של התא הנוכחי"""
         return self.board.cell_to_px(self.current_cell)
@@ -49,28 +99,66 @@ class Physics:
     
 class IdlePhysics(Physics):
     def reset(self, cmd: Command):
-        self.current_cell =cmd.params[0] if cmd.params else self.start_cell
+        self.piece_id = cmd.piece_id
+        self.current_cell = tuple(cmd.params[0]) if cmd.params else self.start_cell
         self.target_cell = None
         self.start_time_ms = None
         self.move_duration_ms = None
 
     def update(self, now_ms: int) -> Optional[Command]:
         return None  # אין תנועה, אין שינוי
-    
+
+
+class RestPhysics(IdlePhysics):
+    """מנוחה (short_rest / long_rest): הכלי עומד במקום duration_ms ואז עובר ל־next_state"""
+    def reset(self, cmd: Command):
+        super().reset(cmd)
+        self.start_time_ms = cmd.timestamp
+        self.move_duration_ms = self.duration_ms or 0
+
+    def update(self, now_ms: int) -> Optional[Command]:
+        if self.start_time_ms is None:
+            return None
+        if now_ms - self.start_time_ms >= self.move_duration_ms:
+            return self._finished(now_ms)
+        return None
+
+    def get_cooldown_ratio(self, now_ms: int) -> float:
+        if self.start_time_ms is None or not self.move_duration_ms:
+            return 1.0
+        return min(max((now_ms - self.start_time_ms) / self.move_duration_ms, 0.0), 1.0)
+
+
 class MovePhysics(Physics):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._durations = {}                    # per (Δrow, Δcol) – board and speed are fixed; shared by the pieces' views
+
     def reset(self, cmd: Command):
-        self.start_cell = cmd.start_cell
-        self.target_cell = cmd.target_cell
-        self.start_time_ms = cmd.start_time
-        self.current_cell = cmd.start_cell
-        src_px = self.board.cell_to_px(self.start_cell)
-        dst_px = self.board.cell_to_px(self.target_cell)
-        dx = dst_px[0] - src_px[0]
-        dy = dst_px[1] - src_px[1]
-        dist_px = (dx**2 + dy**2) ** 0.5
-        meters = dist_px / self.board.pixels_per_meter
-        duration_s = meters / self.speed_m_s
-        self.move_duration_ms = int(duration_s * 1000)
+        self.piece_id = cmd.piece_id
+        self.start_cell = tuple(cmd.params[0])
+        self.target_cell = tuple(cmd.params[1])
+        self.start_time_ms = cmd.timestamp
+        self.current_cell = self.start_cell
+        self.move_duration_ms = self.duration_for(self.start_cell, self.target_cell)
+
+    def duration_for(self, start_cell: Tuple[int, int], target_cell: Tuple[int, int]) -> int:
+        """
+        משך התנועה (ms) בין שני תאים במהירות speed_m_s.
+        מחושב בחשבון שלמים / שברים מדויקים (בלי sqrt של float), כך שהתוצאה זהה בכל מכונה –
+        נדרש ל־lockstep / rollback.
+        """
+        step = (target_cell[0] - start_cell[0], target_cell[1] - start_cell[1])
+        durations = self._durations
+        duration = durations.get(step)
+        if duration is None:
+            b = self.board
+            dx, dy = step[1] * b.cell_W_pix, step[0] * b.cell_H_pix
+            px_per_m = (Fraction(b.cell_W_pix) / Fraction(b.cell_W_m) + Fraction(b.cell_H_pix) / Fraction(b.cell_H_m)) / 2
+            px_per_ms = px_per_m * Fraction(self.speed_m_s) / 1000
+            # floor(dist / v) == isqrt(floor(dist² / v²))
+            duration = durations[step] = math.isqrt(math.floor((dx * dx + dy * dy) / (px_per_ms * px_per_ms)))
+        return duration
 
     def update(self, now_ms: int) -> Optional[Command]:
         if self.start_time_ms is None or self.target_cell is None:
@@ -79,27 +167,27 @@ class MovePhysics(Physics):
         dt = now_ms - self.start_time_ms
         if dt >= self.move_duration_ms:
             self.current_cell = self.target_cell
-            return Command(
-                name="move_done",
-                start_time=now_ms,
-                start_cell=self.current_cell,
-                target_cell=self.current_cell,
-            )
+            return self._finished(now_ms)
         return None  # עדיין בתנועה
     def get_draw_position(self, now_ms: int) -> Tuple[int, int]:
         if self.start_time_ms is None or self.target_cell is None or self.move_duration_ms is None:
             return self.board.cell_to_px(self.current_cell)
 
-        dt = now_ms - self.start_time_ms
-        ratio = min(dt / self.move_duration_ms, 1.0)
+        return self.position_at(self.board.cell_to_px(self.start_cell), self.board.cell_to_px(self.target_cell),
+                                self.start_time_ms, self.move_duration_ms, now_ms)
 
-        src_px = self.board.cell_to_px(self.start_cell)
-        dst_px = self.board.cell_to_px(self.target_cell)
+    @staticmethod
+    def position_at(src_px: Tuple[int, int], dst_px: Tuple[int, int],
+                    start_time_ms: int, move_duration_ms: int, now_ms: int) -> Tuple[int, int]:
+        """מיקום הפיקסלים של תנועה src→dst בזמן now_ms (משמש גם לזיהוי התנגשויות באוויר)"""
+        dt = now_ms - start_time_ms
+        ratio = min(dt / move_duration_ms, 1.0)
 
         x = int(src_px[0] + (dst_px[0] - src_px[0]) * ratio)
         y = int(src_px[1] + (dst_px[1] - src_px[1]) * ratio)
 
         return (x, y)
+
     def get_cooldown_ratio(self, now_ms: int) -> float:
         if self.start_time_ms is None or self.move_duration_ms is None:
             return 1.0
@@ -110,13 +198,14 @@ class MovePhysics(Physics):
     
 class JumpPhysics(Physics):
     def reset(self, cmd: Command):
-        self.start_cell = cmd.start_cell
-        self.target_cell = cmd.target_cell
-        self.current_cell = cmd.start_cell
-        self.start_time_ms = cmd.start_time
+        self.piece_id = cmd.piece_id
+        self.start_cell = tuple(cmd.params[0])
+        self.target_cell = tuple(cmd.params[1]) if len(cmd.params) > 1 else self.start_cell
+        self.current_cell = self.start_cell
+        self.start_time_ms = cmd.timestamp
 
         # תנועה קצרה ומהירה – לדוגמה זמן קפיצה קבוע
-        self.move_duration_ms = 200  # קפיצה של 200 מילישניות
+        self.move_duration_ms = self.duration_ms or 200  # קפיצה של 200 מילישניות
 
     def update(self, now_ms: int) -> Optional[Command]:
         if self.start_time_ms is None or self.target_cell is None:
@@ -124,14 +213,13 @@ class JumpPhysics(Physics):
 
         if now_ms - self.start_time_ms >= self.move_duration_ms:
             self.current_cell = self.target_cell
-            return Command(
-                name="jump_done",
-                start_time=now_ms,
-                start_cell=self.current_cell,
-                target_cell=self.current_cell,
-            )
+            return self._finished(now_ms)
         return None
 
+    def can_be_captured(self) -> bool:
+        """כלי באוויר לא ניתן ללכידה"""
+        return False
+
 
 
 
@@ -1,5 +1,5 @@
 from Board import Board
-from Physics import Physics, IdlePhysics, MovePhysics, JumpPhysics
+from Physics import Physics, IdlePhysics, RestPhysics, MovePhysics, JumpPhysics
 from typing import Tuple, Dict
 
 
@@ -9,15 +9,27 @@ class PhysicsFactory:
         self.board = board
 
     def create(self, start_cell: Tuple[int, int], cfg: Dict) -> Physics:
+        """
+        cfg = {
+            "type": "idle" | "rest" | "move" | "jump",
+            "speed_m_per_sec": 1.5,              # or "speed"
+            "next_state_when_finished": "idle",
+            "duration_ms": 500                    # rest / jump length, optional
+        }
+        """
         physics_type = cfg.get("type", "idle").lower()
-        speed = cfg.get("speed", 1.0)
+        speed = cfg.get("speed_m_per_sec", cfg.get("speed", 1.0))
+        next_state = cfg.get("next_state_when_finished", "idle")
+        duration_ms = cfg.get("duration_ms")
 
         if physics_type == "idle":
-            return IdlePhysics(start_cell, self.board, speed)
+            return IdlePhysics(start_cell, self.board, speed, next_state, duration_ms)
+        elif physics_type == "rest":
+            return RestPhysics(start_cell, self.board, speed, next_state, duration_ms)
         elif physics_type == "move":
-            return MovePhysics(start_cell, self.board, speed)
+            return MovePhysics(start_cell, self.board, speed, next_state, duration_ms)
         elif physics_type == "jump":
-            return JumpPhysics(start_cell, self.board, speed)
+            return JumpPhysics(start_cell, self.board, speed, next_state, duration_ms)
         else:
             raise ValueError(f"Unsupported physics type: {physics_type}")
 
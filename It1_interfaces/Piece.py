@@ -1,52 +1,120 @@
 from Board import Board
 from Command import Command
 from State import State
-from typing import Tuple, Optional
+from StateArrays import ArraySlot, CellSlot, FlagSlot, STATE, HAS_MOVED, CELL_R, CELL_C
+from StateMachine import StateMachine, NO_STATE
+from img import Img
+from typing import Callable, Dict, List, Tuple, Optional
 import cv2
 
 
 class Piece:
-    def __init__(self, piece_id: str, init_state: State):
-        """Initialize a piece with ID and initial state."""
+    # dynamic fields – kept in the piece's record: its own row, or its StateArrays row once it joins a Game
+    _state_id = ArraySlot(STATE)
+    _current_cell = CellSlot(CELL_R, CELL_C)
+    has_moved = FlagSlot(HAS_MOVED)
+
+    def __init__(self, piece_id: str, init_state: State | StateMachine):
+        """
+        Initialize a piece with ID and its type's state machine (or the initial
+        State, compiled here).  The machine and its states are shared; the piece
+        owns only its record.
+        """
         self.piece_id = piece_id
-        self._state = init_state
+        self._machine = init_state if isinstance(init_state, StateMachine) else StateMachine(init_state)
+        self.__dict__["_soa_row"] = self._machine.new_record()
         self._current_cell = None
         self._last_update_time = None
+        self.has_moved = False          # ":1st" moves are only allowed before the first move
+        self._cell_listeners: List[Callable[["Piece", Optional[Tuple[int, int]], Tuple[int, int]], None]] = []
     def set_current_cell(self, cell: Tuple[int, int], now_ms: int):
         """Set the current cell of the piece and update its state."""
-        self._current_cell = cell
         self._state.reset(Command(
             timestamp=now_ms,
             piece_id=self.piece_id,
             type="reset",
-            params=[cell]
+            params=[tuple(cell)]
         ))
         self._last_update_time = now_ms 
+        self._sync_cell()
     def get_current_cell(self) -> Optional[Tuple[int, int]]:
         """Return the current cell of the piece."""
         return self._current_cell
+
+    def add_cell_listener(self, listener: Callable[["Piece", Optional[Tuple[int, int]], Tuple[int, int]], None]):
+        """Call listener(piece, old_cell, new_cell) whenever the physics moves this piece to another cell."""
+        self._cell_listeners.append(listener)
+
+    def _sync_cell(self):
+        """Pick up a cell change made by the physics and notify listeners (O(1))."""
+        physics = self._state.get_physics()
+        cell = tuple(physics.current_cell) if physics else self._current_cell
+        if cell != self._current_cell:
+            old_cell, self._current_cell = self._current_cell, cell
+            for listener in self._cell_listeners:
+                listener(self, old_cell, cell)
     
+    @property
+    def _state(self) -> State:
+        """The current State as this piece sees it: shared configuration, physics / graphics on its own record."""
+        state = self._machine.states[self._state_id]
+        row = self.__dict__["_soa_row"]
+        view = self.__dict__.get("_view")            # only the current state's view is kept
+        if view is None or not view.is_view_of(state, row):
+            view = self.__dict__["_view"] = state.bound(row)
+        return view
+
+    @_state.setter
+    def _state(self, state: State):
+        source = state.__dict__.get("_source")       # a view (State.bound) stands for its shared state
+        self._state_id = self._machine.id_of(source[0] if source else state)
+
+    def bind(self, soa, row: int):
+        """Move this piece's record into row `row` of a StateArrays; it is read / written there from now on."""
+        soa.data[row] = self.__dict__["_soa_row"]
+        self.__dict__["_soa_row"] = soa.data[row]
+        soa._bound.append((self, row))
+
     def clone(self) -> "Piece":
-        """Return a deep copy of this piece."""
-        cloned_piece = Piece(
-            piece_id=self.piece_id,
-            init_state=self._state.clone()
-        )
-        cloned_piece._current_cell = self._current_cell
+        """Return a copy of this piece: same (shared) state machine, a copy of its record."""
+        cloned_piece = Piece(self.piece_id, self._machine)
+        cloned_piece.__dict__["_soa_row"][:] = self.__dict__["_soa_row"]
         cloned_piece._last_update_time = self._last_update_time
         return cloned_piece
 
+    def _enter(self, state_id: int, cmd: Command):
+        """Switch to `state_id` and start it with `cmd`."""
+        self._state_id = state_id
+        self._state.reset(cmd)
+
+    def _advance(self, now_ms: int) -> Optional[Command]:
+        """Run the current state's physics; on completion enter its next_state_when_finished."""
+        state = self._state
+        state.get_graphics().update(now_ms)
+        done = state.get_physics().update(now_ms)
+        if done is None:
+            return None
+        done.piece_id = self.piece_id
+        next_id = self._machine.finished[self._state_id]
+        if next_id == NO_STATE:
+            return None
+        self._enter(next_id, done)
+        return done
+
     def on_command(self, cmd: Command, now_ms: int):
         """Handle a command for this piece."""
         if self.is_command_possible(cmd):
             # Update the command with this piece's ID
             cmd.piece_id = self.piece_id
-            
-            # Transition to new state
-            new_state = self._state.process_command(cmd, now_ms)
-            if new_state != self._state:
-                self._state = new_state
-                self._state.update(now_ms)
+
+            # Transition to new state (one table lookup)
+            next_id = self._machine.next_state(self._state_id, cmd.type)
+            if next_id != NO_STATE:
+                if cmd.type.lower() == "move":
+                    self.has_moved = True
+                self._enter(next_id, cmd)
+                self._advance(now_ms)
+                self._sync_cell()
 
     def is_command_possible(self, cmd: Command) -> bool:
         """Check if a command is possible for this piece in its current state."""
@@ -57,8 +125,7 @@ class Piece:
             # Check if the move is valid according to piece rules
             moves = self._state.get_moves()
             if moves:
-                valid_moves = moves.get_moves(from_cell[0], from_cell[1])
-                return to_cell in valid_moves
+                return moves.is_target(from_cell[0], from_cell[1], to_cell)
             
             # If no move rules, allow any adjacent move as default
             row_diff = abs(to_cell[0] - from_cell[0])
@@ -66,7 +133,7 @@ class Piece:
             return row_diff <= 1 and col_diff <= 1 and (row_diff + col_diff) > 0
         
         # Check if current state can handle this command type
-        return self._state.can_transition(cmd.type)
+        return self._machine.next_state(self._state_id, cmd.type) != NO_STATE
 
     def reset(self, start_ms: int):
         """Reset the piece to idle state."""
@@ -74,23 +141,96 @@ class Piece:
             timestamp=start_ms,
             piece_id=self.piece_id,
             type="reset",
-            params=[]
+            params=[self._current_cell] if self._current_cell is not None else []
         )
         self._state.reset(reset_cmd)
         self._last_update_time = start_ms
+        self._sync_cell()
 
-    def update(self, now_ms: int):
-        """Update the piece state based on current time."""
-        self._state = self._state.update(now_ms)
+    def update(self, now_ms: int) -> Optional[Command]:
+        """Update the piece state based on current time; return the completion command if the state changed."""
+        done = self._advance(now_ms)
         self._last_update_time = now_ms
+        self._sync_cell()
+        return done
+
+    def snapshot(self) -> dict:
+        """Full dynamic state as plain data: state name, cell, physics and animation."""
+        return {
+            "id": self.piece_id,
+            "state": self._state.name,
+            "cell": self._current_cell,
+            "has_moved": self.has_moved,
+            "physics": self._state.get_physics().snapshot(),
+            "graphics": self._state.get_graphics().snapshot(),
+        }
+
+    def restore(self, data: dict):
+        """Inverse of snapshot(), applied to a fresh piece of the same type (before it joins a Game)."""
+        state_id = self._machine.state_ids.get(data["state"])
+        if state_id is None:
+            raise ValueError(f"Unknown state {data['state']!r} for piece {data['id']}")
+        self.piece_id = data["id"]
+        self._state_id = state_id
+        self._state.get_physics().restore(data["physics"])
+        self._state.get_graphics().restore(data["graphics"])
+        self._current_cell = tuple(data["cell"]) if data["cell"] is not None else None
+        self.has_moved = data["has_moved"]
+
+    def get_state_name(self) -> str:
+        """Name of the current state ("idle", "move", …)."""
+        return self._state.get_name()
+
+    def get_state(self, name: str) -> Optional[State]:
+        """
+        The state called `name` ("move", "long_rest", …) in this piece's machine, or None.
+        States are shared by the piece type – use it for configuration (speeds, durations).
+        """
+        state_id = self._machine.state_ids.get(name)
+        return None if state_id is None else self._machine.states[state_id]
+
+    def get_moves(self):
+        """The movement rules of this piece (shared Moves table), or None."""
+        return self._state.get_moves()
+
+    def can_be_captured(self) -> bool:
+        """False while the piece is untouchable (e.g. in the air)."""
+        return self._state.get_physics().can_be_captured()
+
+    def next_deadline(self) -> Optional[int]:
+        """Game time at which this piece's state can next change on its own (None while idle)."""
+        return self._state.get_physics().deadline_ms()
+
+    def animate(self, now_ms: int):
+        """
+        Advance the current animation to `now_ms`.  The simulation only wakes a piece at its
+        deadlines, so whoever draws calls this once per frame before reading the getters below.
+        """
+        self._state.get_graphics().update(now_ms)
+
+    def get_render_key(self, now_ms: int, draw_pos: Optional[Tuple[int, int]] = None) -> Tuple:
+        """
+        Return (draw position, graphics id, frame index) – changes whenever the piece looks different.
+        `draw_pos` is the position already computed for this frame (BatchPhysics), if any.
+        The frame is the one reached by the last animate() – reading the key changes nothing.
+        """
+        graphics = self._state.get_graphics()
+        if draw_pos is None:
+            draw_pos = self._state.get_physics().get_draw_position(now_ms)
+        return (draw_pos, id(graphics), graphics.current_frame)
+
+    def get_sprite(self, now_ms: int) -> Img:
+        """The animation frame reached by the last animate() (shared and read-only)."""
+        return self._state.get_graphics().get_frame()
 
-    def draw_on_board(self, board: Board, now_ms: int):
+    def draw_on_board(self, board: Board, now_ms: int, draw_pos: Optional[Tuple[int, int]] = None):
         """Draw the piece on the board with cooldown overlay."""
         graphics = self._state.get_graphics()
         physics = self._state.get_physics()
         
         if graphics and physics:
-            draw_pos = physics.get_draw_position(now_ms)
+            if draw_pos is None:
+                draw_pos = physics.get_draw_position(now_ms)
            # cooldown_ratio = self._state.get_cooldown_ratio(now_ms)
 
             graphics.draw(board.img, draw_pos)
@@ -1,27 +1,43 @@
 import pathlib
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import json
+from AssetBundle import AssetBundle
 from Board import Board
 from GraphicsFactory import GraphicsFactory
+from SpriteCache import SpriteCache
 from Moves import Moves
 from PhysicsFactory import PhysicsFactory
 from Piece import Piece
 from State import State
-from Graphics import Graphics
+from Graphics import Graphics, board_channels, sprite_files
 from Physics import Physics
 
 class PieceFactory:
-    def __init__(self, board: Board, pieces_root: str | pathlib.Path):
+    def __init__(self, board: Board, pieces_root: str | pathlib.Path, workers: Optional[int] = None,
+                 bundle_path: Optional[str | pathlib.Path] = None):
         """Initialize piece factory with board and 
-        generates the library of piece templates from the pieces directory."""
+        generates the library of piece templates from the pieces directory.
+        `workers` – sprite decoding threads (1 = serial, None = executor default).
+        `bundle_path` – read everything from this AssetBundle (compiled / rebuilt on demand) instead of the tree;
+        the tree is used if the bundle cannot be rebuilt."""
         self.board = board
         self.pieces_root = pathlib.Path(pieces_root)  # ודא המרה ל־Path
+        self.workers = workers
+        self.bundle: Optional[AssetBundle] = None
+        if bundle_path is not None:
+            self.bundle = AssetBundle.load(self.pieces_root, bundle_path, (board.cell_W_pix, board.cell_H_pix),
+                                           board_channels(board) or 4, workers)
         self.piece_templates: Dict[str, Piece] = {}  # piece_id -> Piece
         self._load_piece_templates()
 
     
     def _load_piece_templates(self):
         """Load all piece templates from the pieces directory."""
+        # קודם מפענחים את כל ה־sprites במקביל, ורק אז בונים את מכונות המצבים (מתוך ה־cache)
+        if self.bundle is not None:
+            self.bundle.install(self.pieces_root)
+        else:
+            self._preload_sprites()
         for piece_dir in self.pieces_root.iterdir():
             if not piece_dir.is_dir():
                 continue
@@ -36,6 +52,19 @@ class PieceFactory:
             
 
 
+    def _sprite_paths(self) -> List[pathlib.Path]:
+        """Every sprite file under pieces/*/states/*/sprites."""
+        return [path
+                for sprites_dir in sorted(self.pieces_root.glob("*/states/*/sprites")) if sprites_dir.is_dir()
+                for path in sprite_files(sprites_dir)]
+
+    def _preload_sprites(self):
+        """Decode and resize all sprites into the SpriteCache on a thread pool."""
+        if not SpriteCache.enabled:
+            return
+        SpriteCache.preload(self._sprite_paths(), (self.board.cell_W_pix, self.board.cell_H_pix),
+                            channels=board_channels(self.board), workers=self.workers)
+
     def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
         """Build the state machine for a piece from its directory."""
         
@@ -62,8 +91,7 @@ class PieceFactory:
             config_path = state_folder / "config.json"
             if not config_path.exists():
                 raise FileNotFoundError(f"Config file not found for state {state_name} in piece {piece_dir.name}")
-            with open(config_path, "r") as f:
-                state_cfg = json.load(f)
+            state_cfg = self._read_config(config_path)
 
             # טען ספריית sprites
             sprites_dir = state_folder / "sprites"
@@ -71,9 +99,9 @@ class PieceFactory:
                 raise FileNotFoundError(f"Sprites directory not found for state {state_name} in piece {piece_dir.name}")
 
             graphics = self._load_graphics(sprites_dir, state_cfg)
-            physics = self._load_physics(state_cfg)
+            physics = self._load_physics(state_name, state_cfg, graphics)
 
-            state = State(graphics=graphics, physics=physics,moves = moves)
+            state = State(graphics=graphics, physics=physics,moves = moves, name=state_name)
             state.set_moves(moves)
 
             states[state_name] = state
@@ -92,20 +120,44 @@ class PieceFactory:
 
 
 
+    def _read_config(self, config_path: pathlib.Path) -> Dict:
+        """A state's config.json – pieces/<piece>/states/<state>/config.json – from the bundle if there is one."""
+        if self.bundle is not None:
+            cfg = self.bundle.config(config_path.parent.parent.parent.name, config_path.parent.name)
+            if cfg is not None:
+                return cfg
+        with open(config_path, "r") as f:
+            return json.load(f)
+
     def _load_moves(self, moves_path: pathlib.Path) -> Moves:
-        """Load moves from a text file."""
-        return Moves(moves_path, (self.board.H_cells, self.board.W_cells))  
+        """Load moves from a text file (rules already parsed when there is a bundle)."""
+        rules = self.bundle.rules(moves_path.parent.name) if self.bundle is not None else None
+        return Moves(moves_path, (self.board.H_cells, self.board.W_cells), rules)  
     def _load_graphics(self, sprites_dir: pathlib.Path, cfg: Dict) -> Graphics:
         """Load graphics from a directory and configuration."""
         graphicsFactory = GraphicsFactory(self.board)
         return graphicsFactory.load(sprites_dir=sprites_dir, cfg=cfg["graphics"])
-    def _load_physics(self, cfg: Dict) -> Physics:
-        """Load physics configuration."""
+    def _load_physics(self, state_name: str, cfg: Dict, graphics: Graphics) -> Physics:
+        """Load physics configuration; the physics kind comes from the state folder name."""
+        physics_cfg = dict(cfg["physics"])
+        if state_name in ("move", "jump"):
+            physics_cfg.setdefault("type", state_name)
+        elif state_name.endswith("rest"):
+            # מנוחה נמשכת כאורך האנימציה (שאינה בלולאה)
+            physics_cfg.setdefault("type", "rest")
+            physics_cfg.setdefault("duration_ms", graphics.frame_duration_ms * len(graphics.sprites))
         physicsFactory = PhysicsFactory(self.board)
-        return physicsFactory.create(start_cell=[0,0],cfg=cfg["physics"])
+        return physicsFactory.create(start_cell=(0, 0), cfg=physics_cfg)
 
 
 
+    def clone_piece(self, p_type: str) -> Piece:
+        """Create a piece by cloning the loaded template – no config / sprite loading."""
+        template = self.piece_templates.get(p_type)
+        if template is None:
+            raise ValueError(f"Piece type {p_type} not found in {self.pieces_root}")
+        return template.clone()
+
     # PieceFactory.py  – replace create_piece(...)
     def create_piece(self, p_type: str) -> Piece:
         """Create a piece of the specified type at the given cell."""
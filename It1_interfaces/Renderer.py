@@ -0,0 +1,110 @@
+from typing import Dict, List, Optional, Tuple
+
+from BatchPhysics import BatchPhysics
+from Board import Board
+from Piece import Piece
+from StateArrays import StateArrays
+
+Rect = Tuple[int, int, int, int]  # x, y, w, h in pixels
+
+
+class Renderer:
+    """
+    Incremental renderer that keeps one persistent frame buffer.
+
+    Each `render` call compares every piece's render key (draw position +
+    animation frame) with what was painted last time.  Only the rectangles
+    that changed – the old and new spot of a moving piece, an advanced
+    animation frame, a captured piece – are restored from the pristine
+    background, and only the sprites touching them are composited again.
+    Animations are advanced here, once per piece and frame, before the keys
+    are read.  Given the game's StateArrays, all draw positions of the frame
+    come from one BatchPhysics pass instead of a physics call per piece.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        self.frame = board.clone()                    # persistent frame buffer
+        self._drawn: Dict[str, Tuple[Rect, Tuple]] = {}  # piece_id -> (rect, render key)
+        self.dirty_rects = 0                          # stats of the last render()
+        self.redrawn_pieces = 0
+        self.physics = BatchPhysics(board)
+
+    def invalidate(self):
+        """Force a full repaint on the next render (e.g. after drawing overlays)."""
+        self.frame = self.board.clone()
+        self._drawn = {}
+
+    def render(self, pieces: Dict[str, Piece], now_ms: int, state: Optional[StateArrays] = None) -> Board:
+        """Bring the frame buffer up to date with `pieces` (bound to `state`, if given) and return it."""
+        current: Dict[str, Tuple[Rect, Tuple]] = {}
+        dirty: List[Rect] = []
+        positions = self.physics.compute(state, now_ms).positions(state) if state is not None else {}
+
+        for piece_id, piece in pieces.items():
+            piece.animate(now_ms)
+            key = piece.get_render_key(now_ms, positions.get(piece_id))
+            rect = self._rect_at(key[0])
+            current[piece_id] = (rect, key)
+            prev = self._drawn.get(piece_id)
+            if prev is None or prev[1] != key:
+                if prev is not None:
+                    dirty.append(prev[0])
+                dirty.append(rect)
+
+        # captured / removed pieces leave a hole to repaint
+        for piece_id, (rect, _) in self._drawn.items():
+            if piece_id not in current:
+                dirty.append(rect)
+
+        redraw = self._collect_redraw(current, dirty)
+
+        for rect in dirty:
+            self._restore(rect)
+        for piece_id, piece in pieces.items():
+            if piece_id in redraw:
+                piece.draw_on_board(self.frame, now_ms, current[piece_id][1][0])
+
+        self._drawn = current
+        self.dirty_rects = len(dirty)
+        self.redrawn_pieces = len(redraw)
+        return self.frame
+
+    # ─── helpers ────────────────────────────────────────────────────────────
+    def _rect_at(self, pos: Tuple[int, int]) -> Rect:
+        x, y = pos
+        return (int(x), int(y), self.board.cell_W_pix, self.board.cell_H_pix)
+
+    @staticmethod
+    def _overlaps(a: Rect, b: Rect) -> bool:
+        return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and \
+               a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+    def _collect_redraw(self, current: Dict[str, Tuple[Rect, Tuple]], dirty: List[Rect]) -> set:
+        """
+        Return ids of pieces touching a dirty rect.  A redrawn sprite paints
+        its whole rect, so that rect becomes dirty too; repeat until stable so
+        overlapping neighbours are restored and recomposited in z-order.
+        """
+        redraw = set()
+        grown = True
+        while grown:
+            grown = False
+            for piece_id, (rect, _) in current.items():
+                if piece_id in redraw:
+                    continue
+                if any(self._overlaps(rect, d) for d in dirty):
+                    redraw.add(piece_id)
+                    if rect not in dirty:
+                        dirty.append(rect)
+                    grown = True
+        return redraw
+
+    def _restore(self, rect: Rect):
+        """Copy `rect` from the pristine background into the frame buffer."""
+        x, y, w, h = rect
+        H, W = self.frame.img.img.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, W), min(y + h, H)
+        if x0 < x1 and y0 < y1:
+            self.frame.img.img[y0:y1, x0:x1] = self.board.img.img[y0:y1, x0:x1]
@@ -0,0 +1,140 @@
+from typing import Callable, Dict, List, Optional
+
+from Command import Command
+from Game import Game
+from StateArrays import StateSnapshot
+
+# predictor(game, tick_ms) -> the remote commands to assume for that tick
+Predictor = Callable[[Game, int], List[Command]]
+
+
+def no_input(game: Game, tick_ms: int) -> List[Command]:
+    """Default prediction: the remote side issues nothing new (commands are discrete events)."""
+    return []
+
+
+class RollbackSession:
+    """
+    Lockstep-with-rollback driver for a peer-to-peer Game.
+
+    The local simulation never waits for the peer: ticks run on a fixed
+    integer-ms grid with local commands plus *predicted* remote ones.  The
+    state before every tick is kept in a ring buffer (one `save_state` array
+    copy each).  When a remote command turns up late – stamped for a tick
+    already simulated – or a prediction turns out wrong, the session restores
+    the snapshot before that tick and re-simulates up to the present.
+
+    A command stamped `t` is applied in the first tick after `t` (as live
+    input is).  `confirm(t)` tells the session the peer has sent everything
+    up to `t`; the session refuses to run more than `max_rollback_ticks`
+    past the last confirmed tick, which bounds both memory and the work of
+    one rollback (see Benchmarks/RollbackBenchmarks for the 16 ms budget).
+
+    Determinism needs integer-ms timestamps and a game without a command
+    log (re-simulated ticks would be logged twice).
+    """
+
+    def __init__(self, game: Game, tick_ms: int = 10, max_rollback_ticks: int = 32,
+                 predictor: Predictor = no_input):
+        if game.now_ms is None:
+            game.start(0)
+        self.game = game
+        self.tick_ms = tick_ms
+        self.max_rollback_ticks = max_rollback_ticks
+        self.predictor = predictor
+        self.confirmed_ms = game.now_ms              # remote input is final up to here
+
+        self._ring: List[Optional[StateSnapshot]] = [None] * (max_rollback_ticks + 1)   # state before tick
+        self._local: Dict[int, List[Command]] = {}
+        self._remote: Dict[int, List[Command]] = {}
+        self._predicted: Dict[int, List[Command]] = {}
+
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+        self.max_depth = 0                           # deepest rollback so far (ticks)
+
+    # ─── inputs ─────────────────────────────────────────────────────────────
+    def tick_of(self, timestamp: int) -> int:
+        """The tick that applies a command stamped `timestamp`."""
+        if not isinstance(timestamp, int):
+            raise ValueError(f"Command timestamps must be integer ms, got {timestamp!r}")
+        return (timestamp // self.tick_ms + 1) * self.tick_ms
+
+    def add_local(self, cmd: Command):
+        """A command from this peer, applied in the next tick."""
+        tick = self.tick_of(cmd.timestamp)
+        if tick <= self.game.now_ms:
+            raise ValueError(f"Local command at {cmd.timestamp} ms is older than the simulation ({self.game.now_ms} ms)")
+        self._local.setdefault(tick, []).append(cmd)
+
+    def add_remote(self, cmd: Command):
+        """A command from the peer; rolls back if its tick was already simulated on a different guess."""
+        tick = self.tick_of(cmd.timestamp)
+        if tick <= self.confirmed_ms:
+            raise ValueError(f"Remote command at {cmd.timestamp} ms is before the confirmed time {self.confirmed_ms} ms")
+        self._remote.setdefault(tick, []).append(cmd)
+        if tick <= self.game.now_ms:
+            if self._predicted.get(tick) == self._remote[tick]:
+                del self._predicted[tick]                # the guess was right – the state already has it
+            else:
+                self._rollback(tick)
+
+    def confirm(self, until_ms: int):
+        """The peer has sent all its commands stamped before `until_ms`; wrong predictions roll back."""
+        until = until_ms // self.tick_ms * self.tick_ms      # last tick all of whose commands are known
+        if until <= self.confirmed_ms:
+            return
+        wrong = [t for t, cmds in self._predicted.items() if t <= until and cmds != self._remote.get(t, [])]
+        self.confirmed_ms = until
+        if wrong:
+            self._rollback(min(wrong))
+        for t in [t for t in self._predicted if t <= until]:
+            del self._predicted[t]
+
+    # ─── simulation ─────────────────────────────────────────────────────────
+    def can_advance(self) -> bool:
+        """False while the peer lags so far behind that a rollback could exceed the ring buffer."""
+        return self.game.now_ms + self.tick_ms - self.confirmed_ms <= self.max_rollback_ticks * self.tick_ms
+
+    def advance(self) -> bool:
+        """Simulate the next tick; False (nothing done) if the session must wait for the peer."""
+        if not self.can_advance():
+            return False
+        self._step(self.game.now_ms + self.tick_ms)
+        self._forget(self.game.now_ms - self.max_rollback_ticks * self.tick_ms)
+        return True
+
+    def _step(self, tick: int):
+        self._ring[(tick // self.tick_ms) % len(self._ring)] = self.game.save_state()
+        commands = self._local.get(tick, []) + self._remote.get(tick, [])
+        predicted = None
+        if tick > self.confirmed_ms and tick not in self._remote:      # known remote input replaces the guess
+            predicted = self.predictor(self.game, tick - self.tick_ms)
+        if predicted:
+            self._predicted[tick] = predicted
+            commands += predicted
+        else:
+            self._predicted.pop(tick, None)
+        for cmd in commands:
+            self.game.user_input_queue.put(cmd)
+        self.game._tick(tick)
+
+    def _rollback(self, tick: int):
+        """Restore the state before `tick` and re-simulate up to the current time."""
+        now = self.game.now_ms
+        depth = (now - tick) // self.tick_ms + 1
+        snap = self._ring[(tick // self.tick_ms) % len(self._ring)]
+        if depth > len(self._ring) or snap is None or snap.now_ms != tick - self.tick_ms:
+            raise ValueError(f"Cannot roll back to {tick} ms: only {self.max_rollback_ticks} ticks are kept")
+        self.game.load_state(snap)
+        for t in range(tick, now + 1, self.tick_ms):
+            self._step(t)
+        self.rollbacks += 1
+        self.resimulated_ticks += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def _forget(self, before_ms: int):
+        """Drop inputs of ticks that can no longer be rolled back to."""
+        for table in (self._local, self._remote):
+            for t in [t for t in table if t < before_ms]:
+                del table[t]
@@ -0,0 +1,116 @@
+import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import cv2
+
+from img import Img
+
+
+class SpriteCache:
+    """
+    Process-wide store of decoded sprites, shared by every Graphics instance.
+
+    Keyed by (resolved file path, target (W, H), interpolation flag, channel
+    layout): each PNG is decoded, resized and converted to the board's layout
+    once, and the same read-only Img is handed to all pieces/states that use it.
+    """
+    _sprites: Dict[Tuple[str, Tuple[int, int], int, Optional[int]], Img] = {}
+    _lock = threading.Lock()
+    enabled: bool = True        # False → decode on every request (for benchmarks)
+    hits: int = 0
+    misses: int = 0
+
+    @classmethod
+    def get(cls, path: str | pathlib.Path,
+            size: Tuple[int, int],
+            interpolation: int = cv2.INTER_AREA,
+            channels: Optional[int] = None) -> Img:
+        """
+        Return the sprite at `path` resized to `size` and, if given, converted
+        to `channels` channels.  The returned Img is frozen (read-only pixels,
+        blend mask precomputed).
+        """
+        key = (str(pathlib.Path(path).resolve()), tuple(size), interpolation, channels)
+        with cls._lock:
+            sprite = cls._sprites.get(key) if cls.enabled else None
+            if sprite is not None:
+                cls.hits += 1
+                return sprite
+            cls.misses += 1
+
+        sprite = Img().read(key[0], size=key[1], keep_aspect=False, interpolation=interpolation)
+        if channels is not None:
+            sprite = sprite.to_channels(channels)
+        sprite.freeze()
+        if not cls.enabled:
+            return sprite
+
+        with cls._lock:
+            # another thread may have decoded the same file meanwhile – keep the first
+            return cls._sprites.setdefault(key, sprite)
+
+    @classmethod
+    def put(cls, path: str | pathlib.Path,
+            size: Tuple[int, int],
+            sprite: Img,
+            interpolation: int = cv2.INTER_AREA,
+            channels: Optional[int] = None) -> Img:
+        """
+        Store an already decoded sprite (e.g. a view into an AssetBundle) under
+        the key `get` would use.  Its blend mask is built on first draw, not here.
+        """
+        key = (str(pathlib.Path(path).resolve()), tuple(size), interpolation, channels)
+        sprite.freeze(precompute=False)
+        with cls._lock:
+            cls._sprites[key] = sprite
+        return sprite
+
+    @classmethod
+    def preload(cls, paths: Iterable[str | pathlib.Path],
+                size: Tuple[int, int],
+                interpolation: int = cv2.INTER_AREA,
+                channels: Optional[int] = None,
+                workers: Optional[int] = None) -> int:
+        """
+        Decode `paths` into the cache on a thread pool (cv2.imread / resize
+        release the GIL) and return how many loaded.  Unreadable files are
+        skipped here – the Graphics that asks for them later reports them.
+        workers=1 decodes in the calling thread; None uses the executor default.
+        """
+        def load(path) -> bool:
+            try:
+                cls.get(path, size, interpolation, channels)
+                return True
+            except Exception:
+                return False
+
+        paths = list(paths)
+        if workers == 1 or len(paths) < 2:
+            return sum(map(load, paths))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprite-decode") as pool:
+            return sum(pool.map(load, paths))
+
+    @classmethod
+    def invalidate(cls, path: str | pathlib.Path) -> int:
+        """Forget every cached variant of `path` (the file changed on disk); return how many were dropped."""
+        resolved = str(pathlib.Path(path).resolve())
+        with cls._lock:
+            stale = [key for key in cls._sprites if key[0] == resolved]
+            for key in stale:
+                del cls._sprites[key]
+        return len(stale)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Return hit / miss counters and the number of cached sprites."""
+        return {"hits": cls.hits, "misses": cls.misses, "sprites": len(cls._sprites)}
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached sprite and reset the counters."""
+        with cls._lock:
+            cls._sprites.clear()
+            cls.hits = 0
+            cls.misses = 0
@@ -3,12 +3,14 @@ from Command import Command
 from Moves import Moves
 from Graphics import Graphics
 from Physics import Physics
+from StateArrays import bound_view
 from typing import Dict, Optional
 
 
 class State:
-    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics):
+    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics, name: Optional[str] = None):
         """Initialize state with moves, graphics, and physics components."""
+        self.name = name                    # state folder name ("idle", "move", …), set by PieceFactory
         self._moves = moves
         self._graphics = graphics
         self._physics = physics
@@ -19,16 +21,36 @@ class State:
         cloned_state = State(
             moves=copy.deepcopy(self._moves),
             graphics=self._graphics.clone() if hasattr(self._graphics, "clone") else copy.deepcopy(self._graphics),
-            physics=self._physics.clone() if hasattr(self._physics, "clone") else copy.deepcopy(self._physics)
+            physics=self._physics.clone() if hasattr(self._physics, "clone") else copy.deepcopy(self._physics),
+            name=self.name
         )
         # שיבוץ פקודה אחרונה אם יש
         cloned_state._current_command = copy.deepcopy(self._current_command)
         # העתקת המעברים יכולה להיעשות חיצונית אם רוצים למנוע רקורסיה
         cloned_state.transitions = {}  # ניתן להשלים חיצונית לאחר מכן
         return cloned_state
+    def bound(self, row) -> "State":
+        """
+        This state as seen by the piece whose record is `row`: a shallow copy
+        sharing moves, transitions and configuration, with physics / graphics
+        that read and write that row.  The shared State is not modified, so
+        pieces of one type (and other threads) never see each other's data.
+        """
+        view = copy.copy(self)
+        view._physics = bound_view(self._physics, row)
+        view._graphics = bound_view(self._graphics, row) if self._graphics is not None else None
+        view._source = (self, self._physics, self._graphics, self._moves, row)
+        return view
+
+    def is_view_of(self, state: "State", row) -> bool:
+        """True if this is state.bound(row) and `state` has not swapped a component since (reload / set_moves)."""
+        source = self.__dict__.get("_source")
+        return (source is not None and source[0] is state and source[1] is state._physics
+                and source[2] is state._graphics and source[3] is state._moves and source[4] is row)
+
     def set_transition(self, event: str, target: "State"):
-        """Set a transition from this state to another state on an event."""
-        self.transitions[event] = target
+        """Set a transition from this state to another state on an event (case-insensitive: "Move" == "move")."""
+        self.transitions[event.lower()] = target
 
     def reset(self, cmd: Command):
         """Reset the state with a new command."""
@@ -46,7 +68,7 @@ class State:
 
     def process_command(self, cmd: Command, now_ms: int) -> "State":
         """Get the next state after processing a command."""
-        next_state = self.transitions.get(cmd.type)
+        next_state = self.transitions.get(cmd.type.lower())
         if next_state:
             next_state.reset(cmd)
             return next_state
@@ -54,7 +76,7 @@ class State:
 
     def can_transition(self, event: str) -> bool:
         """Check if a transition for the given event exists."""
-        return event in self.transitions
+        return event.lower() in self.transitions
 
     def get_command(self) -> Optional[Command]:
         """Return the last command that activated this state."""
@@ -72,9 +94,19 @@ class State:
         """Set the moves for this state."""
         self._moves = moves
 
+    def reload(self, graphics: Optional[Graphics] = None, physics: Optional[Physics] = None,
+               moves: Optional[Moves] = None):
+        """Swap in freshly loaded components (asset hot-reload); the pieces' records are untouched."""
+        if graphics is not None:
+            self._graphics = graphics
+        if physics is not None:
+            self._physics = physics
+        if moves is not None:
+            self._moves = moves
+
     def get_name(self) -> str:
         """Return the name of the state. Override in subclasses if needed."""
-        return self.__class__.__name__
+        return self.name or self.__class__.__name__
 
     def get_cooldown_ratio(self, now_ms: int) -> float:
         """Return cooldown ratio from 0 to 1 for overlay visualization."""
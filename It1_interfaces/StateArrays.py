@@ -0,0 +1,180 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+NONE = np.iinfo(np.int64).min          # encodes None in an int column
+
+# one row per piece; every Physics / Graphics of the piece shares it (only the current state's are live)
+(ALIVE, STATE, HAS_MOVED, CELL_R, CELL_C, ARRIVAL, SEQ,                       # Piece / Game bookkeeping
+ CUR_R, CUR_C, FROM_R, FROM_C, TO_R, TO_C, START_MS, DURATION_MS,            # Physics
+ ANIM_FRAME, ANIM_START_MS, ANIM_LAST_MS, ANIM_PLAYING) = range(19)           # Graphics
+N_COLUMNS = 19
+
+
+class ArraySlot:
+    """
+    Attribute that lives in a StateArrays row once its owner is bound
+    (`bind_slots`), and in the instance dict before that.  Holds an int or None.
+    """
+    def __init__(self, column: int):
+        self.column = column
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        row = obj.__dict__.get("_soa_row")          # 1-D view of the owner's row
+        if row is None:
+            return obj.__dict__.get(self.name)
+        return self.decode(row)
+
+    def __set__(self, obj, value):
+        row = obj.__dict__.get("_soa_row")
+        if row is None:
+            obj.__dict__[self.name] = value
+        else:
+            self.encode(row, value)
+
+    def decode(self, row):
+        value = row.item(self.column)
+        return None if value == NONE else value
+
+    def encode(self, row, value):
+        row[self.column] = NONE if value is None else value
+
+
+class FlagSlot(ArraySlot):
+    """Bool stored as 0 / 1."""
+    def decode(self, row):
+        return bool(row.item(self.column))
+
+    def encode(self, row, value):
+        row[self.column] = 1 if value else 0
+
+
+class CellSlot(ArraySlot):
+    """(row, col) tuple or None, stored in two columns."""
+    def __init__(self, row_column: int, col_column: int):
+        super().__init__(row_column)
+        self.col_column = col_column
+
+    def decode(self, row):
+        r = row.item(self.column)
+        return None if r == NONE else (r, row.item(self.col_column))
+
+    def encode(self, row, value):
+        if value is None:
+            row[self.column] = row[self.col_column] = NONE
+        else:
+            row[self.column], row[self.col_column] = value
+
+
+_slots_by_class: Dict[type, List[ArraySlot]] = {}
+
+
+def _slots(obj) -> List[ArraySlot]:
+    cls = type(obj)
+    slots = _slots_by_class.get(cls)
+    if slots is None:
+        slots = _slots_by_class[cls] = [slot for klass in cls.__mro__ for slot in vars(klass).values()
+                                        if isinstance(slot, ArraySlot)]
+    return slots
+
+
+def bind_slots(obj, soa: "StateArrays", row: int):
+    """Move obj's slot values into `row` of `soa`; from now on they are read / written there."""
+    values = [(slot, slot.__get__(obj)) for slot in _slots(obj)]
+    obj.__dict__["_soa_row"] = soa.data[row]
+    soa._bound.append((obj, row))
+    for slot, value in values:
+        slot.__set__(obj, value)
+
+
+def bound_view(obj, row):
+    """
+    Shallow copy of `obj` (a Physics / Graphics shared by a piece type) whose
+    slots are read / written in `row`; `obj` itself is left untouched.
+    """
+    view = object.__new__(type(obj))
+    view.__dict__.update(obj.__dict__)
+    view.__dict__["_soa_row"] = row
+    return view
+
+
+def unbind_slots(obj):
+    """Copy the slot values back into obj (e.g. on a clone that must not share the row)."""
+    if obj.__dict__.get("_soa_row") is None:
+        return
+    values = [(slot, slot.__get__(obj)) for slot in _slots(obj)]
+    obj.__dict__["_soa_row"] = None
+    for slot, value in values:
+        slot.__set__(obj, value)
+
+
+class StateSnapshot(NamedTuple):
+    data: np.ndarray
+    now_ms: Optional[int]
+    captures: int                   # length of Game.capture_log at the time
+    arrivals: int
+
+
+class StateArrays:
+    """
+    Struct-of-arrays store of all dynamic game state: one int64 row per
+    piece (cell, state id, move start / target / duration, animation
+    position, …) in a single contiguous array.  Pieces, their Physics and
+    Graphics read and write it through slot descriptors, so a snapshot is
+    one array copy and a restore one `np.copyto`.
+    """
+
+    def __init__(self, capacity: int = 32):
+        self.data = np.full((capacity, N_COLUMNS), NONE, dtype=np.int64)
+        self.pieces: List = []              # row -> Piece (captured pieces keep their row)
+        self.rows: Dict[str, int] = {}      # piece id -> row
+        self.arrivals = 0                   # counter for the ARRIVAL column
+        self._bound: List[Tuple[object, int]] = []     # (object, row) holding a row view
+
+    def __len__(self) -> int:
+        return len(self.pieces)
+
+    def add(self, piece) -> int:
+        """Give `piece` a row and bind it (and all its states) to it."""
+        row = len(self.pieces)
+        if row == len(self.data):
+            grown = np.full((2 * row, N_COLUMNS), NONE, dtype=np.int64)
+            grown[:row] = self.data
+            self.data = grown
+            for obj, bound_row in self._bound:         # re-point the row views at the new buffer
+                if obj.__dict__.get("_soa_row") is not None:
+                    obj.__dict__["_soa_row"] = grown[bound_row]
+        self.pieces.append(piece)
+        self.rows[piece.piece_id] = row
+        piece.bind(self, row)
+        self.data[row, ALIVE] = 1
+        return row
+
+    def kill(self, row: int):
+        self.data[row, ALIVE] = 0
+
+    def is_alive(self, row: int) -> bool:
+        return bool(self.data[row, ALIVE] == 1)
+
+    def mark_arrival(self, row: int):
+        """Stamp the row with the next arrival number (order of entering a cell)."""
+        self.arrivals += 1
+        self.data[row, ARRIVAL] = self.arrivals
+
+    def snapshot(self, now_ms: Optional[int] = None, captures: int = 0) -> StateSnapshot:
+        return StateSnapshot(self.data[:len(self.pieces)].copy(), now_ms, captures, self.arrivals)
+
+    def restore(self, snap: StateSnapshot):
+        """Bring every row back to `snap`; pieces added after it are marked dead."""
+        n = len(snap.data)
+        np.copyto(self.data[:n], snap.data)
+        self.data[n:len(self.pieces), ALIVE] = 0
+        self.arrivals = snap.arrivals
+
+    def alive_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.data[:len(self.pieces), ALIVE] == 1)
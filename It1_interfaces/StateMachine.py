@@ -0,0 +1,82 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from State import State
+from StateArrays import N_COLUMNS, NONE, STATE, HAS_MOVED, ANIM_FRAME, ANIM_LAST_MS, ANIM_PLAYING
+
+NO_STATE = -1
+
+
+class StateMachine:
+    """
+    A piece type's state machine compiled into an immutable transition table.
+
+    States get integer ids (sorted by name) and events integer codes; the
+    transition for (state, event) is one lookup in a flat tuple, and
+    `finished[state]` is the state entered when the physics completes
+    (next_state_when_finished from config.json).  The State objects – with
+    their Physics / Graphics configuration and sprites – are shared by every
+    piece of the type; a piece only owns a state-array record (see
+    Piece / StateArrays), read and written through a per-piece view of the
+    current State (State.bound) – the shared objects are never re-pointed.
+    """
+
+    def __init__(self, initial: State):
+        states = {}
+        pending = [initial]
+        while pending:
+            state = pending.pop()
+            if id(state) not in states:
+                states[id(state)] = state
+                pending.extend(state.transitions.values())
+        self.states: Tuple[State, ...] = tuple(sorted(states.values(), key=lambda s: s.name or ""))
+        self.names: Tuple[str, ...] = tuple(state.get_name() for state in self.states)
+        self.state_ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self._ids_by_object: Dict[int, int] = {id(state): i for i, state in enumerate(self.states)}
+
+        events = sorted({event for state in self.states for event in state.transitions})
+        self.event_codes: Dict[str, int] = {event: code for code, event in enumerate(events)}
+        n_events = len(events)
+        table = [NO_STATE] * (len(self.states) * n_events)
+        for i, state in enumerate(self.states):
+            for event, target in state.transitions.items():
+                table[i * n_events + self.event_codes[event]] = self._ids_by_object[id(target)]
+        self.table: Tuple[int, ...] = tuple(table)
+        self._n_events = n_events
+
+        self.finished: Tuple[int, ...] = ()
+        self.version = 0                # bumped by reloaded(); caches of per-state data compare against it
+        self.refresh_finished()
+        self.initial = self._ids_by_object[id(initial)]
+
+    def refresh_finished(self):
+        """Recompute `finished` from the states' physics (after a config reload changed next_state_when_finished)."""
+        self.finished = tuple(
+            self.next_state(i, getattr(state.get_physics(), "next_state", None) or "") for i, state in enumerate(self.states))
+
+    def reloaded(self):
+        """Call after states swapped components (asset hot-reload): refresh `finished` and bump `version`."""
+        self.version += 1
+        self.refresh_finished()
+
+    def event_code(self, event: str) -> Optional[int]:
+        return self.event_codes.get(event.lower())
+
+    def next_state(self, state_id: int, event: str) -> int:
+        """The state `event` leads to from `state_id`, or NO_STATE."""
+        code = self.event_codes.get(event.lower())
+        return NO_STATE if code is None else self.table[state_id * self._n_events + code]
+
+    def id_of(self, state: State) -> int:
+        index = self._ids_by_object.get(id(state))
+        if index is None:
+            raise ValueError(f"State {state.get_name()!r} is not part of this state machine")
+        return index
+
+    def new_record(self) -> np.ndarray:
+        """A fresh per-piece record (one state-array row) in the initial state."""
+        record = np.full(N_COLUMNS, NONE, dtype=np.int64)
+        record[STATE] = self.initial
+        record[[HAS_MOVED, ANIM_FRAME, ANIM_LAST_MS, ANIM_PLAYING]] = 0
+        return record
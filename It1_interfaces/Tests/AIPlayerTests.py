@@ -0,0 +1,101 @@
+import pathlib
+import time
+from AIPlayer import AIPlayer, SearchState
+from Command import Command
+from HeadlessRunner import headless_game, load_pieces
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def create_game(factory, pieces=None):
+    if pieces is None:
+        pieces = load_pieces(factory, ROOT / "pieces" / "board.csv")
+    game = headless_game(pieces, factory.board)
+    game.start(0)
+    return game
+
+
+def test_takes_a_hanging_queen(factory, place):
+    # Arrange
+    game = create_game(factory, place({(7, 0): "RW", (3, 0): "QB", (0, 7): "KB", (7, 7): "KW"}))
+
+    # Act
+    cmd = AIPlayer("W", max_nodes=5000, budget_ms=1000).decide(game, 0)
+
+    # Assert
+    assert cmd == Command(0, "RW_7_0", "Move", [(7, 0), (3, 0)])
+
+
+def test_busy_pieces_are_not_moved(factory, place):
+    # Arrange
+    game = create_game(factory, place({(7, 0): "RW", (3, 0): "QB", (0, 7): "KB", (7, 7): "KW"}))
+    game.user_input_queue.put(Command(0, "RW_7_0", "Move", [(7, 0), (6, 0)]))
+    game._tick(10)
+
+    # Act
+    cmd = AIPlayer("W", max_nodes=5000, budget_ms=1000).decide(game, 10)
+
+    # Assert – the rook is still travelling, only the king can move
+    assert cmd.piece_id == "KW_7_7"
+
+
+def test_node_budget_makes_search_deterministic(factory):
+    # Arrange
+    game = create_game(factory)
+
+    # Act
+    first = AIPlayer("B", max_nodes=3000, budget_ms=10_000).decide(game, 0)
+    second = AIPlayer("B", max_nodes=3000, budget_ms=10_000).decide(game, 0)
+
+    # Assert
+    assert first == second
+
+
+def test_time_budget_is_respected(factory):
+    # Arrange
+    game = create_game(factory)
+    player = AIPlayer("W", budget_ms=20)
+
+    # Act
+    cmd = player.decide(game, 0)
+
+    # Assert
+    assert cmd is not None
+    assert player.last_result.depth >= 1
+    assert player.last_result.elapsed_ms <= player.budget_ms
+
+
+def test_make_unmake_restores_the_position(factory, place):
+    # Arrange
+    game = create_game(factory, place({(7, 0): "RW", (3, 0): "QB", (0, 7): "KB", (7, 7): "KW"}))
+    state = SearchState.from_game(game, 0, {})
+    before = (list(state.cells), list(state.busy), dict(state.at), state.occupied, dict(state.bits),
+              dict(state.material), state.now)
+
+    # Act
+    for _, i, target in state.gen_moves("W"):
+        state.make(i, target, 500)
+        state.unmake()
+
+    # Assert
+    assert (list(state.cells), list(state.busy), dict(state.at), state.occupied, dict(state.bits),
+            dict(state.material), state.now) == before
+
+
+def test_background_player_feeds_the_input_queue(factory):
+    # Arrange
+    game = create_game(factory)
+    player = AIPlayer("W", budget_ms=5)
+    player.attach(game)
+
+    # Act
+    game._tick(10)
+    deadline = time.time() + 2
+    while game.user_input_queue.empty() and time.time() < deadline:
+        time.sleep(0.001)
+    player.stop()
+
+    # Assert
+    cmd = game.user_input_queue.get_nowait()
+    assert cmd.type == "Move" and cmd.piece_id[1] == "W"
+    assert player.decisions == 1
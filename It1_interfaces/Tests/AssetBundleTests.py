@@ -0,0 +1,168 @@
+import json
+import os
+import pathlib
+import shutil
+import numpy as np
+import pytest
+from AssetBundle import AssetBundle
+from Board import Board
+from Moves import Moves
+from PieceFactory import PieceFactory
+from SpriteCache import SpriteCache
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+CELL = (40, 30)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    SpriteCache.clear()
+    yield
+    SpriteCache.clear()
+
+
+@pytest.fixture
+def pieces(tmp_path):
+    """A two-piece copy of the stock tree that the tests may edit."""
+    root = tmp_path / "pieces"
+    for p_type in ("PW", "KB"):
+        shutil.copytree(ROOT / "pieces" / p_type, root / p_type)
+    return root
+
+
+def test_bundle_round_trips_configs_moves_and_frames(pieces, tmp_path):
+    # Act
+    bundle = AssetBundle.compile(pieces, tmp_path / "assets.bundle", CELL)
+    reopened = AssetBundle(tmp_path / "assets.bundle")
+
+    # Assert
+    config = json.loads((pieces / "PW" / "states" / "move" / "config.json").read_text())
+    assert reopened.config("PW", "move") == config
+    assert reopened.rules("KB") == Moves._parse(pieces / "KB" / "moves.txt")
+    name, index = reopened.pieces["PW"]["states"]["idle"]["frames"][2]
+    expected = Img().read(pieces / "PW" / "states" / "idle" / "sprites" / name, size=CELL).to_channels(4).img
+    assert np.array_equal(reopened.frames[index], expected)
+    assert reopened.frames.shape == (bundle.frames.shape[0], 30, 40, 4)
+
+
+def test_frames_are_read_only_views_of_the_mapped_file(pieces, tmp_path):
+    # Act
+    bundle = AssetBundle.compile(pieces, tmp_path / "assets.bundle", CELL)
+
+    # Assert
+    assert not bundle.frames.flags.owndata and not bundle.frames.flags.writeable
+    with pytest.raises(ValueError):
+        bundle.frames[0, 0, 0, 0] = 1
+
+
+def test_edited_source_triggers_a_rebuild(pieces, tmp_path):
+    # Arrange
+    path = tmp_path / "assets.bundle"
+    AssetBundle.load(pieces, path, CELL)
+    config_path = pieces / "PW" / "states" / "move" / "config.json"
+    config = json.loads(config_path.read_text())
+    config["physics"]["speed_m_per_sec"] = 3.0
+    config_path.write_text(json.dumps(config))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    # Act
+    fresh = AssetBundle.load(pieces, path, CELL)
+    again = AssetBundle.load(pieces, path, CELL)
+
+    # Assert
+    assert fresh.config("PW", "move")["physics"]["speed_m_per_sec"] == 3.0
+    assert not again.is_stale(pieces)
+    assert AssetBundle.load(pieces, path, (20, 20)).cell_size == (20, 20)       # other cell size – rebuilt
+
+
+def test_factory_from_bundle_decodes_nothing(tmp_path):
+    # Arrange
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    path = tmp_path / "assets.bundle"
+    AssetBundle.compile(ROOT / "pieces", path, (board.cell_W_pix, board.cell_H_pix))
+    from_tree = PieceFactory(board, ROOT / "pieces")
+    SpriteCache.clear()
+
+    # Act
+    from_bundle = PieceFactory(board, ROOT / "pieces", bundle_path=path)
+
+    # Assert
+    assert SpriteCache.stats()["misses"] == 0
+    for p_type, template in from_tree.piece_templates.items():
+        twin = from_bundle.piece_templates[p_type]
+        assert twin._machine.names == template._machine.names
+        assert twin.get_state("move").get_physics().speed_m_s == template.get_state("move").get_physics().speed_m_s
+        assert twin.get_state("idle").get_moves().rules == template.get_state("idle").get_moves().rules
+        assert np.array_equal(twin.get_state("idle").get_graphics().sprites[0].img,
+                              template.get_state("idle").get_graphics().sprites[0].img)
+
+
+def test_installed_frames_match_the_bundle_layout_and_blend_lazily(pieces, tmp_path):
+    # Arrange
+    bundle = AssetBundle.compile(pieces, tmp_path / "assets.bundle", CELL, channels=4)
+    name, index = bundle.pieces["PW"]["states"]["idle"]["frames"][0]
+    sprite_path = pieces / "PW" / "states" / "idle" / "sprites" / name
+
+    # Act
+    bundle.install(pieces)
+    sprite = SpriteCache.get(sprite_path, CELL, channels=4)
+    blend_before_draw = sprite._blend
+    canvas = Img()
+    canvas.img = np.zeros((30, 40, 4), dtype=np.uint8)
+    sprite.draw_on(canvas, 0, 0)
+
+    # Assert
+    assert SpriteCache.stats()["misses"] == 0
+    assert np.shares_memory(sprite.img, bundle.frames[index])
+    assert blend_before_draw is None and sprite._blend is not None
+
+
+def test_stale_bundle_is_unmapped_before_it_is_replaced(pieces, tmp_path, monkeypatch):
+    # Arrange
+    path = tmp_path / "assets.bundle"
+    AssetBundle.compile(pieces, path, CELL)
+    opened, replace = [], os.replace
+
+    class Tracked(AssetBundle):
+        def __init__(self, path):
+            super().__init__(path)
+            opened.append(self)
+
+    def replace_unmapped(src, dst):
+        assert all(bundle._map.closed for bundle in opened)        # Windows cannot replace a mapped file
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace_unmapped)
+
+    # Act
+    bundle = Tracked.load(pieces, path, (20, 20))
+
+    # Assert
+    assert bundle.cell_size == (20, 20)
+    assert opened[0].frames.shape[0] == 0
+
+
+def test_factory_reads_the_tree_when_the_bundle_cannot_be_replaced(tmp_path, monkeypatch, capsys):
+    # Arrange
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    path = tmp_path / "assets.bundle"
+    AssetBundle.compile(ROOT / "pieces", path, (20, 20))
+
+    def locked(src, dst):
+        raise PermissionError(13, "The process cannot access the file", str(dst))
+
+    monkeypatch.setattr(os, "replace", locked)
+
+    # Act
+    factory = PieceFactory(board, ROOT / "pieces", bundle_path=path)
+
+    # Assert
+    assert factory.bundle is None
+    assert SpriteCache.stats()["misses"] > 0
+    assert factory.piece_templates["KB"].get_state("idle").get_graphics().sprites
+    assert [p.name for p in tmp_path.iterdir()] == ["assets.bundle"]
+    assert "could not rebuild" in capsys.readouterr().out
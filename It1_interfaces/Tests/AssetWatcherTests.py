@@ -0,0 +1,176 @@
+import json
+import os
+import pathlib
+import shutil
+import cv2
+import numpy as np
+import pytest
+from AIPlayer import AIPlayer
+from AssetWatcher import AssetWatcher
+from BatchPhysics import BatchPhysics, REST, STILL
+from Board import Board
+from Command import Command
+from HeadlessRunner import headless_game
+from PieceFactory import PieceFactory
+from SpriteCache import SpriteCache
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def factory(tmp_path):
+    """A factory over a two-piece copy of the stock tree that the tests may edit."""
+    root = tmp_path / "pieces"
+    for p_type in ("RW", "KB"):
+        shutil.copytree(ROOT / "pieces" / p_type, root / p_type)
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    return PieceFactory(board, root)
+
+
+def touch(path):
+    """Bump the mtime by a second – some filesystems only keep coarse timestamps."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def edit_config(factory, p_type, state, **physics):
+    path = factory.pieces_root / p_type / "states" / state / "config.json"
+    cfg = json.loads(path.read_text())
+    cfg["physics"].update(physics)
+    path.write_text(json.dumps(cfg))
+    touch(path)
+
+
+def test_config_change_is_swapped_in_at_the_next_tick(factory):
+    # Arrange
+    rook = factory.clone_piece("RW")
+    rook.piece_id = "RW_7_0"
+    rook.set_current_cell((7, 0), 0)
+    king = factory.clone_piece("KB")
+    king.piece_id = "KB_0_4"
+    king.set_current_cell((0, 4), 0)
+    game = headless_game([rook, king], factory.board)
+    game.start(0)
+    watcher = AssetWatcher(factory)
+    watcher.attach(game)
+    old_move = rook.get_state("move").get_physics()
+
+    # Act
+    edit_config(factory, "RW", "move", speed_m_per_sec=3.0)
+    changed = watcher.check()
+    before_tick = rook.get_state("move").get_physics()
+    game._tick(10)
+
+    # Assert
+    assert changed == 1
+    assert before_tick is old_move                          # nothing changes between ticks
+    assert rook.get_state("move").get_physics().speed_m_s == 3.0
+    assert factory.piece_templates["RW"].get_state("move").get_physics().speed_m_s == 3.0
+    assert factory.piece_templates["RW"].get_state("idle").get_physics() is not None
+
+
+def test_move_in_flight_keeps_its_duration(factory):
+    # Arrange
+    rook = factory.clone_piece("RW")
+    rook.piece_id = "RW_7_0"
+    rook.set_current_cell((7, 0), 0)
+    rook.on_command(Command(0, "RW_7_0", "Move", [(7, 0), (3, 0)]), 0)
+    deadline = rook.next_deadline()
+    watcher = AssetWatcher(factory)
+    watcher.watch(rook._machine)
+
+    # Act
+    edit_config(factory, "RW", "move", speed_m_per_sec=10.0)
+    watcher.check()
+    watcher.apply_pending()
+
+    # Assert
+    assert rook.next_deadline() == deadline
+    assert rook.get_state("move").get_physics().duration_for((7, 0), (3, 0)) < deadline
+
+
+def test_changed_sprite_is_the_only_file_re_decoded(factory):
+    # Arrange
+    watcher = AssetWatcher(factory)
+    sprite_path = factory.pieces_root / "KB" / "states" / "idle" / "sprites" / "1.png"
+    cv2.imwrite(str(sprite_path), np.full((50, 50, 3), 7, dtype=np.uint8))
+    touch(sprite_path)
+    misses = SpriteCache.stats()["misses"]
+
+    # Act
+    watcher.check()
+    swapped = watcher.apply_pending()
+
+    # Assert
+    graphics = factory.piece_templates["KB"].get_state("idle").get_graphics()
+    assert swapped == 1
+    assert SpriteCache.stats()["misses"] == misses + 1
+    assert int(graphics.sprites[0].img[..., :3].max()) == 7
+
+
+def test_moves_change_reaches_every_state_of_the_type(factory):
+    # Arrange
+    watcher = AssetWatcher(factory)
+    moves_path = factory.pieces_root / "KB" / "moves.txt"
+    moves_path.write_text("1,0\n")
+    touch(moves_path)
+
+    # Act
+    watcher.check()
+    swapped = watcher.apply_pending()
+
+    # Assert
+    template = factory.piece_templates["KB"]
+    assert swapped == len(template._machine.states)
+    assert all(state.get_moves().moves == [(1, 0)] for state in template._machine.states)
+
+
+def test_broken_config_keeps_the_loaded_state(factory, capsys):
+    # Arrange
+    watcher = AssetWatcher(factory)
+    path = factory.pieces_root / "RW" / "states" / "move" / "config.json"
+    physics = factory.piece_templates["RW"].get_state("move").get_physics()
+    path.write_text("{ not json")
+    touch(path)
+
+    # Act
+    watcher.check()
+    watcher.apply_pending()
+
+    # Assert
+    assert factory.piece_templates["RW"].get_state("move").get_physics() is physics
+    assert "could not reload RW/move" in capsys.readouterr().out
+
+
+def test_caches_built_from_the_old_physics_are_refreshed(factory):
+    # Arrange
+    rook = factory.clone_piece("RW")
+    rook.piece_id = "RW_7_0"
+    rook.set_current_cell((7, 0), 0)
+    king = factory.clone_piece("KB")
+    king.piece_id = "KB_0_4"
+    king.set_current_cell((0, 4), 0)
+    game = headless_game([rook, king], factory.board)
+    game.start(0)
+    watcher = AssetWatcher(factory)
+    watcher.attach(game)
+    batch, player = BatchPhysics(factory.board), AIPlayer("W", max_nodes=50)
+    batch.compute(game.state, 0)
+    player.decide(game, 0)
+    long_rest = rook._machine.state_ids["long_rest"]
+    kind_before = batch._kinds[batch._machine_index(rook._machine), long_rest]
+
+    # Act
+    edit_config(factory, "RW", "long_rest", type="idle")
+    edit_config(factory, "RW", "move", speed_m_per_sec=3.0)
+    watcher.check()
+    game._tick(10)
+    batch.compute(game.state, 10)
+    player.decide(game, 10)
+
+    # Assert
+    assert kind_before == REST
+    assert batch._kinds[batch._machine_index(rook._machine), long_rest] == STILL
+    assert player._static["RW_7_0"][2][3].speed_m_s == 3.0
@@ -0,0 +1,80 @@
+import numpy as np
+from BatchPhysics import BatchPhysics, physics_kind, STILL, REST, MOVE
+from Command import Command
+from Renderer import Renderer
+from StateArrays import StateArrays
+
+
+def bound_pieces(placed):
+    state = StateArrays()
+    pieces = {}
+    for piece in placed:
+        state.add(piece)
+        pieces[piece.piece_id] = piece
+    return state, pieces
+
+
+def per_piece(pieces, now_ms):
+    return {pid: (p._state.get_physics().get_draw_position(now_ms), p._state.get_physics().get_cooldown_ratio(now_ms))
+            for pid, p in pieces.items()}
+
+
+def batched(batch, state, now_ms):
+    kin = batch.compute(state, now_ms)
+    return {state.pieces[row].piece_id: ((x, y), c)
+            for row, x, y, c in zip(kin.rows.tolist(), kin.x.tolist(), kin.y.tolist(), kin.cooldown.tolist())}
+
+
+def test_stock_physics_kinds(factory):
+    # Arrange
+    piece = factory.create_piece("RW")
+
+    # Act / Assert
+    assert physics_kind(piece.get_state("idle").get_physics()) == STILL
+    assert physics_kind(piece.get_state("jump").get_physics()) == STILL
+    assert physics_kind(piece.get_state("long_rest").get_physics()) == REST
+    assert physics_kind(piece.get_state("move").get_physics()) == MOVE
+
+
+def test_batch_matches_the_per_piece_methods_through_a_move(factory, place):
+    # Arrange
+    state, pieces = bound_pieces(place({(7, 0): "RW", (4, 4): "QB", (6, 3): "PW", (1, 1): "NB"}))
+    pieces["RW_7_0"].on_command(Command(0, "RW_7_0", "Move", [(7, 0), (2, 0)]), 0)
+    pieces["QB_4_4"].on_command(Command(40, "QB_4_4", "Move", [(4, 4), (7, 7)]), 40)
+    pieces["NB_1_1"].on_command(Command(0, "NB_1_1", "Jump", [(1, 1)]), 0)
+    batch = BatchPhysics(factory.board)
+    end = max(p.next_deadline() or 0 for p in pieces.values())
+
+    # Act / Assert
+    for now in list(range(0, end + 2000, 37)):
+        for piece in pieces.values():
+            piece.update(now)
+        assert batched(batch, state, now) == per_piece(pieces, now)
+
+
+def test_captured_pieces_are_left_out(factory, place):
+    # Arrange
+    state, pieces = bound_pieces(place({(7, 0): "RW", (0, 0): "RB"}))
+    state.kill(state.rows["RB_0_0"])
+
+    # Act
+    kin = BatchPhysics(factory.board).compute(state, 0)
+
+    # Assert
+    assert kin.positions(state) == {"RW_7_0": factory.board.cell_to_px((7, 0))}
+
+
+def test_renderer_paints_the_same_frame_with_batched_positions(factory, place):
+    # Arrange
+    state, pieces = bound_pieces(place({(7, 0): "RW", (4, 4): "QB"}))
+    pieces["RW_7_0"].on_command(Command(0, "RW_7_0", "Move", [(7, 0), (3, 0)]), 0)
+    scalar, vector = Renderer(factory.board), Renderer(factory.board)
+
+    # Act
+    frames = []
+    for now in (0, 250, 700):
+        pieces["RW_7_0"].update(now)
+        frames.append((scalar.render(pieces, now).img.img.copy(), vector.render(pieces, now, state).img.img.copy()))
+
+    # Assert
+    assert all(np.array_equal(a, b) for a, b in frames)
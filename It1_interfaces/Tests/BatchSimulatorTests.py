@@ -0,0 +1,21 @@
+from BatchSimulator import run_batch, GameSummary
+
+
+def test_games_are_reproducible_per_seed():
+    # Act
+    first = list(run_batch(3, workers=1, max_ms=20000))
+    second = list(run_batch(3, workers=1, max_ms=20000))
+
+    # Assert
+    assert first == second
+    assert [s.seed for s in first] == [0, 1, 2]
+    assert all(isinstance(s, GameSummary) and s.commands > 0 for s in first)
+
+
+def test_process_pool_matches_in_process_results():
+    # Act
+    serial = list(run_batch(4, workers=1, first_seed=10, max_ms=20000))
+    parallel = list(run_batch(4, workers=2, first_seed=10, max_ms=20000))
+
+    # Assert – completion order may differ
+    assert sorted(parallel) == serial
@@ -0,0 +1,126 @@
+import pathlib
+import pytest
+from BatchSimulator import RandomPlayer
+from Command import Command
+from CommandLog import CommandLogWriter, CommandLogReader, RECORD
+from HeadlessRunner import headless_game, load_pieces, run_headless
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def play(factory, end_ms, log_path=None, seed=7):
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    if log_path is not None:
+        game.command_log = CommandLogWriter(log_path, factory.board.W_cells, factory.board.H_cells,
+                                            snapshot_every_ms=1000)
+    run_headless(game, [], max_ms=end_ms, controller=RandomPlayer(seed))
+    if game.command_log is not None:
+        game.command_log.close()
+    return game
+
+
+def test_records_are_fixed_width_and_decode_back(factory, tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+
+    # Act
+    play(factory, 5000, path)
+
+    # Assert
+    assert path.stat().st_size % RECORD.size == 0
+    with CommandLogReader(path) as reader:
+        records = list(reader.records())
+        assert records and len(records) == len(reader)
+        first = records[0]
+        assert not first.internal and first.command.type == "Move"
+        assert len(first.command.params) == 2
+        assert any(r.internal for r in records)                 # physics completions are logged too
+        assert [r.tick_ms for r in records] == sorted(r.tick_ms for r in records)
+
+
+def test_first_record_after_uses_tick_order(factory, tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+    play(factory, 5000, path)
+
+    with CommandLogReader(path) as reader:
+        # Act
+        i = reader.first_record_after(2000)
+
+        # Assert
+        assert all(r.tick_ms <= 2000 for r in reader.records(0, i))
+        assert all(r.tick_ms > 2000 for r in reader.records(i))
+
+
+@pytest.mark.parametrize("t_ms", [0, 2350, 7000, 9990])
+def test_seek_matches_the_live_game(factory, tmp_path, t_ms):
+    # Arrange
+    path = tmp_path / "game.log"
+    play(factory, 10000, path)
+    expected = play(factory, t_ms).snapshot()
+
+    # Act
+    with CommandLogReader(path) as reader:
+        game = reader.seek(factory, t_ms)
+
+    # Assert
+    assert game.snapshot() == expected
+
+
+def test_unpackable_params_are_stored_as_no_cell(tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+    with CommandLogWriter(path, 8, 8) as log:
+        # Act
+        log.record(10, Command(5, "KW", "Jump", [(7, 4)]))
+        log.record(20, Command(20, "KW", "idle", []), internal=True)
+
+    # Assert
+    with CommandLogReader(path) as reader:
+        assert [r.command for r in reader.records()] == [Command(5, "KW", "Jump", [(7, 4)]),
+                                                         Command(20, "KW", "idle", [])]
+        assert [r.internal for r in reader.records()] == [False, True]
+
+
+def test_off_board_cells_are_stored_as_no_cell(tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+    with CommandLogWriter(path, 8, 8) as log:
+        # Act
+        log.record(10, Command(5, "KW", "Jump", [(7, 4), (-1, 0)]))
+        log.record(20, Command(20, "KW", "Jump", [(7, 4), (8, 0)]))
+        log.record(30, Command(30, "KW", "Jump", [(7, 4), ("a", 0)]))
+
+    # Assert
+    with CommandLogReader(path) as reader:
+        assert [r.command.params for r in reader.records()] == [[(7, 4)]] * 3
+
+
+def test_rejected_move_is_not_logged_and_does_not_stop_the_game(factory, tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    game.command_log = CommandLogWriter(path, factory.board.W_cells, factory.board.H_cells)
+    game.start(0)
+
+    # Act
+    game.user_input_queue.put(Command(0, "PW_6_0", "Move", [(6, 0), (-1, 0)]))
+    game._tick(10)
+    game.command_log.close()
+
+    # Assert
+    with CommandLogReader(path) as reader:
+        assert len(reader) == 0
+
+
+def test_cells_of_a_200_by_200_board_round_trip(tmp_path):
+    # Arrange
+    path = tmp_path / "game.log"
+    with CommandLogWriter(path, 200, 200) as log:
+        # Act
+        log.record(10, Command(5, "QW", "Move", [(199, 0), (0, 199)]))
+
+    # Assert
+    with CommandLogReader(path) as reader:
+        assert reader.header["version"] == 2
+        assert reader.record(0).command.params == [(199, 0), (0, 199)]
@@ -0,0 +1,55 @@
+from EventScheduler import EventScheduler
+
+
+def test_pop_due_returns_keys_in_deadline_order():
+    # Arrange
+    scheduler = EventScheduler()
+    scheduler.schedule("b", 300)
+    scheduler.schedule("a", 100)
+    scheduler.schedule("c", 200)
+
+    # Act
+    due = scheduler.pop_due(250)
+
+    # Assert
+    assert due == ["a", "c"]
+    assert len(scheduler) == 1
+    assert scheduler.next_deadline() == 300
+
+
+def test_equal_deadlines_keep_scheduling_order():
+    # Arrange
+    scheduler = EventScheduler()
+    for key in ("x", "y", "z"):
+        scheduler.schedule(key, 100)
+
+    # Act + Assert
+    assert scheduler.pop_due(100) == ["x", "y", "z"]
+
+
+def test_rescheduling_replaces_previous_deadline():
+    # Arrange
+    scheduler = EventScheduler()
+    scheduler.schedule("a", 100)
+
+    # Act
+    scheduler.schedule("a", 500)
+
+    # Assert
+    assert scheduler.pop_due(400) == []
+    assert scheduler.pop_due(500) == ["a"]
+    assert scheduler.next_deadline() is None
+
+
+def test_cancelled_key_is_never_returned():
+    # Arrange
+    scheduler = EventScheduler()
+    scheduler.schedule("a", 100)
+    scheduler.schedule("b", 100)
+
+    # Act
+    scheduler.cancel("a")
+
+    # Assert
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(1000) == ["b"]
@@ -0,0 +1,126 @@
+from GameLoop import GameLoop
+
+
+class FakeClock:
+    """Virtual clock in seconds; sleeping and simulated work advance it."""
+    def __init__(self):
+        self.t = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.t += seconds
+
+
+def run_loop(clock, duration_ms, tick_cost_ms=0.0, render_cost_ms=0.0, **kwargs):
+    loop = GameLoop(clock=clock, sleep=clock.sleep, **kwargs)
+    ticks, frames = [], []
+
+    def simulate(sim_ms):
+        ticks.append(sim_ms)
+        clock.t += tick_cost_ms / 1000
+
+    def render(render_ms):
+        frames.append(render_ms)
+        clock.t += render_cost_ms / 1000
+        return True
+
+    loop.run(simulate, render, done=lambda: bool(ticks) and ticks[-1] >= duration_ms)
+    return loop, ticks, frames
+
+
+def test_ticks_are_fixed_steps():
+    # Arrange
+    clock = FakeClock()
+
+    # Act
+    loop, ticks, frames = run_loop(clock, 1000, tick_ms=10, render_cost_ms=3)
+
+    # Assert
+    assert ticks == list(range(10, 1001, 10))
+    assert loop.ticks == 100
+
+
+def test_sleep_is_computed_from_frame_deadline():
+    # Arrange
+    clock = FakeClock()
+
+    # Act
+    loop, ticks, frames = run_loop(clock, 1000, tick_ms=10, target_fps=50, render_cost_ms=5)
+
+    # Assert – 20 ms frame budget minus 5 ms render cost
+    assert 45 <= loop.frames <= 55
+    assert all(abs(s - 0.015) < 1e-6 for s in clock.sleeps[1:-1])
+
+
+def test_slow_render_drops_frames_but_not_ticks():
+    # Arrange
+    clock = FakeClock()
+
+    # Act – every frame costs 40 ms, four ticks' worth
+    loop, ticks, frames = run_loop(clock, 1000, tick_ms=10, max_ticks_per_frame=2, render_cost_ms=40)
+
+    # Assert
+    assert ticks == list(range(10, 1001, 10))
+    assert loop.dropped_frames > 0
+    assert loop.frames < 30
+
+
+def test_outcome_is_independent_of_render_cost():
+    # Arrange
+    fast, slow = FakeClock(), FakeClock()
+
+    # Act
+    _, fast_ticks, _ = run_loop(fast, 500, render_cost_ms=1)
+    _, slow_ticks, _ = run_loop(slow, 500, render_cost_ms=70)
+
+    # Assert
+    assert fast_ticks == slow_ticks
+
+
+def test_render_time_stays_within_one_tick_of_simulation():
+    # Arrange
+    clock = FakeClock()
+
+    # Act
+    loop, ticks, frames = run_loop(clock, 500, tick_ms=10, target_fps=60)
+
+    # Assert
+    assert frames == sorted(frames)
+    assert all(f <= 500 + 9 for f in frames)
+
+
+def test_rates_are_measured():
+    # Arrange
+    clock = FakeClock()
+
+    # Act
+    loop, _, _ = run_loop(clock, 2500, tick_ms=10, target_fps=50, render_cost_ms=2)
+
+    # Assert
+    assert 95 <= loop.tick_rate <= 105
+    assert 45 <= loop.frame_rate <= 55
+
+
+def test_stall_discards_only_the_wall_time_beyond_max_lag():
+    # Arrange
+    clock = FakeClock()
+    loop = GameLoop(tick_ms=10, max_lag_ms=250, clock=clock, sleep=clock.sleep)
+    ticks, backlog = [], []
+
+    def simulate(sim_ms):
+        ticks.append(sim_ms)
+        backlog.append(loop.elapsed_ms() - sim_ms)
+        if sim_ms == 100:
+            clock.t += 1.0                              # one tick stalls for a second
+
+    # Act
+    loop.run(simulate, lambda render_ms: True, done=lambda: bool(ticks) and ticks[-1] >= 1000)
+
+    # Assert – once the stall is trimmed the loop is still max_lag_ms behind, and then catches up
+    assert ticks == list(range(10, 1001, 10))
+    assert 250 - loop.tick_ms - 1 < max(backlog[16:]) <= 250
+    assert backlog[-1] < loop.tick_ms
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import pathlib
+import pytest
+from GameServer import ClientConnection, GameServer
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+async def connect(port, **join):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    if join:
+        await send(writer, op="join", **join)
+    return reader, writer
+
+
+async def send(writer, **msg):
+    writer.write(json.dumps(msg).encode() + b"\n")
+    await writer.drain()
+
+
+async def receive(reader, msg_type, timeout=2.0):
+    """Next message of `msg_type` (skipping others)."""
+    while True:
+        msg = json.loads(await asyncio.wait_for(reader.readline(), timeout))
+        if msg["type"] == msg_type:
+            return msg
+
+
+class FakeWriter:
+    """Transport that records what is written; a stalled one never drains."""
+    def __init__(self, stalled=False):
+        self.stalled = stalled
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    async def drain(self):
+        if self.stalled:
+            await asyncio.Event().wait()
+
+    def close(self):
+        pass
+
+    async def wait_closed(self):
+        pass
+
+
+def run_with_server(factory, scenario, **kwargs):
+    async def main():
+        server = GameServer(factory, ROOT, **kwargs)
+        port = await server.start()
+        try:
+            return await scenario(server, port)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_joined_clients_get_the_full_state(factory):
+    async def scenario(server, port):
+        # Act
+        white, w_writer = await connect(port, match="m", colour="W")
+        black, b_writer = await connect(port, match="m", colour="B")
+        return await receive(white, "state"), await receive(black, "state"), server
+
+    # Arrange / Act
+    first, second, server = run_with_server(factory, scenario)
+
+    # Assert
+    assert len(first["pieces"]) == 32
+    assert first["pieces"]["PW_6_4"][:3] == ["idle", 6, 4]
+    assert second["pieces"].keys() == first["pieces"].keys()
+    assert list(server.matches) == ["m"]
+
+
+def test_move_is_broadcast_as_a_delta_of_only_the_moved_piece(factory):
+    async def scenario(server, port):
+        # Arrange
+        white, w_writer = await connect(port, match="m", colour="W")
+        black, b_writer = await connect(port, match="m", colour="B")
+        await receive(white, "state")
+        await receive(black, "state")
+
+        # Act
+        await send(w_writer, op="move", piece="PW_6_4", to=[4, 4])
+        return await receive(white, "delta"), await receive(black, "delta")
+
+    # Act
+    to_white, to_black = run_with_server(factory, scenario)
+
+    # Assert
+    assert to_white == to_black
+    assert list(to_white["changed"]) == ["PW_6_4"]
+    assert to_white["changed"]["PW_6_4"][0] == "move"
+    assert to_white["changed"]["PW_6_4"][3:5] == [4, 4]
+    assert to_white["removed"] == []
+
+
+def test_moving_an_opponent_piece_is_rejected(factory):
+    async def scenario(server, port):
+        # Arrange
+        black, writer = await connect(port, match="m", colour="B")
+        await receive(black, "state")
+
+        # Act
+        await send(writer, op="move", piece="PW_6_4", to=[4, 4])
+        error = await receive(black, "error")
+        await asyncio.sleep(0.05)
+        return error, server.matches["m"].game.pieces["PW_6_4"].get_state_name()
+
+    # Act
+    error, state = run_with_server(factory, scenario)
+
+    # Assert
+    assert error["error"] == "not your piece"
+    assert state == "idle"
+
+
+def test_slow_client_outbox_stays_bounded_and_resyncs():
+    async def scenario():
+        # Arrange
+        client = ClientConnection(None, FakeWriter(stalled=True), outbox_limit=4)
+
+        # Act
+        for i in range(100):
+            client.send(b"delta %d\n" % i)
+            await asyncio.sleep(0)
+        result = len(client.outbox), client.needs_resync, client.resyncs, len(client.writer.written)
+        await client.close()
+        return result
+
+    # Act
+    queued, needs_resync, resyncs, written = asyncio.run(scenario())
+
+    # Assert
+    assert queued <= 4
+    assert needs_resync and resyncs == 1
+    assert written == 1
+
+
+@pytest.mark.parametrize("piece", [["PW_6_4"], {"id": "PW_6_4"}, 7, None])
+def test_malformed_piece_id_gets_an_error_and_keeps_the_connection(factory, piece):
+    async def scenario(server, port):
+        # Arrange
+        white, writer = await connect(port, match="m", colour="W")
+        await receive(white, "state")
+
+        # Act
+        await send(writer, op="move", piece=piece, to=[4, 4])
+        error = await receive(white, "error")
+        await send(writer, op="move", piece="PW_6_4", to=[4, 4])
+        return error, await receive(white, "delta")
+
+    # Act
+    error, delta = run_with_server(factory, scenario)
+
+    # Assert
+    assert error["error"] == "no such piece"
+    assert list(delta["changed"]) == ["PW_6_4"]
+
+
+def test_finished_match_tells_its_clients_and_detaches_them(factory):
+    async def scenario(server, port):
+        # Arrange
+        white, writer = await connect(port, match="m", colour="W")
+        await receive(white, "state")
+        server.matches["m"].game.tracker.on_capture("KB_0_4")
+
+        # Act
+        await send(writer, op="move", piece="PW_6_4", to=[4, 4])
+        over = await receive(white, "game_over")
+        await send(writer, op="move", piece="PW_6_3", to=[4, 3])
+        return over, await receive(white, "error"), server
+
+    # Act
+    over, error, server = run_with_server(factory, scenario)
+
+    # Assert
+    assert over == {"type": "game_over", "match": "m", "winner": "W"}
+    assert error["error"] == "join a match first"
+    assert "m" not in server.matches
+
+
+def test_pipelined_requests_past_the_outbox_limit_all_get_answers(factory):
+    async def scenario(server, port):
+        # Arrange
+        reader, writer = await connect(port)
+
+        # Act – one write: more malformed requests than the outbox holds, then a join
+        writer.write(b"{not json\n" * 20 + json.dumps({"op": "join", "match": "m"}).encode() + b"\n")
+        await writer.drain()
+        errors = [await receive(reader, "error") for _ in range(20)]
+        return errors, await receive(reader, "state")
+
+    # Act
+    errors, state = run_with_server(factory, scenario, outbox_limit=8)
+
+    # Assert
+    assert all(error["error"] == "bad message" for error in errors)
+    assert len(state["pieces"]) == 32
+
+
+def test_resync_without_a_match_is_cleared_and_the_client_keeps_receiving():
+    async def scenario():
+        # Arrange
+        client = ClientConnection(None, FakeWriter(), outbox_limit=4)
+
+        # Act
+        for i in range(10):
+            client.send(b"delta %d\n" % i)                 # no yield: the writer cannot keep up
+        await asyncio.sleep(0)
+        client.reply(b"reply\n")
+        await asyncio.sleep(0)
+        result = client.needs_resync, client.resyncs, client.writer.written
+        await client.close()
+        return result
+
+    # Act
+    needs_resync, resyncs, written = asyncio.run(scenario())
+
+    # Assert
+    assert not needs_resync and resyncs == 1
+    assert written == [b"reply\n"]
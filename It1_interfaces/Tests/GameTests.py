@@ -0,0 +1,115 @@
+import pytest
+from Command import Command
+from Game import Game, InvalidBoard
+
+
+def run_until(game, end_ms, start_ms=10, step_ms=10):
+    for now in range(start_ms, end_ms + 1, step_ms):
+        game._tick(now)
+
+
+def test_duplicate_piece_ids_are_rejected(factory):
+    # Arrange
+    a, b = factory.create_piece("PW"), factory.create_piece("PW")
+
+    # Act + Assert
+    with pytest.raises(InvalidBoard):
+        Game([a, b], factory.board)
+
+
+def test_move_updates_occupancy_on_arrival(factory, place):
+    # Arrange
+    game = Game(place({(6, 0): "PW"}), factory.board)
+
+    # Act
+    game.user_input_queue.put(Command(0, "PW_6_0", "Move", [(6, 0), (5, 0)]))
+    run_until(game, 3000)
+
+    # Assert
+    assert game.pieces["PW_6_0"].get_current_cell() == (5, 0)
+    assert game.occupancy.pieces_at((5, 0)) == ["PW_6_0"]
+    assert game.occupancy.pieces_at((6, 0)) == []
+
+
+def test_arriving_piece_captures_enemy(factory, place):
+    # Arrange
+    game = Game(place({(7, 0): "RW", (5, 0): "PB", (0, 0): "KB"}), factory.board)
+
+    # Act
+    game.user_input_queue.put(Command(0, "RW_7_0", "Move", [(7, 0), (5, 0)]))
+    run_until(game, 3000)
+
+    # Assert
+    assert "PB_5_0" not in game.pieces
+    assert game.occupancy.pieces_at((5, 0)) == ["RW_7_0"]
+    assert not game.occupancy.crowded
+
+
+def test_friendly_pieces_do_not_capture_each_other(factory, place):
+    # Arrange
+    game = Game(place({(7, 0): "RW", (5, 0): "PW"}), factory.board)
+
+    # Act
+    game.user_input_queue.put(Command(0, "RW_7_0", "Move", [(7, 0), (5, 0)]))
+    run_until(game, 3000)
+
+    # Assert
+    assert set(game.pieces) == {"RW_7_0", "PW_5_0"}
+
+
+def test_capturing_the_king_wins(factory, place):
+    # Arrange
+    game = Game(place({(7, 0): "RW", (5, 0): "KB", (0, 7): "KW", (0, 0): "PB"}), factory.board)
+
+    # Act
+    over_at_start = game._is_win()
+    game.user_input_queue.put(Command(0, "RW_7_0", "Move", [(7, 0), (5, 0)]))
+    run_until(game, 3000)
+
+    # Assert
+    assert not over_at_start
+    assert game._is_win()
+    assert game.tracker.winner == "W"
+
+
+def test_rook_cannot_move_through_pieces(factory, place):
+    # Arrange
+    game = Game(place({(7, 0): "RW", (6, 0): "PW", (0, 0): "KB", (0, 7): "KW"}), factory.board)
+
+    # Act
+    game.user_input_queue.put(Command(0, "RW_7_0", "Move", [(7, 0), (3, 0)]))
+    run_until(game, 3000)
+
+    # Assert
+    assert game.pieces["RW_7_0"].get_current_cell() == (7, 0)
+
+
+def test_idle_pieces_are_not_updated(factory, place, monkeypatch):
+    # Arrange
+    game = Game(place({(6, 0): "PW", (1, 0): "PB"}), factory.board)
+    updates = []
+    for piece in game.pieces.values():
+        monkeypatch.setattr(piece, "update", lambda now, pid=piece.piece_id: updates.append(pid))
+
+    # Act
+    run_until(game, 1000)
+
+    # Assert
+    assert updates == []
+    assert len(game.scheduler) == 0
+
+
+def test_scheduler_drains_once_pieces_come_to_rest(factory, place):
+    # Arrange
+    game = Game(place({(6, 0): "PW"}), factory.board)
+
+    # Act
+    game.user_input_queue.put(Command(0, "PW_6_0", "Move", [(6, 0), (5, 0)]))
+    run_until(game, 10)
+    pending = len(game.scheduler)
+    run_until(game, 10000, start_ms=20)
+
+    # Assert
+    assert pending == 1
+    assert len(game.scheduler) == 0
+    assert game.pieces["PW_6_0"].get_current_cell() == (5, 0)
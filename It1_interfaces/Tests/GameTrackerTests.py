@@ -0,0 +1,84 @@
+from GameTracker import GameTracker, EliminationRule, KingCaptureRule
+
+
+STANDARD = ["KW", "QW_7_3", "PW_6_0", "KB", "QB_0_3", "PB_1_0"]
+
+
+def test_counts_per_colour_and_type():
+    # Arrange
+    tracker = GameTracker()
+
+    # Act
+    tracker.start(STANDARD)
+
+    # Assert
+    assert tracker.count("W") == 3
+    assert tracker.count("B", "P") == 1
+    assert tracker.king_alive("W") and tracker.king_alive("B")
+    assert not tracker.game_over
+
+
+def test_king_capture_ends_game():
+    # Arrange
+    tracker = GameTracker()
+    tracker.start(STANDARD)
+
+    # Act
+    tracker.on_capture("KB")
+
+    # Assert
+    assert tracker.game_over
+    assert tracker.winner == "W"
+
+
+def test_non_king_capture_does_not_end_game():
+    # Arrange
+    tracker = GameTracker()
+    tracker.start(STANDARD)
+
+    # Act
+    tracker.on_capture("QB_0_3")
+
+    # Assert
+    assert not tracker.game_over
+    assert tracker.count("B") == 2
+
+
+def test_elimination_rule_ignores_kings():
+    # Arrange
+    tracker = GameTracker([EliminationRule()])
+    tracker.start(STANDARD)
+
+    # Act
+    tracker.on_capture("KB")
+    over_after_king = tracker.game_over
+    tracker.on_capture("QB_0_3")
+    tracker.on_capture("PB_1_0")
+
+    # Assert
+    assert not over_after_king
+    assert tracker.game_over and tracker.winner == "W"
+
+
+def test_spawn_is_counted():
+    # Arrange
+    tracker = GameTracker([KingCaptureRule()])
+    tracker.start(["KW", "KB"])
+
+    # Act
+    tracker.on_spawn("QW_0_0")
+
+    # Assert
+    assert tracker.count("W", "Q") == 1
+    assert not tracker.game_over
+
+
+def test_single_side_is_over_immediately():
+    # Arrange
+    tracker = GameTracker()
+
+    # Act
+    tracker.start(["PW_6_0", "RW_7_0"])
+
+    # Assert
+    assert tracker.game_over and tracker.winner == "W"
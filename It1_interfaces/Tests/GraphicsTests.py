@@ -0,0 +1,85 @@
+import cv2
+import numpy as np
+import pytest
+from Board import Board
+from Graphics import Graphics
+from SpriteCache import SpriteCache
+from img import Img
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    SpriteCache.clear()
+    yield
+    SpriteCache.clear()
+
+
+def create_board(channels=4):
+    img = Img()
+    img.img = np.zeros((40, 40, channels), dtype=np.uint8)
+    return Board(W_cells=4, H_cells=4, cell_W_pix=10, cell_H_pix=10,
+                 cell_W_m=1, cell_H_m=1, img=img)
+
+
+def create_sprites(folder, count=2):
+    folder.mkdir()
+    for i in range(count):
+        cv2.imwrite(str(folder / f"{i + 1}.png"), np.full((30, 30, 3), 60 * (i + 1), dtype=np.uint8))
+    return folder
+
+
+def test_get_frame_returns_shared_read_only_sprite(tmp_path):
+    # Arrange
+    graphics = Graphics(create_sprites(tmp_path / "sprites"), create_board())
+
+    # Act
+    first = graphics.get_frame()
+    second = graphics.get_frame()
+
+    # Assert
+    assert first is second
+    assert not first.img.flags.writeable
+    assert first.img.shape == (10, 10, 4)        # normalized to the board layout
+
+
+def test_get_img_returns_writable_copy(tmp_path):
+    # Arrange
+    graphics = Graphics(create_sprites(tmp_path / "sprites"), create_board())
+
+    # Act
+    img = graphics.get_img()
+    img.img[0, 0] = 0
+
+    # Assert
+    assert img is not graphics.get_frame()
+    assert graphics.get_frame().img[0, 0, 0] == 60
+
+
+def test_draw_never_touches_cached_frame(tmp_path):
+    # Arrange
+    board = create_board(channels=3)
+    graphics = Graphics(create_sprites(tmp_path / "sprites"), board)
+    frame = graphics.get_frame()
+    pixels = frame.img
+
+    # Act
+    graphics.draw(board.img, (10, 10))
+    graphics.draw(board.img, (20, 20))
+
+    # Assert
+    assert graphics.get_frame() is frame
+    assert frame.img is pixels
+    assert frame.img.shape == (10, 10, 3)
+    assert np.all(board.img.img[10:20, 10:20] == 60)
+
+
+def test_copies_share_sprites(tmp_path):
+    # Arrange
+    graphics = Graphics(create_sprites(tmp_path / "sprites"), create_board())
+
+    # Act
+    clone = graphics.clone()
+
+    # Assert
+    assert clone is not graphics
+    assert clone.get_frame() is graphics.get_frame()
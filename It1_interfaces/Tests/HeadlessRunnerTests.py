@@ -0,0 +1,79 @@
+import pathlib
+from Command import Command
+from HeadlessRunner import headless_game, run_headless, load_pieces, load_script, VirtualClock
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+SCRIPT = [
+    Command(0, "PW_6_4", "Move", [(6, 4), (4, 4)]),
+    Command(0, "PB_1_3", "Move", [(1, 3), (3, 3)]),
+    Command(3000, "PW_6_4", "Move", [(4, 4), (3, 3)]),
+    Command(6000, "NB_0_1", "Move", [(0, 1), (2, 2)]),
+]
+
+
+def new_game(factory, pieces=None):
+    if pieces is None:
+        pieces = load_pieces(factory, ROOT / "pieces" / "board.csv")
+    return headless_game(pieces, factory.board)
+
+
+def test_scripted_king_capture_ends_the_game(factory, place):
+    # Arrange
+    game = new_game(factory, place({(7, 0): "RW", (4, 0): "KB", (7, 7): "KW"}))
+
+    # Act
+    result = run_headless(game, [Command(50, "RW_7_0", "Move", [(7, 0), (4, 0)])])
+
+    # Assert
+    assert result.game_over and result.winner == "W"
+    assert [pid for _, pid in result.captures] == ["KB_4_0"]
+    assert "KB_4_0" not in result.pieces
+
+
+def test_outcome_is_byte_identical_across_runs(factory):
+    # Act
+    first = run_headless(new_game(factory), SCRIPT)
+    second = run_headless(new_game(factory), SCRIPT)
+
+    # Assert
+    assert first.captures
+    assert first.outcome_bytes() == second.outcome_bytes()
+
+
+def test_skipping_idle_ticks_does_not_change_the_outcome(factory):
+    # Act
+    fast = run_headless(new_game(factory), SCRIPT, max_ms=20000)
+    full = run_headless(new_game(factory), SCRIPT, max_ms=20000, skip_idle=False)
+
+    # Assert
+    fast_outcome, full_outcome = fast.outcome(), full.outcome()
+    del fast_outcome["end_ms"], full_outcome["end_ms"]          # the full run always ticks up to max_ms
+    assert fast.ticks < full.ticks
+    assert fast_outcome == full_outcome
+
+
+def test_virtual_clock_follows_simulated_time(factory, place):
+    # Arrange
+    game = new_game(factory, place({(6, 0): "PW", (0, 0): "PB"}))
+
+    # Act
+    result = run_headless(game, [Command(0, "PW_6_0", "Move", [(6, 0), (5, 0)])])
+
+    # Assert
+    assert isinstance(game.clock, VirtualClock)
+    assert game.game_time_ms() == result.end_ms
+    assert result.pieces["PW_6_0"][0] == (5, 0)
+    assert result.sim_per_wall > 1
+
+
+def test_load_script_reads_json_lines(tmp_path):
+    # Arrange
+    path = tmp_path / "script.jsonl"
+    path.write_text('# opening\n{"timestamp": 0, "piece_id": "PW_6_4", "type": "Move", "params": [[6, 4], [4, 4]]}\n')
+
+    # Act
+    commands = load_script(path)
+
+    # Assert
+    assert commands == [Command(0, "PW_6_4", "Move", [(6, 4), (4, 4)])]
@@ -59,6 +59,43 @@ def test_draw_on_with_alpha():
     assert blended_pixel[3] == 255
 
 
+def test_draw_on_alpha_matches_float_blend():
+    # Arrange
+    rng = np.random.default_rng(0)
+    background = Img()
+    background.img = rng.integers(0, 256, (40, 40, 4), dtype=np.uint8)
+    expected = background.img.astype(np.float64)
+
+    logo = Img()
+    logo.img = rng.integers(0, 256, (40, 40, 4), dtype=np.uint8)
+    mask = logo.img[..., 3:4] / 255.0
+    expected[..., :3] = (1 - mask) * expected[..., :3] + mask * logo.img[..., :3]
+
+    # Act
+    logo.draw_on(background, 0, 0)
+
+    # Assert
+    diff = np.abs(background.img.astype(np.int16) - np.rint(expected).astype(np.int16))
+    assert diff.max() <= 1
+    assert np.array_equal(background.img[..., 3], np.rint(expected[..., 3]))
+
+
+def test_draw_on_rebuilds_mask_when_pixels_replaced():
+    # Arrange
+    background = Img()
+    background.img = create_dummy_img_array((10, 10, 4), color=(0, 0, 0, 255))
+    logo = Img()
+    logo.img = create_dummy_img_array((10, 10, 4), color=(255, 255, 255, 0))
+    logo.draw_on(background, 0, 0)
+
+    # Act
+    logo.img = create_dummy_img_array((10, 10, 4), color=(255, 255, 255, 255))
+    logo.draw_on(background, 0, 0)
+
+    # Assert
+    assert np.all(background.img[..., :3] == 255)
+
+
 def test_draw_on_invalid_position_raises():
     # Arrange
     bg = Img()
@@ -0,0 +1,84 @@
+import queue
+import threading
+import pytest
+from Command import Command
+from InputQueue import InputQueue, DROP_NEWEST, DROP_OLDEST
+
+
+def move(t, piece_id="PW_6_4", to=(4, 4)):
+    return Command(t, piece_id, "Move", [(6, 4), to])
+
+
+def test_drain_orders_the_batch_by_timestamp():
+    # Arrange
+    q = InputQueue()
+    for t, piece_id, row in [(30, "A", 5), (10, "B", 4), (20, "C", 4), (10, "A", 4)]:
+        q.put(move(t, piece_id, to=(row, 4)))
+
+    # Act
+    batch = q.drain()
+
+    # Assert
+    assert [(c.timestamp, c.piece_id) for c in batch] == [(10, "A"), (10, "B"), (20, "C"), (30, "A")]
+    assert q.empty() and q.drain() == []
+
+
+def test_repeated_clicks_are_coalesced_to_the_earliest():
+    # Arrange
+    q = InputQueue()
+    q.put(move(12))
+    q.put(Command(10, "PW_6_4", "Move", [[6, 4], [4, 4]]))      # same move, list params
+    q.put(move(11, to=(5, 4)))                                 # different target – kept
+
+    # Act
+    batch = q.drain()
+
+    # Assert
+    assert [(c.timestamp, tuple(c.params[1])) for c in batch] == [(10, (4, 4)), (11, (5, 4))]
+    assert q.coalesced == 1
+
+
+@pytest.mark.parametrize("policy, kept", [(DROP_OLDEST, [7, 8, 9]), (DROP_NEWEST, [0, 1, 2])])
+def test_flood_is_bounded_by_the_drop_policy(policy, kept):
+    # Arrange
+    q = InputQueue(maxsize=3, policy=policy)
+
+    # Act
+    accepted = [q.put(move(t, f"P{t}")) for t in range(10)]
+
+    # Assert
+    assert accepted == [True] * 3 + [False] * 7
+    assert q.dropped == 7
+    assert [c.timestamp for c in q.drain()] == kept
+
+
+def test_concurrent_producers_never_exceed_the_bound():
+    # Arrange
+    q = InputQueue(maxsize=100)
+
+    def flood(n):
+        for t in range(1000):
+            q.put(move(t, f"P{n}"))
+
+    threads = [threading.Thread(target=flood, args=(n,)) for n in range(4)]
+
+    # Act
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    # Assert
+    assert q.qsize() == 100
+    assert q.dropped == 3900
+
+
+def test_get_nowait_is_queue_compatible():
+    # Arrange
+    q = InputQueue()
+    q.put(move(5))
+
+    # Act / Assert
+    assert q.get_nowait().timestamp == 5
+    with pytest.raises(queue.Empty):
+        q.get_nowait()
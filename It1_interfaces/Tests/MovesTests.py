@@ -0,0 +1,170 @@
+import copy
+import pathlib
+import random
+import pytest
+from Moves import MoveTable, Moves
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def write_moves(path, text):
+    path.write_text(text)
+    return path
+
+
+PAWN = "-1,0:non_capture\n-2,0:1st\n-1,-1:capture\n-1,1:capture\n"
+
+
+def test_targets_are_clipped_to_board(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", "1,0\n0,1\n-1,0\n0,-1\n"), (8, 8))
+
+    # Act
+    corner = moves.get_moves(0, 0)
+    middle = moves.get_moves(4, 4)
+
+    # Assert
+    assert set(corner) == {(1, 0), (0, 1)}
+    assert set(middle) == {(5, 4), (4, 5), (3, 4), (4, 3)}
+    assert moves.get_moves(9, 9) == ()
+
+
+def test_membership_and_mask(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", "2,1\n1,2\n"), (8, 8))
+
+    # Act + Assert
+    assert moves.is_target(0, 0, (2, 1))
+    assert not moves.is_target(0, 0, (1, 1))
+    assert not moves.is_target(-1, 0, (1, 1))
+    assert moves.get_mask(0, 0) == (1 << (2 * 8 + 1)) | (1 << (1 * 8 + 2))
+    assert moves.get_mask(8, 0) == moves.get_mask(-1, 0) == moves.get_mask(0, 8) == 0
+
+
+def test_tags_are_kept_as_separate_masks(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", PAWN), (8, 8))
+
+    # Act + Assert
+    assert set(moves.get_moves(6, 4, "non_capture")) == {(5, 4)}
+    assert set(moves.get_moves(6, 4, "capture")) == {(5, 3), (5, 5)}
+    assert set(moves.get_moves(6, 4, "first")) == {(4, 4)}
+    assert set(moves.get_moves(6, 4)) == {(5, 4), (4, 4), (5, 3), (5, 5)}
+
+
+def test_table_is_shared_per_rule_file_and_board_size(tmp_path):
+    # Arrange
+    path = write_moves(tmp_path / "moves.txt", PAWN)
+
+    # Act
+    a, b = Moves(path, (8, 8)), Moves(str(path), (8, 8))
+    c = Moves(path, (10, 10))
+
+    # Assert
+    assert a.table is b.table
+    assert a.table is not c.table
+    assert copy.deepcopy(a) is a
+
+
+ROOK = "1,0:slide\n-1,0:slide\n0,1:slide\n0,-1:slide\n"
+
+
+def bits(*cells, width=8):
+    mask = 0
+    for r, c in cells:
+        mask |= 1 << (r * width + c)
+    return mask
+
+
+def test_slide_rays_cover_the_whole_line_geometrically(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", ROOK), (10, 10))
+
+    # Act
+    targets = set(moves.get_moves(0, 0))
+
+    # Assert
+    assert targets == {(r, 0) for r in range(1, 10)} | {(0, c) for c in range(1, 10)}
+
+
+def test_slider_stops_at_blockers_and_captures_enemies(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", ROOK), (8, 8))
+    own = bits((7, 0), (7, 3))                  # rook itself + friendly piece on the row
+    enemy = bits((4, 0))
+    occupied = own | enemy
+
+    # Act
+    legal = set(moves.get_legal_moves(7, 0, occupied, own))
+
+    # Assert
+    assert legal == {(6, 0), (5, 0), (4, 0), (7, 1), (7, 2)}
+
+
+def test_pawn_tags_respect_occupancy(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", PAWN), (8, 8))
+    own = bits((6, 4))
+    enemy = bits((5, 5), (5, 4))
+    occupied = own | enemy
+
+    # Act
+    first = set(moves.get_legal_moves(6, 4, occupied, own, first_move=True))
+    later = set(moves.get_legal_moves(6, 4, own, own))
+
+    # Assert – forward is blocked (the double step too), diagonal capture only where an enemy stands
+    assert first == {(5, 5)}
+    assert later == {(5, 4)}
+
+
+def test_first_double_step_needs_the_cell_in_between_empty(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", PAWN), (8, 8))
+    own = bits((6, 0))
+
+    # Act
+    blocked = moves.get_legal_moves(6, 0, own | bits((5, 0)), own, first_move=True)
+    target_taken = moves.get_legal_moves(6, 0, own | bits((4, 0)), own, first_move=True)
+    clear = moves.get_legal_moves(6, 0, own, own, first_move=True)
+
+    # Assert
+    assert blocked == []
+    assert target_taken == [(5, 0)]
+    assert set(clear) == {(5, 0), (4, 0)}
+
+
+def test_tables_of_a_200_by_200_board_keep_sparse_rows(tmp_path):
+    # Arrange
+    moves = Moves(write_moves(tmp_path / "moves.txt", ROOK + PAWN), (200, 200))
+    own = bits((199, 0), width=200)
+    enemy = bits((150, 0), (199, 3), width=200)
+
+    # Act
+    legal = set(moves.get_legal_moves(199, 0, own | enemy, own))
+
+    # Assert – no per-cell tables at this size: one mask per file and per rank, shared by opposite directions
+    assert not moves.table.dense
+    assert [len(masks) for _, _, masks, _ in moves.table.slides] == [200, 200, 200, 200]
+    assert moves.table.slides[0][2] is moves.table.slides[1][2]
+    assert legal == {(r, 0) for r in range(150, 199)} | {(199, 1), (199, 2), (199, 3), (198, 0)}
+    assert moves.is_target(199, 0, (0, 0)) and not moves.is_target(199, 0, (0, 1))
+
+
+@pytest.mark.parametrize("p_type", ["PW", "NW", "BW", "RW", "QW", "KW"])
+def test_derived_tables_match_the_precomputed_ones(p_type, monkeypatch):
+    # Arrange
+    rules = Moves._parse(ROOT / "pieces" / p_type / "moves.txt")
+    dense = MoveTable(rules, (8, 8))
+    monkeypatch.setattr(MoveTable, "DENSE_CELLS", 0)
+    derived = MoveTable(rules, (8, 8))
+    rng = random.Random(p_type)
+
+    # Act / Assert
+    assert dense.dense and not derived.dense
+    for idx in range(64):
+        occupied = rng.getrandbits(64) | 1 << idx
+        own = occupied & rng.getrandbits(64) | 1 << idx
+        for kind in MoveTable.KINDS:
+            assert derived.targets(idx, kind) == dense.targets(idx, kind)
+            assert derived.mask(idx, kind) == dense.mask(idx, kind)
+        assert derived.legal_mask(idx, occupied, own, True) == dense.legal_mask(idx, occupied, own, True)
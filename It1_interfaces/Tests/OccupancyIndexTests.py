@@ -0,0 +1,85 @@
+from OccupancyIndex import OccupancyIndex
+
+
+def test_add_and_query():
+    # Arrange
+    index = OccupancyIndex()
+
+    # Act
+    index.add("PW_6_0", (6, 0))
+    index.add("PB_1_0", (1, 0))
+
+    # Assert
+    assert index.pieces_at((6, 0)) == ["PW_6_0"]
+    assert index.pieces_at((3, 3)) == []
+    assert index.cell_of("PB_1_0") == (1, 0)
+    assert len(index) == 2
+    assert not index.crowded
+
+
+def test_move_into_occupied_cell_marks_it_crowded_in_arrival_order():
+    # Arrange
+    index = OccupancyIndex()
+    index.add("PB_1_0", (1, 0))
+    index.add("RW_7_0", (7, 0))
+
+    # Act
+    index.move("RW_7_0", [1, 0])
+
+    # Assert
+    assert index.pieces_at((1, 0)) == ["PB_1_0", "RW_7_0"]
+    assert index.crowded == {(1, 0)}
+    assert not index.is_occupied((7, 0))
+
+
+def test_remove_clears_crowded_cell():
+    # Arrange
+    index = OccupancyIndex()
+    index.add("PB_1_0", (1, 0))
+    index.add("RW_7_0", (1, 0))
+
+    # Act
+    index.remove("PB_1_0")
+    index.remove("missing")
+
+    # Assert
+    assert index.pieces_at((1, 0)) == ["RW_7_0"]
+    assert not index.crowded
+
+
+def test_pieces_without_cell_are_ignored():
+    # Arrange
+    index = OccupancyIndex()
+
+    # Act
+    index.add("KW", None)
+
+    # Assert
+    assert len(index) == 0
+
+
+def test_bitboards_follow_moves_and_colours():
+    # Arrange
+    index = OccupancyIndex(width=8)
+    index.add("PB_1_0", (1, 0))
+    index.add("RW_7_0", (7, 0))
+
+    # Act
+    index.move("RW_7_0", (1, 0))
+    index.remove("PB_1_0")
+
+    # Assert
+    assert index.bitboard() == 1 << 8
+    assert index.bitboard("W") == 1 << 8
+    assert index.bitboard("B") == 0
+
+
+def test_arrival_order_is_row_major_then_by_arrival():
+    # Arrange
+    index = OccupancyIndex()
+    index.add("RW", (7, 0))
+    index.add("PB", (1, 0))
+    index.add("QW", (1, 0))
+
+    # Act + Assert
+    assert index.arrival_order() == ["PB", "QW", "RW"]
@@ -0,0 +1,109 @@
+import numpy as np
+from Board import Board
+from Renderer import Renderer
+from img import Img
+
+
+class DummyPiece:
+    """Draws a solid cell-sized square at `pos`; `frame` stands in for the animation frame."""
+    def __init__(self, pos, color, frame=0):
+        self.pos = pos
+        self.color = color
+        self.frame = frame
+        self.draw_calls = 0
+
+    def animate(self, now_ms):
+        pass
+
+    def get_render_key(self, now_ms, draw_pos=None):
+        return (self.pos, id(self), self.frame)
+
+    def draw_on_board(self, board, now_ms, draw_pos=None):
+        self.draw_calls += 1
+        x, y = self.pos
+        board.img.img[y:y + 10, x:x + 10] = self.color
+
+
+def create_board():
+    img = Img()
+    img.img = np.zeros((40, 40, 3), dtype=np.uint8)
+    return Board(W_cells=4, H_cells=4, cell_W_pix=10, cell_H_pix=10,
+                 cell_W_m=1, cell_H_m=1, img=img)
+
+
+def test_first_render_draws_every_piece():
+    # Arrange
+    renderer = Renderer(create_board())
+    pieces = {"a": DummyPiece((0, 0), 50), "b": DummyPiece((20, 20), 100)}
+
+    # Act
+    frame = renderer.render(pieces, 0)
+
+    # Assert
+    assert renderer.redrawn_pieces == 2
+    assert np.all(frame.img.img[0:10, 0:10] == 50)
+    assert np.all(frame.img.img[20:30, 20:30] == 100)
+
+
+def test_quiet_board_redraws_nothing():
+    # Arrange
+    renderer = Renderer(create_board())
+    pieces = {"a": DummyPiece((0, 0), 50), "b": DummyPiece((20, 20), 100)}
+    renderer.render(pieces, 0)
+
+    # Act
+    renderer.render(pieces, 16)
+
+    # Assert
+    assert renderer.dirty_rects == 0
+    assert renderer.redrawn_pieces == 0
+    assert pieces["a"].draw_calls == 1
+
+
+def test_moving_piece_repaints_old_and_new_cell_only():
+    # Arrange
+    board = create_board()
+    renderer = Renderer(board)
+    pieces = {"a": DummyPiece((0, 0), 50), "b": DummyPiece((30, 30), 100)}
+    renderer.render(pieces, 0)
+
+    # Act
+    pieces["a"].pos = (10, 0)
+    frame = renderer.render(pieces, 16)
+
+    # Assert
+    assert renderer.dirty_rects == 2
+    assert renderer.redrawn_pieces == 1
+    assert np.all(frame.img.img[0:10, 0:10] == 0)      # background restored
+    assert np.all(frame.img.img[0:10, 10:20] == 50)
+    assert np.all(board.img.img == 0)                   # pristine background untouched
+
+
+def test_captured_piece_is_erased():
+    # Arrange
+    renderer = Renderer(create_board())
+    pieces = {"a": DummyPiece((0, 0), 50), "b": DummyPiece((20, 20), 100)}
+    renderer.render(pieces, 0)
+
+    # Act
+    del pieces["b"]
+    frame = renderer.render(pieces, 16)
+
+    # Assert
+    assert np.all(frame.img.img[20:30, 20:30] == 0)
+    assert renderer.redrawn_pieces == 0
+
+
+def test_overlapping_neighbour_is_recomposited():
+    # Arrange
+    renderer = Renderer(create_board())
+    pieces = {"a": DummyPiece((0, 0), 50), "b": DummyPiece((5, 0), 100)}
+    renderer.render(pieces, 0)
+
+    # Act
+    pieces["a"].frame = 1
+    frame = renderer.render(pieces, 16)
+
+    # Assert – "b" is drawn after "a", so it must stay on top
+    assert np.all(frame.img.img[0:10, 5:15] == 100)
+    assert renderer.redrawn_pieces == 2
@@ -0,0 +1,111 @@
+import pathlib
+import pytest
+from Command import Command
+from HeadlessRunner import headless_game, load_pieces
+from Rollback import RollbackSession
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def new_session(factory, **kwargs):
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    return RollbackSession(game, **kwargs)
+
+
+def run_until(session, until_ms, peer_lag_ms=None):
+    """Advance to `until_ms`; with a lag, the peer confirms its input `peer_lag_ms` behind."""
+    while session.game.now_ms < until_ms:
+        if peer_lag_ms is not None:
+            session.confirm(session.game.now_ms - peer_lag_ms)
+        assert session.advance()
+
+
+WHITE = [Command(0, "PW_6_4", "Move", [(6, 4), (4, 4)]), Command(1500, "QW_7_4", "Move", [(7, 4), (5, 6)])]
+BLACK = [Command(40, "PB_1_3", "Move", [(1, 3), (3, 3)]), Command(1200, "PB_1_4", "Move", [(1, 4), (3, 4)])]
+
+
+def test_late_remote_commands_end_in_the_same_state_as_on_time_ones(factory):
+    # Arrange
+    on_time = new_session(factory, max_rollback_ticks=64)
+    late = new_session(factory, max_rollback_ticks=64)
+    for session in (on_time, late):
+        for cmd in WHITE:
+            session.add_local(cmd)
+    for cmd in BLACK:
+        on_time.add_remote(cmd)
+
+    # Act
+    run_until(on_time, 4000, peer_lag_ms=0)
+    run_until(late, 300, peer_lag_ms=300)
+    late.add_remote(BLACK[0])                        # 26 ticks late
+    run_until(late, 1500, peer_lag_ms=300)
+    late.add_remote(BLACK[1])                        # 30 ticks late
+    run_until(late, 4000, peer_lag_ms=300)
+
+    # Assert
+    assert late.rollbacks == 2 and late.max_depth == 30
+    assert late.game.snapshot() == on_time.game.snapshot()
+
+
+def test_wrong_prediction_is_rolled_back_on_confirm(factory):
+    # Arrange
+    guess = Command(0, "PB_1_3", "Move", [(1, 3), (3, 3)])
+    predicted = new_session(factory, predictor=lambda game, now: [guess] if now == 0 else [])
+    plain = new_session(factory)
+
+    # Act
+    run_until(predicted, 100)
+    moved_on_guess = predicted.game.pieces["PB_1_3"].get_state_name()
+    predicted.confirm(100)
+    run_until(plain, 100)
+
+    # Assert
+    assert moved_on_guess == "move"
+    assert predicted.rollbacks == 1
+    assert predicted.game.snapshot() == plain.game.snapshot()
+
+
+def test_session_waits_for_a_peer_that_stopped_confirming(factory):
+    # Arrange
+    session = new_session(factory, max_rollback_ticks=8)
+
+    # Act
+    steps = sum(session.advance() for _ in range(20))
+    session.confirm(50)
+    resumed = session.advance()
+
+    # Assert
+    assert steps == 8
+    assert resumed
+
+
+def test_remote_command_before_the_confirmed_time_is_rejected(factory):
+    # Arrange
+    session = new_session(factory)
+    run_until(session, 100)
+    session.confirm(100)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        session.add_remote(Command(50, "PB_1_3", "Move", [(1, 3), (3, 3)]))
+    with pytest.raises(ValueError):
+        session.add_local(Command(100.5, "PW_6_4", "Move", [(6, 4), (4, 4)]))
+
+
+def test_right_prediction_is_not_rolled_back(factory):
+    # Arrange
+    guess = Command(0, "PB_1_3", "Move", [(1, 3), (3, 3)])
+    predicted = new_session(factory, predictor=lambda game, now: [guess] if now == 0 else [])
+    on_time = new_session(factory)
+    on_time.add_remote(Command(0, "PB_1_3", "Move", [(1, 3), (3, 3)]))
+
+    # Act
+    run_until(predicted, 100)
+    predicted.add_remote(Command(0, "PB_1_3", "Move", [(1, 3), (3, 3)]))
+    predicted.confirm(100)
+    run_until(predicted, 200)
+    run_until(on_time, 200)
+
+    # Assert
+    assert predicted.rollbacks == 0
+    assert predicted.game.snapshot() == on_time.game.snapshot()
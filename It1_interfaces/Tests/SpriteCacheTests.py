@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+import pytest
+from SpriteCache import SpriteCache
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    SpriteCache.clear()
+    yield
+    SpriteCache.clear()
+
+
+def write_png(path, shape=(20, 20, 3)):
+    cv2.imwrite(str(path), np.full(shape, 200, dtype=np.uint8))
+    return path
+
+
+def test_same_key_is_decoded_once(tmp_path):
+    # Arrange
+    png = write_png(tmp_path / "1.png")
+
+    # Act
+    first = SpriteCache.get(png, (10, 10))
+    second = SpriteCache.get(str(png), (10, 10))
+
+    # Assert
+    assert first is second
+    assert first.img.shape == (10, 10, 3)
+    assert SpriteCache.stats() == {"hits": 1, "misses": 1, "sprites": 1}
+
+
+def test_size_and_interpolation_are_part_of_the_key(tmp_path):
+    # Arrange
+    png = write_png(tmp_path / "1.png")
+
+    # Act
+    a = SpriteCache.get(png, (10, 10))
+    b = SpriteCache.get(png, (12, 12))
+    c = SpriteCache.get(png, (10, 10), cv2.INTER_LINEAR)
+
+    # Assert
+    assert a is not b and a is not c
+    assert SpriteCache.stats()["misses"] == 3
+
+
+def test_cached_pixels_are_read_only(tmp_path):
+    # Arrange
+    sprite = SpriteCache.get(write_png(tmp_path / "1.png"), (10, 10))
+
+    # Act + Assert
+    with pytest.raises(ValueError):
+        sprite.img[0, 0] = 0
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SpriteCache.get(tmp_path / "missing.png", (10, 10))
+
+
+def test_preload_decodes_each_file_once_on_the_pool(tmp_path):
+    # Arrange
+    pngs = [write_png(tmp_path / f"{i}.png") for i in range(8)]
+
+    # Act
+    loaded = SpriteCache.preload(pngs + [tmp_path / "missing.png"], (10, 10), workers=4)
+    sprites = [SpriteCache.get(png, (10, 10)) for png in pngs]
+
+    # Assert
+    assert loaded == 8
+    assert SpriteCache.stats() == {"hits": 8, "misses": 9, "sprites": 8}
+    assert all(s.img.shape == (10, 10, 3) for s in sprites)
@@ -0,0 +1,85 @@
+import pathlib
+from BatchSimulator import RandomPlayer
+from HeadlessRunner import headless_game, load_pieces, run_headless
+from StateArrays import StateArrays, NONE, CUR_R, CUR_C, START_MS
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def new_game(factory, seed=3, until_ms=4000):
+    game = headless_game(load_pieces(factory, ROOT / "pieces" / "board.csv"), factory.board)
+    run_headless(game, [], max_ms=until_ms, controller=RandomPlayer(seed))
+    return game
+
+
+def advance(game, player, until_ms, tick_ms=10, think_every_ms=500):
+    """Continue a started game tick by tick, asking `player` for moves every think_every_ms."""
+    for now in range(game.now_ms + tick_ms, until_ms + 1, tick_ms):
+        if now % think_every_ms == 0:
+            for cmd in player(game, now):
+                game.user_input_queue.put(cmd)
+        game._tick(now)
+
+
+def test_bound_piece_keeps_physics_in_its_row(factory):
+    # Arrange
+    piece = factory.clone_piece("PW")
+    piece.set_current_cell((6, 2), 0)
+    soa = StateArrays()
+
+    # Act
+    row = soa.add(piece)
+
+    # Assert
+    physics = piece._state.get_physics()
+    assert tuple(soa.data[row, [CUR_R, CUR_C]]) == (6, 2)
+    assert soa.data[row, START_MS] == NONE
+    soa.data[row, CUR_C] = 3
+    assert physics.current_cell == (6, 3)
+
+
+def test_clone_of_bound_piece_gets_its_own_state(factory):
+    # Arrange
+    piece = factory.clone_piece("PW")
+    piece.set_current_cell((6, 2), 0)
+    StateArrays().add(piece)
+
+    # Act
+    copy = piece.clone()
+    copy.set_current_cell((5, 5), 0)
+
+    # Assert
+    assert piece.get_current_cell() == (6, 2)
+    assert copy.get_current_cell() == (5, 5)
+
+
+def test_load_state_restores_the_saved_position(factory):
+    # Arrange
+    game = new_game(factory)
+    expected = game.snapshot()
+    snap = game.save_state()
+    advance(game, RandomPlayer(11), 12000)
+    assert game.snapshot() != expected
+
+    # Act
+    game.load_state(snap)
+
+    # Assert
+    assert game.snapshot() == expected
+    assert game.occupancy.bitboard() == new_game(factory).occupancy.bitboard()
+
+
+def test_play_after_restore_is_identical(factory):
+    # Arrange
+    game = new_game(factory)
+    snap = game.save_state()
+    advance(game, RandomPlayer(11), 15000)
+    first = (game.snapshot(), list(game.capture_log), game.tracker.game_over)
+
+    # Act
+    game.load_state(snap)
+    advance(game, RandomPlayer(11), 15000)
+
+    # Assert
+    assert first[1], "expected some captures in the continuation"
+    assert (game.snapshot(), list(game.capture_log), game.tracker.game_over) == first
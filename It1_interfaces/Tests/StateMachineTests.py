@@ -0,0 +1,101 @@
+import tracemalloc
+from Command import Command
+from StateMachine import NO_STATE
+
+
+def test_table_follows_the_state_configs(factory):
+    # Arrange
+    machine = factory.clone_piece("PW")._machine
+    ids = machine.state_ids
+
+    # Act / Assert
+    assert machine.names == ("idle", "jump", "long_rest", "move", "short_rest")
+    assert machine.next_state(ids["idle"], "Move") == ids["move"]
+    assert machine.next_state(ids["idle"], "idle") == NO_STATE            # no self transitions
+    assert machine.next_state(ids["idle"], "castle") == NO_STATE
+    assert machine.finished[ids["move"]] == ids["long_rest"]            # next_state_when_finished
+    assert machine.finished[ids["long_rest"]] == ids["idle"]
+
+
+def test_pieces_of_a_type_share_the_machine(factory):
+    # Act
+    a, b = factory.clone_piece("QW"), factory.clone_piece("QW")
+
+    # Assert
+    assert a._machine is b._machine
+    assert a.get_state("move") is b.get_state("move")
+    assert a._machine is not factory.clone_piece("QB")._machine
+
+
+def test_shared_states_keep_each_piece_motion_apart(factory):
+    # Arrange
+    a, b = factory.clone_piece("RW"), factory.clone_piece("RW")
+    a.piece_id, b.piece_id = "RW_7_0", "RW_7_7"
+    a.set_current_cell((7, 0), 0)
+    b.set_current_cell((7, 7), 0)
+
+    # Act
+    a.on_command(Command(0, "RW_7_0", "Move", [(7, 0), (4, 0)]), 0)
+    b.on_command(Command(100, "RW_7_7", "Move", [(7, 7), (7, 5)]), 100)
+    deadline_a, deadline_b = a.next_deadline(), b.next_deadline()
+    done = a.update(deadline_a)
+
+    # Assert
+    assert deadline_a != deadline_b
+    assert done.piece_id == "RW_7_0" and done.type == "long_rest"
+    assert a.get_current_cell() == (4, 0) and a.get_state_name() == "long_rest"
+    assert b.get_current_cell() == (7, 7) and b.get_state_name() == "move"
+
+
+def test_a_piece_costs_a_few_hundred_bytes(factory):
+    # Arrange
+    factory.clone_piece("NW")
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    # Act
+    pieces = [factory.clone_piece("NW") for _ in range(200)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Assert
+    per_piece = sum(stat.size_diff for stat in after.compare_to(before, "filename")) / len(pieces)
+    assert per_piece < 1024
+
+
+def test_reading_a_piece_state_does_not_repoint_the_shared_objects(factory):
+    # Arrange
+    a, b = factory.clone_piece("RW"), factory.clone_piece("RW")
+    a.set_current_cell((7, 0), 0)
+    b.set_current_cell((7, 7), 0)
+    shared = a.get_state("idle").get_physics()
+
+    # Act
+    held = a._state.get_physics()
+    other = b._state.get_physics()
+
+    # Assert
+    assert held.current_cell == (7, 0) and other.current_cell == (7, 7)
+    assert "_soa_row" not in shared.__dict__
+    assert a._state.get_physics() is held                  # the view is kept while the state is current
+
+
+def test_reading_the_render_key_leaves_the_animation_alone(factory):
+    # Arrange
+    pawn = factory.clone_piece("PW")
+    pawn.piece_id = "PW_6_4"
+    pawn.set_current_cell((6, 4), 0)
+    pawn.on_command(Command(0, "PW_6_4", "Move", [(6, 4), (5, 4)]), 0)
+    before = pawn.snapshot()
+
+    # Act
+    keys = pawn.get_render_key(250), pawn.get_render_key(250)
+    sprite = pawn.get_sprite(250)
+    after = pawn.snapshot()
+    pawn.animate(250)
+
+    # Assert
+    assert after == before
+    assert keys[0] == keys[1] and keys[0][2] == 0
+    assert sprite is pawn.get_state("move").get_graphics().sprites[0]
+    assert pawn.get_render_key(250)[2] == 3                # 250 ms at 12 frames per second
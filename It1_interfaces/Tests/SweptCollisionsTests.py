@@ -0,0 +1,74 @@
+from Command import Command
+from HeadlessRunner import headless_game, run_headless
+from SweptCollisions import SpatialHash
+
+
+KINGS = {(7, 7): "KW", (0, 7): "KB"}
+# the queen sweeps row 4 while the rook sweeps column 2 – they meet over (4, 2) halfway
+CROSSING = [Command(0, "QW_4_0", "Move", [(4, 0), (4, 4)]), Command(0, "RB_2_2", "Move", [(2, 2), (6, 2)])]
+
+
+def test_enemy_pieces_crossing_mid_flight_collide(factory, place):
+    # Arrange
+    game = headless_game(place({(4, 0): "QW", (2, 2): "RB", **KINGS}), factory.board)
+    arrival = game.pieces["QW_4_0"].get_state("move").get_physics().duration_for((4, 0), (4, 4))
+
+    # Act
+    result = run_headless(game, CROSSING, max_ms=10_000)
+
+    # Assert
+    assert [pid for _, pid in result.captures] == ["QW_4_0"]          # the later command attacks
+    assert 0 < result.captures[0][0] < arrival
+    assert result.pieces["RB_2_2"][0] == (6, 2)
+
+
+def test_same_side_pieces_pass_each_other(factory, place):
+    # Arrange
+    game = headless_game(place({(4, 0): "QW", (2, 2): "RW", **KINGS}), factory.board)
+
+    # Act
+    result = run_headless(game, [CROSSING[0], Command(0, "RW_2_2", "Move", [(2, 2), (6, 2)])], max_ms=10_000)
+
+    # Assert
+    assert result.captures == []
+    assert result.pieces["QW_4_0"][0] == (4, 4) and result.pieces["RW_2_2"][0] == (6, 2)
+
+
+def test_pieces_on_neighbouring_lines_do_not_touch(factory, place):
+    # Arrange
+    game = headless_game(place({(4, 0): "RW", (3, 4): "RB", **KINGS}), factory.board)
+
+    # Act
+    result = run_headless(game, [Command(0, "RW_4_0", "Move", [(4, 0), (4, 4)]),
+                                 Command(0, "RB_3_4", "Move", [(3, 4), (3, 0)])], max_ms=10_000)
+
+    # Assert
+    assert result.captures == []
+
+
+def test_skipping_idle_ticks_finds_the_same_contact(factory, place):
+    # Arrange
+    layout = {(4, 0): "QW", (2, 2): "RB", **KINGS}
+
+    # Act
+    full = run_headless(headless_game(place(layout), factory.board), CROSSING, max_ms=10_000, skip_idle=False)
+    skipped = run_headless(headless_game(place(layout), factory.board), CROSSING, max_ms=10_000)
+
+    # Assert
+    assert skipped.ticks < full.ticks
+    assert skipped.captures == full.captures
+    assert skipped.pieces == full.pieces
+
+
+def test_spatial_hash_pairs_only_boxes_sharing_a_cell():
+    # Arrange
+    grid = SpatialHash(100, 100)
+    grid.insert("a", 10, 10, 150, 20)         # cells (0, 0), (0, 1)
+    grid.insert("b", 120, 50, 130, 60)        # cell (0, 1)
+    grid.insert("c", 500, 500, 510, 510)      # far away
+
+    # Act
+    pairs = grid.pairs()
+
+    # Assert
+    assert pairs == {("a", "b")}
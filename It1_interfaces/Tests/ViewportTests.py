@@ -0,0 +1,132 @@
+import pathlib
+import numpy as np
+import pytest
+from Command import Command
+from HeadlessRunner import load_pieces
+from Renderer import Renderer
+from StateArrays import StateArrays
+from Viewport import ViewportRenderer
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def stock_position(factory):
+    pieces = load_pieces(factory, ROOT / "pieces" / "board.csv")
+    state = StateArrays()
+    for piece in pieces:
+        state.add(piece)
+    return {p.piece_id: p for p in pieces}, state
+
+
+def test_whole_board_at_zoom_one_matches_the_full_renderer(factory):
+    # Arrange
+    pieces, state = stock_position(factory)
+    pieces["PW_6_4"].on_command(Command(0, "PW_6_4", "Move", [(6, 4), (4, 4)]), 0)
+    board = factory.board
+    world = (board.W_cells * board.cell_W_pix, board.H_cells * board.cell_H_pix)
+    view = ViewportRenderer(board, world)
+
+    # Act
+    expected = Renderer(board).render(pieces, 300, state).img.img[:world[1], :world[0]]
+    frame = view.render(pieces, 300, state).img.img
+
+    # Assert
+    assert np.array_equal(frame, expected)
+    assert view.visible_pieces == len(pieces)
+
+
+def test_off_screen_pieces_are_culled(factory):
+    # Arrange
+    pieces, state = stock_position(factory)
+    board = factory.board
+    view = ViewportRenderer(board, (2 * board.cell_W_pix, 2 * board.cell_H_pix))
+
+    # Act
+    view.look_at((7, 0))
+    view.render(pieces, 0, state)
+    from_state = view.visible_pieces
+    view.render(pieces, 0)
+
+    # Assert
+    assert view.visible_cells() == (6, 0, 7, 1)
+    assert from_state == view.visible_pieces == 4          # PW_6_0, PW_6_1, RW_7_0, NW_7_1
+
+
+def test_camera_stays_on_the_board_and_maps_clicks(factory):
+    # Arrange
+    board = factory.board
+    view = ViewportRenderer(board, (200, 100))
+
+    # Act
+    view.move_to(-50, 10_000)
+    bottom_left = (view.x, view.y)
+    view.set_zoom(2.0, anchor=(0, 0))
+
+    # Assert
+    assert bottom_left == (0, board.H_cells * board.cell_H_pix - 100)
+    assert view.screen_to_world(100, 50) == (50, int(bottom_left[1]) + 25)
+
+
+@pytest.mark.parametrize("zoom, level", [(2.0, 0), (1.0, 0), (0.6, 0), (0.5, 1), (0.3, 1), (0.25, 2), (0.1, 3)])
+def test_background_level_follows_the_zoom(factory, zoom, level):
+    assert ViewportRenderer(factory.board, (100, 100)).level_for(zoom) == level
+
+
+def test_zoomed_out_frame_is_cut_from_a_downscaled_level(factory):
+    # Arrange
+    pieces, state = stock_position(factory)
+    board = factory.board
+    view = ViewportRenderer(board, (300, 300), zoom=0.25)
+
+    # Act
+    frame = view.render(pieces, 0, state).img.img
+
+    # Assert
+    assert len(view._levels) == 3
+    assert view.visible_pieces == len(pieces)
+    assert frame.shape[:2] == (300, 300)
+    assert frame[:200, :200].any(axis=-1).all()          # the board fills the top-left corner
+    assert not frame[210:, 210:].any()                   # the window beyond the board stays blank
+
+
+def test_sprites_cut_by_the_window_edge_are_clipped(factory):
+    # Arrange
+    pieces, state = stock_position(factory)
+    board = factory.board
+    view = ViewportRenderer(board, (board.cell_W_pix * 3 // 2, board.cell_H_pix * 3 // 2))
+
+    # Act
+    view.move_to(board.cell_W_pix // 2, 6 * board.cell_H_pix + board.cell_H_pix // 2)
+    view.render(pieces, 0, state)
+
+    # Assert
+    assert view.visible_pieces == 4
+
+
+@pytest.mark.parametrize("zoom", [0, -1.0, float("nan")])
+def test_non_positive_zoom_is_rejected(factory, zoom):
+    # Arrange
+    view = ViewportRenderer(factory.board, (100, 100))
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        view.set_zoom(zoom)
+    with pytest.raises(ValueError):
+        ViewportRenderer(factory.board, (100, 100), zoom=zoom)
+    assert view.zoom == 1.0
+
+
+def test_zoom_is_clamped_to_its_range(factory):
+    # Arrange
+    view = ViewportRenderer(factory.board, (100, 100))
+
+    # Act
+    view.set_zoom(1e-9)
+    smallest = view.zoom
+    frame = view.render({}, 0).img.img
+    view.set_zoom(1e9)
+
+    # Assert
+    assert smallest == ViewportRenderer.MIN_ZOOM
+    assert frame.shape[:2] == (100, 100)
+    assert view.zoom == ViewportRenderer.MAX_ZOOM
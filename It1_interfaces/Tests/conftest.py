@@ -0,0 +1,29 @@
+import pathlib
+import pytest
+from Board import Board
+from PieceFactory import PieceFactory
+from img import Img
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture(scope="module")
+def factory():
+    """PieceFactory over the stock board and pieces/ tree, one per test module."""
+    board, _ = Board.read_board_and_pieces(str(ROOT / "pieces" / "board.csv"),
+                                           Img().read(ROOT / "board.png"), (1.0, 1.0))
+    return PieceFactory(board, ROOT / "pieces")
+
+
+@pytest.fixture(scope="module")
+def place(factory):
+    """place({(row, col): piece type}) -> pieces standing on those cells, with ids like "PW_6_0"."""
+    def place(layout):
+        pieces = []
+        for (row, col), p_type in layout.items():
+            piece = factory.clone_piece(p_type)
+            piece.piece_id = f"{p_type}_{row}_{col}"
+            piece.set_current_cell((row, col), 0)
+            pieces.append(piece)
+        return pieces
+    return place
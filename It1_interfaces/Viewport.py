@@ -0,0 +1,188 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from BatchPhysics import BatchPhysics
+from Board import Board
+from Piece import Piece
+from StateArrays import StateArrays
+from img import Img
+
+
+class ViewportRenderer:
+    """
+    Renderer for boards larger than the window: draws only what a camera sees.
+
+    The camera is the world-pixel position of the window's top-left corner
+    plus a zoom factor.  Each frame is composited from scratch at window
+    size: the visible part of the background is cut from a cached
+    downscaled level (each level half the previous one, built on first use)
+    and resized once, and pieces whose sprite rect misses the visible
+    rectangle are culled before any of their graphics is touched – with the
+    game's StateArrays in one BatchPhysics pass.  The cost follows the
+    window size and the number of visible pieces, not the board size.
+    Drop-in for Renderer: Game shows `render(...)` and maps mouse clicks
+    back through `screen_to_world`.
+    """
+
+    MIN_ZOOM = 1 / 64                                # a 64x-halved background is already a handful of pixels
+    MAX_ZOOM = 16.0
+
+    def __init__(self, board: Board, view_size: Tuple[int, int], zoom: float = 1.0):
+        self.board = board
+        self.view_w, self.view_h = view_size
+        self.x = 0.0                                 # world px at the window's top-left corner
+        self.y = 0.0
+        self.zoom = 1.0
+        self.physics = BatchPhysics(board)
+        self._levels: List[np.ndarray] = [board.img.img]          # background, halved per level
+        self._scaled: Dict[int, Tuple[Img, Img]] = {}            # id(sprite) -> (sprite, resized copy)
+        self._scaled_size: Optional[Tuple[int, int]] = None
+        self.frame = Board(W_cells=board.W_cells, H_cells=board.H_cells,
+                           cell_W_pix=board.cell_W_pix, cell_H_pix=board.cell_H_pix,
+                           cell_W_m=board.cell_W_m, cell_H_m=board.cell_H_m, img=Img())
+        self.frame.img.img = np.zeros((self.view_h, self.view_w) + board.img.img.shape[2:], dtype=board.img.img.dtype)
+        self.visible_pieces = 0                      # stats of the last render()
+        self.set_zoom(zoom)
+
+    # ─── camera ─────────────────────────────────────────────────────────────
+    @property
+    def world_size(self) -> Tuple[int, int]:
+        return self.board.W_cells * self.board.cell_W_pix, self.board.H_cells * self.board.cell_H_pix
+
+    def pan(self, dx: float, dy: float):
+        """Move the camera by (dx, dy) window pixels."""
+        self.move_to(self.x + dx / self.zoom, self.y + dy / self.zoom)
+
+    def move_to(self, x: float, y: float):
+        """Put the window's top-left corner at world pixel (x, y), kept on the board."""
+        world_w, world_h = self.world_size
+        self.x = min(max(x, 0.0), max(world_w - self.view_w / self.zoom, 0.0))
+        self.y = min(max(y, 0.0), max(world_h - self.view_h / self.zoom, 0.0))
+
+    def look_at(self, cell: Tuple[int, int]):
+        """Centre the window on `cell`."""
+        cx, cy = self.board.cell_to_px(cell)
+        self.move_to(cx + self.board.cell_W_pix / 2 - self.view_w / self.zoom / 2,
+                     cy + self.board.cell_H_pix / 2 - self.view_h / self.zoom / 2)
+
+    def set_zoom(self, zoom: float, anchor: Optional[Tuple[int, int]] = None):
+        """
+        Change the zoom keeping the world point under window pixel `anchor` (default: the centre) in place.
+        `zoom` must be positive; it is clamped to [MIN_ZOOM, MAX_ZOOM].
+        """
+        if not zoom > 0:
+            raise ValueError(f"zoom must be positive, got {zoom!r}")
+        zoom = min(max(zoom, self.MIN_ZOOM), self.MAX_ZOOM)
+        ax, ay = anchor if anchor is not None else (self.view_w / 2, self.view_h / 2)
+        wx, wy = self.x + ax / self.zoom, self.y + ay / self.zoom
+        self.zoom = zoom
+        self.move_to(wx - ax / zoom, wy - ay / zoom)
+
+    def screen_to_world(self, sx: int, sy: int) -> Tuple[int, int]:
+        """World pixel under window pixel (sx, sy)."""
+        return int(self.x + sx / self.zoom), int(self.y + sy / self.zoom)
+
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """(first row, first col, last row, last col) of the cells at least partly in the window."""
+        x1, y1 = self.screen_to_world(self.view_w - 1, self.view_h - 1)
+        return (int(self.y) // self.board.cell_H_pix, int(self.x) // self.board.cell_W_pix,
+                min(y1 // self.board.cell_H_pix, self.board.H_cells - 1),
+                min(x1 // self.board.cell_W_pix, self.board.W_cells - 1))
+
+    def level_for(self, zoom: float) -> int:
+        """Background level to cut from: the smallest one still at least as detailed as `zoom`."""
+        return max(0, int(math.floor(math.log2(1 / zoom) + 1e-9))) if zoom < 1 else 0
+
+    # ─── rendering ──────────────────────────────────────────────────────────
+    def invalidate(self):
+        """Drop the resized sprites and background levels (e.g. after an asset reload)."""
+        self._levels = [self.board.img.img]
+        self._scaled = {}
+
+    def render(self, pieces: Dict[str, Piece], now_ms: int, state: Optional[StateArrays] = None) -> Board:
+        """Composite the window at `now_ms` and return it."""
+        self._draw_background()
+        cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+        x1, y1 = self.x + self.view_w / self.zoom, self.y + self.view_h / self.zoom
+
+        if state is not None:
+            # rows are in the order pieces joined the game – the same z-order as iterating `pieces`
+            kin = self.physics.compute(state, now_ms)
+            seen = (kin.x + cw > self.x) & (kin.x < x1) & (kin.y + ch > self.y) & (kin.y < y1)
+            visible = [(state.pieces[row], x, y) for row, x, y in
+                       zip(kin.rows[seen].tolist(), kin.x[seen].tolist(), kin.y[seen].tolist())]
+        else:
+            visible = []
+            for piece in pieces.values():
+                x, y = piece.get_render_key(now_ms)[0]
+                if x + cw > self.x and x < x1 and y + ch > self.y and y < y1:
+                    visible.append((piece, x, y))
+
+        size = (max(1, round(cw * self.zoom)), max(1, round(ch * self.zoom)))
+        if size != self._scaled_size:
+            self._scaled, self._scaled_size = {}, size
+        for piece, x, y in visible:
+            piece.animate(now_ms)                    # off-screen animations catch up once they are seen
+            sprite = self._sized(piece.get_sprite(now_ms), size)
+            self._blit(sprite, round((x - self.x) * self.zoom), round((y - self.y) * self.zoom))
+        self.visible_pieces = len(visible)
+        return self.frame
+
+    def _level(self, k: int) -> np.ndarray:
+        while len(self._levels) <= k:
+            prev = self._levels[-1]
+            h, w = prev.shape[:2]
+            self._levels.append(cv2.resize(prev, (max(1, w // 2), max(1, h // 2)), interpolation=cv2.INTER_AREA))
+        return self._levels[k]
+
+    def _draw_background(self):
+        """Cut the visible world rectangle from the right level and scale it into the frame."""
+        out = self.frame.img.img
+        out[...] = 0
+        world_w, world_h = self.world_size
+        # part of the window covered by the board (all of it unless the board is smaller than the window)
+        w = min(self.view_w, int((world_w - self.x) * self.zoom))
+        h = min(self.view_h, int((world_h - self.y) * self.zoom))
+        if w <= 0 or h <= 0:
+            return
+        k = self.level_for(self.zoom)
+        level = self._level(k)
+        f = 1 / 2 ** k
+        x0, y0 = int(self.x * f), int(self.y * f)
+        x1 = min(level.shape[1], max(x0 + 1, math.ceil((self.x + w / self.zoom) * f)))
+        y1 = min(level.shape[0], max(y0 + 1, math.ceil((self.y + h / self.zoom) * f)))
+        crop = level[y0:y1, x0:x1]
+        if crop.shape[:2] == (h, w):
+            out[:h, :w] = crop
+        else:
+            shrink = crop.shape[1] > w
+            out[:h, :w] = cv2.resize(crop, (w, h), interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR)
+
+    def _sized(self, sprite: Img, size: Tuple[int, int]) -> Img:
+        """`sprite` at `size` – resized once per zoom level and kept."""
+        if sprite.img.shape[1::-1] == size:
+            return sprite
+        entry = self._scaled.get(id(sprite))
+        if entry is None or entry[0] is not sprite:
+            scaled = Img()
+            interpolation = cv2.INTER_AREA if size[0] < sprite.img.shape[1] else cv2.INTER_LINEAR
+            scaled.img = cv2.resize(sprite.img, size, interpolation=interpolation)
+            entry = self._scaled[id(sprite)] = (sprite, scaled.freeze())
+        return entry[1]
+
+    def _blit(self, sprite: Img, sx: int, sy: int):
+        """Draw `sprite` with its top-left at window pixel (sx, sy), clipped to the window."""
+        h, w = sprite.img.shape[:2]
+        if 0 <= sx and 0 <= sy and sx + w <= self.view_w and sy + h <= self.view_h:
+            sprite.draw_on(self.frame.img, sx, sy)
+            return
+        cx0, cy0 = max(0, -sx), max(0, -sy)
+        cx1, cy1 = min(w, self.view_w - sx), min(h, self.view_h - sy)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        part = Img()
+        part.img = sprite.img[cy0:cy1, cx0:cx1]
+        part.draw_on(self.frame.img, sx + cx0, sy + cy0)
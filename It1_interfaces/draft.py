@@ -12,6 +12,7 @@
 #design patterns:
 # Factory, Command, Tempalte, State Machine
 
+import pathlib
 import time
 from Board import Board
 from PieceFactory import PieceFactory
@@ -19,16 +20,18 @@ from State import State
 from Moves import Moves
 from Piece import Piece
 from Game import Game
+from AssetWatcher import AssetWatcher
 from img import Img
 
 
-def create_game(board_path, root_folder):
+def create_game(board_path, root_folder, hot_reload=False):
     pieces_templates = {} # { piece_id : piece }
     game_pieces = []
 
     background =r"C:\Users\m0583\Desktop\bc\CTD25\board.png"
-    board,p = Board.read_board_and_pieces(board_path,Img().read(background) , [0,0])
-    factory = PieceFactory(board, root_folder)
+    board,p = Board.read_board_and_pieces(board_path,Img().read(background) , [1.0,1.0])
+    # sprites / configs / moves come from one memory-mapped bundle, rebuilt when pieces/ changes
+    factory = PieceFactory(board, root_folder, bundle_path=pathlib.Path(root_folder) / "assets.ctdbundle")
     # print("Board loaded with dimensions:", board.W_cells, "x", board.H_cells)
     # print("Found pieces:", len(p), "at locations:", p)
     for piece_id, location in p:
@@ -38,6 +41,7 @@ def create_game(board_path, root_folder):
         p = pieces_templates[piece_id].clone()
         
         row, col = location
+        p.piece_id = f"{piece_id}_{row}_{col}"  # unique id; [0] = type, [1] = colour
         if not (0 <= row < board.H_cells and 0 <= col < board.W_cells):
             print(f"Warning: piece {piece_id} has invalid location {location} "
                 f"for board size {board.H_cells}x{board.W_cells}")
@@ -52,6 +56,11 @@ def create_game(board_path, root_folder):
 
 
     game = Game(game_pieces, board)
+    if hot_reload:
+        # edits under pieces/ are picked up while the game runs (polling, swapped between ticks)
+        watcher = AssetWatcher(factory)
+        watcher.attach(game)
+        watcher.start()
     
     game._draw()
     game._show()
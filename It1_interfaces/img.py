@@ -8,6 +8,8 @@ import numpy as np
 class Img:
     def __init__(self):
         self.img = None
+        # (source array, channels, opaque pixels, premultiplied colour, inverse alpha)
+        self._blend = None
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -53,16 +55,69 @@ class Img:
 
         return self
 
+    def to_channels(self, channels: int) -> "Img":
+        """Return this image with `channels` channels (3 = BGR, 4 = BGRA); self if it already matches."""
+        if self.img is None:
+            raise ValueError("Image not loaded.")
+        if self.img.shape[2] == channels:
+            return self
+        code = cv2.COLOR_BGR2BGRA if channels == 4 else cv2.COLOR_BGRA2BGR
+        converted = Img()
+        converted.img = cv2.cvtColor(self.img, code)
+        return converted
+
+    def freeze(self, precompute: bool = True) -> "Img":
+        """
+        Mark the pixels read-only and precompute the blend mask for their own
+        layout, so the image can be shared and drawn without ever being copied.
+        precompute=False leaves the mask to the first `draw_on` (pixels that
+        live in shared memory stay the only copy until a frame is drawn).
+        """
+        if self.img is None:
+            raise ValueError("Image not loaded.")
+        self.img.flags.writeable = False
+        if precompute:
+            self._blend_mask(self.img.shape[2])
+        return self
+
+    def _blend_mask(self, channels: int):
+        """
+        Return ``(opaque, premul, inv_alpha)`` for drawing onto a `channels` image.
+
+        Computed once per pixel array and target layout, then reused by every
+        `draw_on` call.  Sprites without transparency get ``opaque`` – the
+        pixels already converted to the target layout – and are copied as is.
+        Otherwise ``premul`` holds colour * alpha and ``inv_alpha`` holds
+        255 - alpha, both uint16 and laid out like the target so the blend is
+        a single vectorized pass (alpha slot: inv 255 / premul 0 keeps the
+        background alpha unchanged).
+        """
+        blend = getattr(self, "_blend", None)
+        if blend is not None and blend[0] is self.img and blend[1] == channels:
+            return blend[2:]
+
+        src = self.img
+        opaque = premul = inv_alpha = None
+        if src.shape[2] == 4 and src[..., 3].min() < 255:
+            alpha = src[..., 3:4].astype(np.uint16)
+            premul = np.zeros(src.shape[:2] + (channels,), dtype=np.uint16)
+            inv_alpha = np.full(src.shape[:2] + (channels,), 255, dtype=np.uint16)
+            premul[..., :3] = src[..., :3] * alpha
+            inv_alpha[..., :3] = 255 - alpha
+        elif src.shape[2] == channels:
+            opaque = src
+        elif channels == 4:
+            opaque = cv2.cvtColor(src, cv2.COLOR_BGR2BGRA)
+        else:
+            opaque = cv2.cvtColor(src, cv2.COLOR_BGRA2BGR)
+
+        self._blend = (src, channels, opaque, premul, inv_alpha)
+        return opaque, premul, inv_alpha
+
     def draw_on(self, other_img, x, y):
         if self.img is None or other_img.img is None:
             raise ValueError("Both images must be loaded before drawing.")
 
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
-
         h, w = self.img.shape[:2]
         H, W = other_img.img.shape[:2]
 
@@ -71,15 +126,23 @@ class Img:
             raise ValueError("Logo does not fit at the specified position.")
 
         roi = other_img.img[y:y + h, x:x + w]
-  
+        opaque, premul, inv_alpha = self._blend_mask(roi.shape[2])
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
+        if opaque is not None:
+            if roi.shape[2] == 4:
+                bg_alpha = roi[..., 3].copy()
+                roi[...] = opaque
+                roi[..., 3] = bg_alpha
+            else:
+                roi[...] = opaque
         else:
-            other_img.img[y:y + h, x:x + w] = self.img
+            # roi*(255-a) + src*a, then /255 with rounding – integers only
+            acc = roi * inv_alpha
+            acc += premul
+            acc += 128
+            acc += acc >> 8
+            acc >>= 8
+            roi[...] = acc
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None: